@@ -2,11 +2,11 @@
  * CandidateCard Component - Displays individual candidate election result
  */
 import { useNavigate } from 'react-router-dom';
-import type { ElectionResult } from '../../types/election';
+import type { ElectionResultDisplay } from '../../types/election';
 import { getPartyColor, formatPartyName } from '../../utils/partyColors';
 
 interface CandidateCardProps {
-  result: ElectionResult;
+  result: ElectionResultDisplay;
   isWinner?: boolean;
 }
 
@@ -1,17 +1,19 @@
 /**
  * ElectionResults Component - Displays all candidates for one election year
  */
-import type { ElectionResult } from '../../types/election';
+import type { ElectionYearResults } from '../../types/election';
 import CandidateCard from './CandidateCard';
 
 interface ElectionResultsProps {
   year: number;
-  results: ElectionResult[];
+  election: ElectionYearResults | null;
   title: string;
 }
 
-function ElectionResults({ year, results, title }: ElectionResultsProps) {
-  if (results.length === 0) {
+function ElectionResults({ year, election, title }: ElectionResultsProps) {
+  const results = election?.results ?? [];
+
+  if (!election || results.length === 0) {
     return (
       <div className="bg-white rounded-xl shadow-lg p-6 border-t-4 border-gray-400">
         <h2 className="text-2xl font-bold text-gray-900 mb-4">{title}</h2>
@@ -29,11 +31,11 @@ function ElectionResults({ year, results, title }: ElectionResultsProps) {
     .filter(r => r.id !== winner?.id)
     .sort((a, b) => (a.rank || 999) - (b.rank || 999));
 
-  // Calculate total votes cast
-  const totalVotes = results.reduce((sum, r) => sum + r.total_votes, 0);
-  const totalCandidates = results.length;
-  const turnoutPct = results[0]?.total_electors
-    ? ((totalVotes / results[0].total_electors) * 100).toFixed(2)
+  // Totals come with the election (they cover every candidate, even if the list is trimmed)
+  const totalVotes = election.total_votes;
+  const totalCandidates = election.candidate_count;
+  const turnoutPct = election.total_electors
+    ? ((totalVotes / election.total_electors) * 100).toFixed(2)
     : null;
 
   // Year-specific gradient colors
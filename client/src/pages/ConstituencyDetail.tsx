@@ -3,7 +3,7 @@
  */
 import { useState, useEffect } from 'react';
 import { useParams } from 'react-router-dom';
-import { constituenciesAPI, electionsAPI, predictionsAPI } from '../services/api';
+import { constituenciesAPI } from '../services/api';
 import ConstituencyHeader from '../components/constituency/ConstituencyHeader';
 import ElectionResults from '../components/constituency/ElectionResults';
 import PredictionSection from '../components/constituency/PredictionSection';
@@ -11,7 +11,7 @@ import MetaTags from '../components/SEO/MetaTags';
 import { getConstituencySEO, SEO_CONFIG } from '../utils/seoConfig';
 import { generateConstituencySchema, generateBreadcrumbSchema, generatePredictionEventSchema } from '../utils/structuredData';
 import type { Constituency } from '../types/constituency';
-import type { ElectionResult } from '../types/election';
+import type { ElectionYearResults } from '../types/election';
 import type { PredictionDetail } from '../types/prediction';
 
 function ConstituencyDetail() {
@@ -19,9 +19,9 @@ function ConstituencyDetail() {
 
   const [constituency, setConstituency] = useState<Constituency | null>(null);
   const [prediction, setPrediction] = useState<PredictionDetail | null>(null);
-  const [results2021, setResults2021] = useState<ElectionResult[]>([]);
-  const [results2016, setResults2016] = useState<ElectionResult[]>([]);
-  const [results2011, setResults2011] = useState<ElectionResult[]>([]);
+  const [results2021, setResults2021] = useState<ElectionYearResults | null>(null);
+  const [results2016, setResults2016] = useState<ElectionYearResults | null>(null);
+  const [results2011, setResults2011] = useState<ElectionYearResults | null>(null);
   const [allConstituencies, setAllConstituencies] = useState<Constituency[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
@@ -56,39 +56,21 @@ function ConstituencyDetail() {
       setLoading(true);
       setError(null);
 
-      // Fetch constituency by slug
-      const constituencyData = await constituenciesAPI.getBySlug(slug!);
+      // Constituency, results by year and prediction in one request
+      const page = await constituenciesAPI.getPage(slug!, 2026);
 
-      // Fetch election results using the constituency ID
-      const allResults = await electionsAPI.getConstituencyHistory(constituencyData.id);
+      setConstituency(page.constituency);
 
-      setConstituency(constituencyData);
+      // History is grouped by year and already ordered by rank
+      const resultsFor = (year: number) =>
+        page.history.find(h => h.year === year) ?? null;
 
-      // Group results by year and sort by rank
-      const results2021Data = allResults
-        .filter(r => r.year === 2021)
-        .sort((a, b) => (a.rank || 999) - (b.rank || 999));
+      setResults2021(resultsFor(2021));
+      setResults2016(resultsFor(2016));
+      setResults2011(resultsFor(2011));
 
-      const results2016Data = allResults
-        .filter(r => r.year === 2016)
-        .sort((a, b) => (a.rank || 999) - (b.rank || 999));
-
-      const results2011Data = allResults
-        .filter(r => r.year === 2011)
-        .sort((a, b) => (a.rank || 999) - (b.rank || 999));
-
-      setResults2021(results2021Data);
-      setResults2016(results2016Data);
-      setResults2011(results2011Data);
-
-      // Fetch 2026 prediction (optional - don't fail if not found)
-      try {
-        const predictionData = await predictionsAPI.getByConstituency(constituencyData.id, 2026);
-        setPrediction(predictionData.prediction);
-      } catch (predErr) {
-        console.log('No prediction found for this constituency');
-        setPrediction(null);
-      }
+      // Prediction is optional - null when there is none for this constituency
+      setPrediction(page.prediction);
 
     } catch (err) {
       console.error('Error loading constituency data:', err);
@@ -192,7 +174,7 @@ function ConstituencyDetail() {
         {prediction && <PredictionSection prediction={prediction} />}
 
         {/* No Data Warning */}
-        {results2021.length === 0 && results2016.length === 0 && results2011.length === 0 ? (
+        {!results2021 && !results2016 && !results2011 ? (
           <div className="bg-yellow-50 border-2 border-yellow-200 rounded-2xl p-8 text-center shadow-lg">
             <div className="text-6xl mb-4">⚠️</div>
             <div className="text-2xl font-bold text-yellow-800 mb-3">
@@ -222,7 +204,7 @@ function ConstituencyDetail() {
               <div className="flex flex-col">
                 <ElectionResults
                   year={2021}
-                  results={results2021}
+                  election={results2021}
                   title="Tamil Nadu Assembly Election"
                 />
               </div>
@@ -231,7 +213,7 @@ function ConstituencyDetail() {
               <div className="flex flex-col">
                 <ElectionResults
                   year={2016}
-                  results={results2016}
+                  election={results2016}
                   title="Tamil Nadu Assembly Election"
                 />
               </div>
@@ -240,7 +222,7 @@ function ConstituencyDetail() {
               <div className="flex flex-col">
                 <ElectionResults
                   year={2011}
-                  results={results2011}
+                  election={results2011}
                   title="Tamil Nadu Assembly Election"
                 />
               </div>
@@ -3,7 +3,7 @@
  * Handles all HTTP requests to the backend with caching support
  */
 import axios from 'axios';
-import type { Constituency, ConstituencyList } from '../types/constituency';
+import type { Constituency, ConstituencyList, ConstituencyPage } from '../types/constituency';
 import type { Election, ElectionResult } from '../types/election';
 import type {
   PredictionDetail,
@@ -115,6 +115,18 @@ export const constituenciesAPI = {
     return response.data;
   },
 
+  /**
+   * Get everything the constituency page shows (constituency, results by year, prediction)
+   * in one request. Not cached locally - it includes the prediction, which changes
+   * during a campaign; the server and browser HTTP caches cover it.
+   */
+  getPage: async (slug: string, year: number = 2026): Promise<ConstituencyPage> => {
+    const response = await apiClient.get<ConstituencyPage>(`/constituency/slug/${slug}/page`, {
+      params: { year }
+    });
+    return response.data;
+  },
+
   /**
    * Get all constituencies in a district
    */
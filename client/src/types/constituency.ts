@@ -1,6 +1,8 @@
 /**
  * TypeScript interfaces for Constituency data
  */
+import type { ElectionYearResults } from './election';
+import type { PredictionDetail } from './prediction';
 
 export interface Constituency {
   id: number;
@@ -22,4 +24,11 @@ export interface Constituency {
 export interface ConstituencyList {
   constituencies: Constituency[];
   total: number;
+  next_cursor?: string | null;
+}
+
+export interface ConstituencyPage {
+  constituency: Constituency;
+  history: ElectionYearResults[];  // Newest election first
+  prediction: PredictionDetail | null;
 }
@@ -58,3 +58,33 @@ export interface ElectionResult {
   created_at: string;
   updated_at: string;
 }
+
+// Candidate fields the constituency page shows (grouped history / page endpoint)
+export type ElectionResultDisplay = Pick<
+  ElectionResult,
+  | 'id'
+  | 'rank'
+  | 'is_winner'
+  | 'candidate_name'
+  | 'sex'
+  | 'age'
+  | 'category'
+  | 'party'
+  | 'alliance'
+  | 'general_votes'
+  | 'postal_votes'
+  | 'total_votes'
+  | 'vote_share_pct'
+  | 'margin'
+  | 'margin_pct'
+>;
+
+export interface ElectionYearResults {
+  year: number;
+  election_id: number;
+  // Totals cover every candidate, even when results is trimmed to the top N
+  candidate_count: number;
+  total_votes: number;
+  total_electors: number | null;
+  results: ElectionResultDisplay[];  // Ordered by rank
+}
@@ -0,0 +1,64 @@
+"""
+Offline analytics backend
+Serves read-only analytic queries from DuckDB over a Parquet snapshot
+(written by scripts/export_parquet_snapshot.py) instead of the production database
+"""
+from pathlib import Path
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.metrics import instrument_engine
+
+# Tables included in a snapshot, with the column each one is partitioned by
+SNAPSHOT_TABLES = {
+    "constituencies": None,
+    "elections": None,
+    "election_results": "year",
+    "constituency_result_summaries": "year",
+    "party_vote_rollups": "year",
+    "predictions": "predicted_year",
+    "prediction_runs": None,
+    "current_prediction_runs": None,
+}
+
+
+def snapshot_table_glob(snapshot_dir: Path, table: str) -> str:
+    """Parquet glob for one table inside a snapshot directory"""
+    return str(Path(snapshot_dir) / table / "**" / "*.parquet")
+
+
+def create_snapshot_engine(snapshot_dir: str):
+    """
+    Create a SQLAlchemy engine backed by in-memory DuckDB
+
+    Every pooled connection gets one view per snapshot table, named like the
+    production table, so ORM queries written against the models run unchanged.
+    Requires the duckdb and duckdb-engine packages.
+    """
+    snapshot_path = Path(snapshot_dir).resolve()
+    if not snapshot_path.is_dir():
+        raise RuntimeError(f"Analytics snapshot directory not found: {snapshot_path}")
+
+    tables = [t for t in SNAPSHOT_TABLES if (snapshot_path / t).is_dir()]
+
+    engine = create_engine("duckdb:///:memory:")
+    instrument_engine(engine)
+
+    @event.listens_for(engine, "connect")
+    def create_snapshot_views(dbapi_connection, connection_record):
+        for table in tables:
+            partition = SNAPSHOT_TABLES[table]
+            source = snapshot_table_glob(snapshot_path, table).replace("'", "''")
+            options = ", hive_partitioning = true" if partition else ""
+            dbapi_connection.execute(
+                f"CREATE OR REPLACE VIEW {table} AS "
+                f"SELECT * FROM read_parquet('{source}'{options})"
+            )
+
+    return engine
+
+
+def create_snapshot_sessionmaker(snapshot_dir: str) -> sessionmaker:
+    """Session factory for the DuckDB snapshot engine"""
+    return sessionmaker(autocommit=False, autoflush=False, bind=create_snapshot_engine(snapshot_dir))
@@ -2,38 +2,52 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 from typing import List, Optional
-import re
 
 from app.database import get_db
+from app.api.pagination import paginate, cached_count
+from app.cache import cached, invalidate, TAG_CONSTITUENCIES, TAG_PREDICTIONS, TAG_RESULTS
+from app.http_cache import CONSTITUENCIES, CONSTITUENCY_PAGE
 from app.models.constituency import Constituency
+from app.models.prediction import Prediction
 from app.schemas.constituency import (
     ConstituencyResponse,
     ConstituencyList,
+    ConstituencyPageResponse,
     ConstituencyCreate,
     ConstituencyUpdate,
 )
 from app.api.dependencies import verify_admin_key
-from app.rate_limiters import limiter
+from app.api.predictions import prediction_detail
+from app.services.constituency_history import load_history_by_year
+from app.services.constituency_index import get_constituency_index, refresh_constituency_index
+from app.services.prediction_runs import served_predictions
+from app.rate_limiters import limiter, budget, COST_LIST, COST_LOOKUP
 from app.config import settings
 
 router = APIRouter()
 
 
-@router.get("/", response_model=ConstituencyList)
+@router.get("/", response_model=ConstituencyList, dependencies=[Depends(CONSTITUENCIES)])
 @limiter.limit(settings.RATE_LIMIT_PUBLIC)
+@budget(COST_LIST)
+@cached(ttl=settings.CACHE_TTL_CONSTITUENCIES, tags=[TAG_CONSTITUENCIES], model=ConstituencyList, trusted=True)
 async def get_constituencies(
     request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    include_total: bool = True,
     district: Optional[str] = None,
     region: Optional[str] = None,
     db: Session = Depends(get_db),
 ):
     """
-    Get list of all constituencies with optional filters
+    Get list of all constituencies with optional filters, ordered by AC number
 
-    - **skip**: Number of records to skip (pagination)
+    - **skip**: Number of records to skip (legacy offset pagination)
     - **limit**: Maximum number of records to return
+    - **cursor**: Continuation token (`next_cursor` of the previous page)
+    - **include_total**: Set to false to skip the total count (cached when included)
     - **district**: Filter by district name
     - **region**: Filter by region (North, South, Central, West)
 
@@ -47,24 +61,37 @@ async def get_constituencies(
     if region:
         query = query.filter(Constituency.region == region)
 
-    # Get total count
-    total = query.count()
+    # Get total count (cached per filter set)
+    total = (
+        cached_count(query, ("constituencies", district, region), tags=[TAG_CONSTITUENCIES])
+        if include_total else None
+    )
 
     # Apply pagination
-    constituencies = query.offset(skip).limit(limit).all()
+    constituencies, next_cursor = paginate(
+        query,
+        columns=[Constituency.ac_number],
+        keys=["ac_number"],
+        limit=limit,
+        cursor=cursor,
+        skip=skip,
+    )
 
     return {
         "constituencies": constituencies,
         "total": total,
+        "next_cursor": next_cursor,
     }
 
 
-@router.get("/{constituency_id}", response_model=ConstituencyResponse)
-def get_constituency(constituency_id: int, db: Session = Depends(get_db)):
+@router.get("/{constituency_id}", response_model=ConstituencyResponse, dependencies=[Depends(CONSTITUENCIES)])
+@budget(COST_LOOKUP)
+@cached(ttl=settings.CACHE_TTL_CONSTITUENCIES, tags=[TAG_CONSTITUENCIES], model=ConstituencyResponse, trusted=True)
+def get_constituency(request: Request, constituency_id: int, db: Session = Depends(get_db)):
     """
     Get detailed information about a specific constituency by ID
     """
-    constituency = db.query(Constituency).filter(Constituency.id == constituency_id).first()
+    constituency = get_constituency_index(db).get_by_id(constituency_id)
 
     if not constituency:
         raise HTTPException(status_code=404, detail="Constituency not found")
@@ -72,12 +99,14 @@ def get_constituency(constituency_id: int, db: Session = Depends(get_db)):
     return constituency
 
 
-@router.get("/code/{code}", response_model=ConstituencyResponse)
-def get_constituency_by_code(code: str, db: Session = Depends(get_db)):
+@router.get("/code/{code}", response_model=ConstituencyResponse, dependencies=[Depends(CONSTITUENCIES)])
+@budget(COST_LOOKUP)
+@cached(ttl=settings.CACHE_TTL_CONSTITUENCIES, tags=[TAG_CONSTITUENCIES], model=ConstituencyResponse, trusted=True)
+def get_constituency_by_code(request: Request, code: str, db: Session = Depends(get_db)):
     """
     Get constituency information by constituency code
     """
-    constituency = db.query(Constituency).filter(Constituency.code == code).first()
+    constituency = get_constituency_index(db).get_by_code(code)
 
     if not constituency:
         raise HTTPException(status_code=404, detail="Constituency not found")
@@ -85,19 +114,17 @@ def get_constituency_by_code(code: str, db: Session = Depends(get_db)):
     return constituency
 
 
-@router.get("/slug/{slug}", response_model=ConstituencyResponse)
-def get_constituency_by_slug(slug: str, db: Session = Depends(get_db)):
+@router.get("/slug/{slug}", response_model=ConstituencyResponse, dependencies=[Depends(CONSTITUENCIES)])
+@budget(COST_LOOKUP)
+@cached(ttl=settings.CACHE_TTL_CONSTITUENCIES, tags=[TAG_CONSTITUENCIES], model=ConstituencyResponse, trusted=True)
+def get_constituency_by_slug(request: Request, slug: str, db: Session = Depends(get_db)):
     """
     Get constituency information by SEO-friendly slug
     Example: /constituencies/slug/gummidipoondi
-    Handles malformed URLs with parentheses and periods by normalizing them
+    Handles malformed URLs (case, parentheses, periods, repeated hyphens)
+    and historic slugs/names from past election results
     """
-    # Normalize slug: remove parentheses, periods, and collapse multiple hyphens
-    normalized_slug = re.sub(r'[().]', '', slug)  # Remove parentheses and periods
-    normalized_slug = re.sub(r'-+', '-', normalized_slug)  # Collapse multiple hyphens
-    normalized_slug = normalized_slug.strip('-')  # Remove leading/trailing hyphens
-
-    constituency = db.query(Constituency).filter(Constituency.slug == normalized_slug).first()
+    constituency = get_constituency_index(db).get_by_slug(slug)
 
     if not constituency:
         raise HTTPException(status_code=404, detail="Constituency not found")
@@ -105,6 +132,49 @@ def get_constituency_by_slug(slug: str, db: Session = Depends(get_db)):
     return constituency
 
 
+@router.get("/slug/{slug}/page", response_model=ConstituencyPageResponse, dependencies=[Depends(CONSTITUENCY_PAGE)])
+@budget(COST_LIST)
+@cached(
+    ttl=settings.CACHE_TTL_PREDICTIONS,
+    tags=[TAG_CONSTITUENCIES, TAG_RESULTS, TAG_PREDICTIONS],
+    model=ConstituencyPageResponse,
+    trusted=True,
+)
+def get_constituency_page(
+    request: Request,
+    slug: str,
+    year: int = Query(2026, description="Prediction year"),
+    top_n: Optional[int] = Query(None, ge=1, le=50, description="Keep the top N candidates per election"),
+    db: Session = Depends(get_db),
+):
+    """
+    Everything the constituency page shows, in one request
+
+    - **constituency**: Same as /constituency/slug/{slug}
+    - **history**: Results per election (newest first), ordered by rank, display fields only
+      (same as /elections/constituency/{id}/history/grouped)
+    - **prediction**: Same as /predictions/constituency/{id}, or null if there is none
+
+    Two queries: the constituency comes from the in-memory index, then
+    one query for all results and one for the prediction.
+    """
+    constituency = get_constituency_index(db).get_by_slug(slug)
+
+    if not constituency:
+        raise HTTPException(status_code=404, detail="Constituency not found")
+
+    prediction = db.query(Prediction).filter(
+        Prediction.constituency_id == constituency["id"],
+        served_predictions(db, year)
+    ).first()
+
+    return {
+        "constituency": constituency,
+        "history": load_history_by_year(db, constituency["id"], top_n),
+        "prediction": prediction_detail(prediction, constituency) if prediction else None,
+    }
+
+
 @router.post("/", response_model=ConstituencyResponse, status_code=201)
 @limiter.limit(settings.RATE_LIMIT_ADMIN)
 async def create_constituency(
@@ -134,11 +204,16 @@ async def create_constituency(
     db.commit()
     db.refresh(db_constituency)
 
+    invalidate(TAG_CONSTITUENCIES)
+    refresh_constituency_index(db)
+
     return db_constituency
 
 
-@router.get("/district/{district}", response_model=List[ConstituencyResponse])
-def get_constituencies_by_district(district: str, db: Session = Depends(get_db)):
+@router.get("/district/{district}", response_model=List[ConstituencyResponse], dependencies=[Depends(CONSTITUENCIES)])
+@budget(COST_LIST)
+@cached(ttl=settings.CACHE_TTL_CONSTITUENCIES, tags=[TAG_CONSTITUENCIES], model=List[ConstituencyResponse], trusted=True)
+def get_constituencies_by_district(request: Request, district: str, db: Session = Depends(get_db)):
     """
     Get all constituencies in a specific district
     """
@@ -1,29 +1,52 @@
 """API endpoints for elections and results"""
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional, Dict, Any
 from collections import defaultdict
 
-from app.database import get_db
-from app.models.election import Election, ElectionResult
+from app.database import get_db, get_analytics_db
+from app.api.pagination import paginate, NEXT_CURSOR_HEADER
+from app.cache import cached, TAG_ELECTIONS, TAG_RESULTS
+from app.http_cache import ANALYTIC_RESULTS, ELECTIONS, HISTORICAL_RESULTS
+from app.models.election import Election, ElectionResult, ConstituencyResultSummary, PartyVoteRollup, UNRANKED
 from app.models.constituency import Constituency
 from app.schemas.election import (
+    AllianceRecombinationRequest,
     ElectionResponse,
     ElectionResultResponse,
     ConstituencyElectionHistory,
+    ConstituencyResultSummaryResponse,
+    ElectionYearResults,
+    PartySummaryResponse,
 )
 from app.config import settings
-from app.rate_limiters import limiter
+from app.rate_limiters import limiter, budget, COST_ANALYSIS, COST_EXPORT, COST_LIST, COST_LOOKUP
+from app.serialization import fast_response
+from app.services import result_export
+from app.services.constituency_history import load_history_by_year
+from app.services.constituency_index import get_constituency_index
+from app.services.vote_matrix import get_party_matrix, recombine
+from app.services.vote_swing import compute_swing, get_swing_tensor
 
 router = APIRouter()
 
+# Keyset pagination order for candidate-level results within one election
+# (year is fixed by the election; id breaks ties between equal ranks, unranked rows come last)
+RESULT_SORT_COLUMNS = [ElectionResult.ac_number, ElectionResult.rank, ElectionResult.id]
+RESULT_CURSOR_KEYS = ["ac_number", "rank", "id"]
+RESULT_CURSOR_NULLS = {"rank": UNRANKED}
 
-@router.get("/", response_model=List[ElectionResponse])
+
+@router.get("/", response_model=List[ElectionResponse], dependencies=[Depends(ELECTIONS)])
 @limiter.limit(settings.RATE_LIMIT_PUBLIC)
+@budget(COST_LOOKUP)
 async def get_elections(
     request: Request,
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
     year: Optional[int] = None,
     election_type: Optional[str] = None,
     db: Session = Depends(get_db),
@@ -31,8 +54,9 @@ async def get_elections(
     """
     Get list of all elections with optional filters
 
-    - **skip**: Number of records to skip (pagination)
+    - **skip**: Number of records to skip (legacy offset pagination)
     - **limit**: Maximum number of records to return
+    - **cursor**: Continuation token from the X-Next-Cursor header of the previous page
     - **year**: Filter by election year
     - **election_type**: Filter by type (Assembly, Lok Sabha)
 
@@ -47,14 +71,27 @@ async def get_elections(
         query = query.filter(Election.election_type == election_type)
 
     # Order by year descending (most recent first)
-    elections = query.order_by(Election.year.desc()).offset(skip).limit(limit).all()
+    elections, next_cursor = paginate(
+        query,
+        columns=[Election.year, Election.id],
+        keys=["year", "id"],
+        limit=limit,
+        cursor=cursor,
+        skip=skip,
+        descending=True,
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
 
     return elections
 
 
-@router.get("/bastion-seats-three-elections")
+@router.get("/bastion-seats-three-elections", dependencies=[Depends(ANALYTIC_RESULTS)])
+@budget(COST_ANALYSIS)
+@cached(ttl=settings.CACHE_TTL_HISTORICAL, tags=[TAG_RESULTS])
 def get_bastion_seats_three_elections(
-    db: Session = Depends(get_db),
+    request: Request,
+    db: Session = Depends(get_analytics_db),
 ) -> Dict[str, Any]:
     """
     Get bastion seats analysis across THREE elections (2011, 2016, 2021)
@@ -74,22 +111,22 @@ def get_bastion_seats_three_elections(
     if not election_2021:
         raise HTTPException(status_code=404, detail="2021 election not found")
 
-    # Get winners from all three elections
+    # Get winners from all three elections (one summary row per seat)
     winners_2011 = (
-        db.query(ElectionResult)
-        .filter(ElectionResult.election_id == election_2011.id, ElectionResult.is_winner == 1)
+        db.query(ConstituencyResultSummary)
+        .filter(ConstituencyResultSummary.election_id == election_2011.id)
         .all()
     )
 
     winners_2016 = (
-        db.query(ElectionResult)
-        .filter(ElectionResult.election_id == election_2016.id, ElectionResult.is_winner == 1)
+        db.query(ConstituencyResultSummary)
+        .filter(ConstituencyResultSummary.election_id == election_2016.id)
         .all()
     )
 
     winners_2021 = (
-        db.query(ElectionResult)
-        .filter(ElectionResult.election_id == election_2021.id, ElectionResult.is_winner == 1)
+        db.query(ConstituencyResultSummary)
+        .filter(ConstituencyResultSummary.election_id == election_2021.id)
         .all()
     )
 
@@ -111,7 +148,7 @@ def get_bastion_seats_three_elections(
         winner_2021 = map_2021[const_id]
 
         # Check if same party won all three times
-        if winner_2011.party == winner_2016.party == winner_2021.party:
+        if winner_2011.winner_party == winner_2016.winner_party == winner_2021.winner_party:
             # Calculate average margin across three elections
             margins = [
                 winner_2011.margin or 0,
@@ -132,7 +169,7 @@ def get_bastion_seats_three_elections(
                 'constituency_name': winner_2021.ac_name,
                 'ac_number': winner_2021.ac_number,
                 'ac_slug': winner_2021.ac_slug,
-                'party': winner_2021.party,
+                'party': winner_2021.winner_party,
                 'margin_2011': winner_2011.margin,
                 'margin_2016': winner_2016.margin,
                 'margin_2021': winner_2021.margin,
@@ -141,20 +178,20 @@ def get_bastion_seats_three_elections(
                 'margin_pct_2016': winner_2016.margin_pct,
                 'margin_pct_2021': winner_2021.margin_pct,
                 'avg_margin_pct': round(avg_margin_pct, 2),
-                'vote_share_2011': winner_2011.vote_share_pct,
-                'vote_share_2016': winner_2016.vote_share_pct,
-                'vote_share_2021': winner_2021.vote_share_pct,
-                'candidate_2011': winner_2011.candidate_name,
-                'candidate_2016': winner_2016.candidate_name,
-                'candidate_2021': winner_2021.candidate_name,
+                'vote_share_2011': winner_2011.winner_vote_share_pct,
+                'vote_share_2016': winner_2016.winner_vote_share_pct,
+                'vote_share_2021': winner_2021.winner_vote_share_pct,
+                'candidate_2011': winner_2011.winner_name,
+                'candidate_2016': winner_2016.winner_name,
+                'candidate_2021': winner_2021.winner_name,
                 'margin_trend': 'increasing' if margins[2] > margins[1] > margins[0] else
                                 'decreasing' if margins[2] < margins[1] < margins[0] else 'mixed',
                 'strength': 'strong' if avg_margin > 20000 else 'moderate' if avg_margin > 10000 else 'weak'
             }
 
             bastion_seats.append(bastion_data)
-            party_bastions[winner_2021.party]['count'] += 1
-            party_bastions[winner_2021.party]['seats'].append(bastion_data)
+            party_bastions[winner_2021.winner_party]['count'] += 1
+            party_bastions[winner_2021.winner_party]['seats'].append(bastion_data)
 
     # Sort bastion seats by average margin (strongest first)
     bastion_seats.sort(key=lambda x: x['avg_margin'], reverse=True)
@@ -197,8 +234,79 @@ def get_bastion_seats_three_elections(
     }
 
 
-@router.get("/{election_id}", response_model=ElectionResponse)
-def get_election(election_id: int, db: Session = Depends(get_db)):
+@router.get("/{year}/party-summary", response_model=PartySummaryResponse, dependencies=[Depends(ANALYTIC_RESULTS)])
+@budget(COST_ANALYSIS)
+@cached(ttl=settings.CACHE_TTL_HISTORICAL, tags=[TAG_RESULTS], model=PartySummaryResponse)
+def get_party_summary(
+    request: Request,
+    year: int,
+    group_by: str = Query("party", pattern="^(party|alliance)$"),
+    scope: str = Query("state", pattern="^(state|district|region)$"),
+    db: Session = Depends(get_analytics_db),
+):
+    """
+    Get seats, votes and vote share per party or alliance for an election year
+
+    - **group_by**: party or alliance (parties without an alliance count as their own bloc)
+    - **scope**: state (statewide totals), district or region breakdowns
+
+    Served from the precomputed party_vote_rollups table
+    """
+    rows = (
+        db.query(PartyVoteRollup)
+        .filter(
+            PartyVoteRollup.year == year,
+            PartyVoteRollup.scope == scope,
+            PartyVoteRollup.group_type == group_by,
+        )
+        .order_by(
+            PartyVoteRollup.scope_value,
+            PartyVoteRollup.seats_won.desc(),
+            PartyVoteRollup.total_votes.desc(),
+        )
+        .all()
+    )
+
+    if not rows:
+        raise HTTPException(status_code=404, detail=f"No party summary found for year {year}")
+
+    return PartySummaryResponse(
+        year=year,
+        group_by=group_by,
+        scope=scope,
+        results=rows,
+    )
+
+
+@router.post("/{year}/recombination")
+@budget(COST_LOOKUP)
+def recombine_alliances(
+    request: Request,
+    year: int,
+    scenario: AllianceRecombinationRequest,
+    db: Session = Depends(get_db),
+):
+    """
+    Recompute an election's seat winners and margins under a different alliance lineup
+
+    e.g. {"mapping": {"PMK": "AIADMK+"}} for "who would have won if PMK had joined AIADMK+?"
+    Served from a preloaded seat x party vote matrix (no per-request result queries)
+    """
+    matrix = get_party_matrix(db, year)
+    if matrix is None:
+        raise HTTPException(status_code=404, detail=f"No results found for year {year}")
+
+    unknown = [party for party in scenario.mapping if party.upper() not in matrix.party_column]
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Parties {unknown} did not contest in {year}")
+
+    return {"year": year, "mapping": scenario.mapping, **recombine(matrix, scenario.mapping)}
+
+
+@router.get("/{election_id}", response_model=ElectionResponse, dependencies=[Depends(ELECTIONS)])
+@budget(COST_LOOKUP)
+@cached(ttl=settings.CACHE_TTL_HISTORICAL, tags=[TAG_ELECTIONS], model=ElectionResponse)
+def get_election(request: Request, election_id: int, db: Session = Depends(get_db)):
     """
     Get detailed information about a specific election
     """
@@ -210,13 +318,15 @@ def get_election(election_id: int, db: Session = Depends(get_db)):
     return election
 
 
-@router.get("/{election_id}/results", response_model=List[ElectionResultResponse])
+@router.get("/{election_id}/results", response_model=List[ElectionResultResponse], dependencies=[Depends(HISTORICAL_RESULTS)])
 @limiter.limit(settings.RATE_LIMIT_HEAVY)
+@budget(COST_ANALYSIS)
 async def get_election_results(
     request: Request,
     election_id: int,
     skip: int = Query(0, ge=0),
     limit: int = Query(234, ge=1, le=500),
+    cursor: Optional[str] = None,
     party: Optional[str] = None,
     winner_only: bool = False,
     db: Session = Depends(get_db),
@@ -225,9 +335,12 @@ async def get_election_results(
     Get all results for a specific election
 
     - **election_id**: ID of the election
+    - **cursor**: Continuation token from the X-Next-Cursor header of the previous page
     - **party**: Filter by party name
     - **winner_only**: If True, only return winning candidates
 
+    Results are ordered by constituency number, then rank.
+
     **Rate limit**: 20 requests per minute (heavy query)
     """
     # Check if election exists
@@ -243,13 +356,24 @@ async def get_election_results(
     if winner_only:
         query = query.filter(ElectionResult.is_winner == 1)
 
-    results = query.offset(skip).limit(limit).all()
-
-    return results
+    results, next_cursor = paginate(
+        query,
+        columns=RESULT_SORT_COLUMNS,
+        keys=RESULT_CURSOR_KEYS,
+        limit=limit,
+        cursor=cursor,
+        skip=skip,
+        nulls=RESULT_CURSOR_NULLS,
+    )
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return fast_response(results, List[ElectionResultResponse], headers=headers)
 
 
-@router.get("/constituency/{constituency_id}/history", response_model=List[ElectionResultResponse])
+@router.get("/constituency/{constituency_id}/history", response_model=List[ElectionResultResponse], dependencies=[Depends(HISTORICAL_RESULTS)])
+@budget(COST_LIST)
+@cached(ttl=settings.CACHE_TTL_HISTORICAL, tags=[TAG_RESULTS], model=List[ElectionResultResponse], trusted=True)
 def get_constituency_history(
+    request: Request,
     constituency_id: int,
     db: Session = Depends(get_db),
 ):
@@ -275,37 +399,148 @@ def get_constituency_history(
     return results
 
 
-@router.get("/year/{year}/results", response_model=List[ElectionResultResponse])
+@router.get(
+    "/constituency/{constituency_id}/history/grouped",
+    response_model=List[ElectionYearResults],
+    dependencies=[Depends(HISTORICAL_RESULTS)],
+)
+@budget(COST_LIST)
+@cached(ttl=settings.CACHE_TTL_HISTORICAL, tags=[TAG_RESULTS], model=List[ElectionYearResults], trusted=True)
+def get_constituency_history_grouped(
+    request: Request,
+    constituency_id: int,
+    top_n: Optional[int] = Query(None, ge=1, le=50, description="Keep the top N candidates per election"),
+    db: Session = Depends(get_db),
+):
+    """
+    Get a constituency's results grouped by election (newest first)
+
+    Each election lists its candidates by rank with display fields only,
+    plus totals (candidates, votes, electors) that cover every candidate
+    even when **top_n** trims the list.
+    """
+    if not get_constituency_index(db).get_by_id(constituency_id):
+        raise HTTPException(status_code=404, detail="Constituency not found")
+
+    return load_history_by_year(db, constituency_id, top_n)
+
+
+@router.get(
+    "/constituency/{constituency_id}/summary",
+    response_model=List[ConstituencyResultSummaryResponse],
+    dependencies=[Depends(ANALYTIC_RESULTS)],
+)
+@budget(COST_LOOKUP)
+@cached(ttl=settings.CACHE_TTL_HISTORICAL, tags=[TAG_RESULTS], model=List[ConstituencyResultSummaryResponse], trusted=True)
+def get_constituency_summary_history(
+    request: Request,
+    constituency_id: int,
+    db: Session = Depends(get_analytics_db),
+):
+    """
+    Get a compact per-year history for a constituency
+
+    Returns one row per election (winner, runner-up, margin, turnout),
+    ordered by year (newest first)
+    """
+    summaries = (
+        db.query(ConstituencyResultSummary)
+        .filter(ConstituencyResultSummary.constituency_id == constituency_id)
+        .order_by(ConstituencyResultSummary.year.desc())
+        .all()
+    )
+
+    if not summaries:
+        raise HTTPException(status_code=404, detail="No election summaries found for this constituency")
+
+    return summaries
+
+
+@router.get("/year/{year}/results", response_model=List[ElectionResultResponse], dependencies=[Depends(HISTORICAL_RESULTS)])
+@budget(COST_ANALYSIS)
 def get_results_by_year(
+    request: Request,
     year: int,
     skip: int = Query(0, ge=0),
     limit: int = Query(234, ge=1, le=500),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
 ):
     """
     Get all election results for a specific year
+
+    Results are ordered by constituency number, then rank. Pass the
+    X-Next-Cursor response header back as **cursor** to fetch the next page.
     """
     # Find election by year
     election = db.query(Election).filter(Election.year == year).first()
     if not election:
         raise HTTPException(status_code=404, detail=f"No election found for year {year}")
 
-    results = (
-        db.query(ElectionResult)
-        .filter(ElectionResult.election_id == election.id)
-        .offset(skip)
-        .limit(limit)
-        .all()
+    query = db.query(ElectionResult).filter(ElectionResult.election_id == election.id)
+
+    results, next_cursor = paginate(
+        query,
+        columns=RESULT_SORT_COLUMNS,
+        keys=RESULT_CURSOR_KEYS,
+        limit=limit,
+        cursor=cursor,
+        skip=skip,
+        nulls=RESULT_CURSOR_NULLS,
     )
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return fast_response(results, List[ElectionResultResponse], headers=headers)
 
-    return results
 
+@router.get("/year/{year}/export", dependencies=[Depends(HISTORICAL_RESULTS)])
+@limiter.limit(settings.RATE_LIMIT_EXPORT)
+@budget(COST_EXPORT)
+async def export_results_by_year(
+    request: Request,
+    year: int,
+    format: str = Query("ndjson", pattern="^(ndjson|csv|arrow)$"),
+    db: Session = Depends(get_db),
+):
+    """
+    Stream every candidate result for an election year in one response
+
+    - **format**: ndjson (default), csv, or arrow (Arrow IPC stream, requires pyarrow)
 
-@router.get("/bastion-seats/{from_year}/{to_year}")
+    Rows are streamed from a server-side cursor without pagination.
+
+    **Rate limit**: 5 requests per minute (bulk export)
+    """
+    election = db.query(Election).filter(Election.year == year).first()
+    if not election:
+        raise HTTPException(status_code=404, detail=f"No election found for year {year}")
+
+    if format == "arrow":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise HTTPException(status_code=501, detail="Arrow export is not available on this server")
+        body = result_export.iter_arrow(election.id)
+    elif format == "csv":
+        body = result_export.iter_csv(election.id)
+    else:
+        body = result_export.iter_ndjson(election.id)
+
+    extension = "arrows" if format == "arrow" else format
+    return StreamingResponse(
+        body,
+        media_type=result_export.EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="election_results_{year}.{extension}"'},
+    )
+
+
+@router.get("/bastion-seats/{from_year}/{to_year}", dependencies=[Depends(ANALYTIC_RESULTS)])
+@budget(COST_ANALYSIS)
+@cached(ttl=settings.CACHE_TTL_HISTORICAL, tags=[TAG_RESULTS])
 def get_bastion_seats(
+    request: Request,
     from_year: int,
     to_year: int,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_analytics_db),
 ) -> Dict[str, Any]:
     """
     Get bastion seats analysis - constituencies held by the same party
@@ -324,16 +559,16 @@ def get_bastion_seats(
     if not election_to:
         raise HTTPException(status_code=404, detail=f"No election found for year {to_year}")
 
-    # Get winners from both elections
+    # Get winners from both elections (one summary row per seat)
     winners_from = (
-        db.query(ElectionResult)
-        .filter(ElectionResult.election_id == election_from.id, ElectionResult.is_winner == 1)
+        db.query(ConstituencyResultSummary)
+        .filter(ConstituencyResultSummary.election_id == election_from.id)
         .all()
     )
 
     winners_to = (
-        db.query(ElectionResult)
-        .filter(ElectionResult.election_id == election_to.id, ElectionResult.is_winner == 1)
+        db.query(ConstituencyResultSummary)
+        .filter(ConstituencyResultSummary.election_id == election_to.id)
         .all()
     )
 
@@ -350,7 +585,7 @@ def get_bastion_seats(
         winner_to = to_map[const_id]
 
         # Check if same party won both times
-        if winner_from.party == winner_to.party:
+        if winner_from.winner_party == winner_to.winner_party:
             # Calculate average margin
             avg_margin = ((winner_from.margin or 0) + (winner_to.margin or 0)) / 2
             avg_margin_pct = ((winner_from.margin_pct or 0) + (winner_to.margin_pct or 0)) / 2
@@ -359,24 +594,24 @@ def get_bastion_seats(
                 'constituency_id': const_id,
                 'constituency_name': winner_to.ac_name,
                 'ac_number': winner_to.ac_number,
-                'party': winner_to.party,
+                'party': winner_to.winner_party,
                 'margin_2016': winner_from.margin,
                 'margin_2021': winner_to.margin,
                 'avg_margin': int(avg_margin),
                 'margin_pct_2016': winner_from.margin_pct,
                 'margin_pct_2021': winner_to.margin_pct,
                 'avg_margin_pct': avg_margin_pct,
-                'vote_share_2016': winner_from.vote_share_pct,
-                'vote_share_2021': winner_to.vote_share_pct,
-                'candidate_2016': winner_from.candidate_name,
-                'candidate_2021': winner_to.candidate_name,
+                'vote_share_2016': winner_from.winner_vote_share_pct,
+                'vote_share_2021': winner_to.winner_vote_share_pct,
+                'candidate_2016': winner_from.winner_name,
+                'candidate_2021': winner_to.winner_name,
                 'margin_trend': 'increased' if winner_to.margin > winner_from.margin else 'decreased',
                 'strength': 'strong' if avg_margin > 20000 else 'moderate' if avg_margin > 10000 else 'weak'
             }
 
             bastion_seats.append(bastion_data)
-            party_bastions[winner_to.party]['count'] += 1
-            party_bastions[winner_to.party]['seats'].append(bastion_data)
+            party_bastions[winner_to.winner_party]['count'] += 1
+            party_bastions[winner_to.winner_party]['seats'].append(bastion_data)
 
     # Sort bastion seats by average margin (strongest first)
     bastion_seats.sort(key=lambda x: x['avg_margin'], reverse=True)
@@ -415,11 +650,50 @@ def get_bastion_seats(
     }
 
 
-@router.get("/swing-analysis/{from_year}/{to_year}")
-def get_swing_analysis(
+@router.get("/vote-swing/{from_year}/{to_year}", dependencies=[Depends(HISTORICAL_RESULTS)])
+@budget(COST_ANALYSIS)
+@cached(ttl=settings.CACHE_TTL_HISTORICAL, tags=[TAG_RESULTS])
+def get_vote_swing(
+    request: Request,
     from_year: int,
     to_year: int,
+    first: Optional[str] = Query(None, description="Butler swing towards this bloc (default: largest in to_year)"),
+    second: Optional[str] = Query(None, description="Butler swing away from this bloc (default: next largest)"),
     db: Session = Depends(get_db),
+) -> Dict[str, Any]:
+    """
+    Vote-share swing between two elections
+
+    Returns Butler two-party swing and per-bloc vote-share changes for every
+    seat, district, region and the state (blocs are alliances, or parties
+    outside one). Served from a preloaded year x seat x bloc tensor.
+    """
+    tensor = get_swing_tensor(db)
+    for year in (from_year, to_year):
+        if tensor is None or year not in tensor.year_index:
+            raise HTTPException(status_code=404, detail=f"No results found for year {year}")
+
+    ranked = tensor.ranked_blocs(to_year)
+    first = first or ranked[0]
+    second = second or next((bloc for bloc in ranked if bloc != first), first)
+    pair = (first, second)
+    unknown = [bloc for bloc in pair if bloc not in tensor.blocs]
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown bloc(s) {unknown}")
+    if pair[0] == pair[1]:
+        raise HTTPException(status_code=422, detail="first and second must be different blocs")
+
+    return compute_swing(tensor, from_year, to_year, pair)
+
+
+@router.get("/swing-analysis/{from_year}/{to_year}", dependencies=[Depends(ANALYTIC_RESULTS)])
+@budget(COST_ANALYSIS)
+@cached(ttl=settings.CACHE_TTL_HISTORICAL, tags=[TAG_RESULTS])
+def get_swing_analysis(
+    request: Request,
+    from_year: int,
+    to_year: int,
+    db: Session = Depends(get_analytics_db),
 ) -> Dict[str, Any]:
     """
     Get swing analysis comparing two elections
@@ -439,16 +713,16 @@ def get_swing_analysis(
     if not election_to:
         raise HTTPException(status_code=404, detail=f"No election found for year {to_year}")
 
-    # Get winners from both elections
+    # Get winners from both elections (one summary row per seat)
     winners_from = (
-        db.query(ElectionResult)
-        .filter(ElectionResult.election_id == election_from.id, ElectionResult.is_winner == 1)
+        db.query(ConstituencyResultSummary)
+        .filter(ConstituencyResultSummary.election_id == election_from.id)
         .all()
     )
 
     winners_to = (
-        db.query(ElectionResult)
-        .filter(ElectionResult.election_id == election_to.id, ElectionResult.is_winner == 1)
+        db.query(ConstituencyResultSummary)
+        .filter(ConstituencyResultSummary.election_id == election_to.id)
         .all()
     )
 
@@ -466,8 +740,8 @@ def get_swing_analysis(
         winner_to = to_map.get(const_id)
 
         if winner_from and winner_to:
-            party_from = winner_from.party
-            party_to = winner_to.party
+            party_from = winner_from.winner_party
+            party_to = winner_to.winner_party
 
             # Check if party changed
             if party_from != party_to:
@@ -478,10 +752,10 @@ def get_swing_analysis(
                     'ac_slug': winner_to.ac_slug,
                     'from_party': party_from,
                     'to_party': party_to,
-                    'from_candidate': winner_from.candidate_name,
-                    'to_candidate': winner_to.candidate_name,
-                    'from_votes': winner_from.total_votes,
-                    'to_votes': winner_to.total_votes,
+                    'from_candidate': winner_from.winner_name,
+                    'to_candidate': winner_to.winner_name,
+                    'from_votes': winner_from.winner_votes,
+                    'to_votes': winner_to.winner_votes,
                     'from_margin': winner_from.margin,
                     'to_margin': winner_to.margin,
                 })
@@ -0,0 +1,157 @@
+"""
+Keyset (cursor) pagination helpers
+
+Continuation tokens are opaque to clients: base64url-encoded JSON holding the
+sort key of the last row returned. The next page is fetched with a
+"sort key greater than cursor" filter instead of OFFSET, so page cost stays
+constant no matter how deep a client pages.
+"""
+import base64
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import and_, func, literal_column, or_
+from sqlalchemy.orm import Query
+
+from app.cache import get_cache
+
+# Response header carrying the continuation token for list endpoints
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Counts change only when data is loaded, so cache them per filter set
+COUNT_CACHE_TTL = 300  # seconds
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    """Encode the sort key of the last row into an opaque token"""
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _python_type(column) -> type:
+    try:
+        return column.type.python_type
+    except (AttributeError, NotImplementedError):
+        return object
+
+
+def decode_cursor(token: str, keys: Sequence[str], types: Optional[Sequence[type]] = None) -> Dict[str, Any]:
+    """
+    Decode a continuation token
+    types, if given, are the Python types of the values (same order as keys)
+
+    Raises:
+        HTTPException: 400 if the token is malformed, from another endpoint or
+            holds values of the wrong type
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+    if not isinstance(values, dict) or set(values) != set(keys):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+    for key, expected in zip(keys, types or ()):
+        value = values[key]
+        if not isinstance(value, expected) or (isinstance(value, bool) and expected is not bool):
+            raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+    return values
+
+
+def sort_key(column, null_value: int):
+    """
+    column with NULLs sorted as null_value (inlined, so it matches an
+    expression index on COALESCE(column, null_value))
+    """
+    return func.coalesce(column, literal_column(str(int(null_value))))
+
+
+def keyset_filter(columns: Sequence, values: Sequence, descending: bool = False):
+    """
+    Build "(c1, c2, ...) > (v1, v2, ...)" as portable OR/AND clauses
+    (row-value comparison isn't supported by every backend)
+    """
+    clauses = []
+    for i, column in enumerate(columns):
+        equal_prefix = [columns[j] == values[j] for j in range(i)]
+        beyond = column < values[i] if descending else column > values[i]
+        clauses.append(and_(*equal_prefix, beyond))
+    return or_(*clauses)
+
+
+def paginate(
+    query: Query,
+    columns: Sequence,
+    keys: Sequence[str],
+    limit: int,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    descending: bool = False,
+    nulls: Optional[Dict[str, int]] = None,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Fetch one page of a query ordered by `columns`
+
+    Args:
+        query: Filtered query (ordering is applied here)
+        columns: Sort key columns, unique together
+        keys: Names for the sort key values inside the cursor (same order as
+            columns), also the row attributes they are read from
+        limit: Page size
+        cursor: Continuation token from the previous page (takes precedence over skip)
+        skip: Legacy offset, used only when no cursor is given
+        descending: Sort direction for all columns
+        nulls: Value NULLs sort as, per nullable sort key (see sort_key); used
+            alike in ORDER BY, the cursor filter and the cursor itself
+
+    Returns:
+        (rows, next cursor or None when this is the last page)
+    """
+    nulls = nulls or {}
+    types = [_python_type(column) for column in columns]
+    columns = [
+        sort_key(column, nulls[key]) if key in nulls else column
+        for key, column in zip(keys, columns)
+    ]
+
+    if cursor:
+        values = decode_cursor(cursor, keys, types)
+        query = query.filter(keyset_filter(columns, [values[k] for k in keys], descending))
+
+    order = [c.desc() for c in columns] if descending else list(columns)
+    query = query.order_by(*order)
+
+    if skip and not cursor:
+        query = query.offset(skip)
+
+    # Fetch one extra row to know whether another page exists
+    rows = query.limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor({
+            key: nulls[key] if getattr(last, key) is None and key in nulls else getattr(last, key)
+            for key in keys
+        })
+
+    return rows, next_cursor
+
+
+def cached_count(query: Query, cache_key: tuple, tags: Sequence[str] = ()) -> int:
+    """Count query rows, reusing the result for COUNT_CACHE_TTL seconds"""
+    cache = get_cache()
+    key = "count:" + json.dumps(cache_key, separators=(",", ":"))
+
+    cached = cache.get(key)
+    if cached is not None:
+        return int(cached)
+
+    total = query.count()
+    cache.set(key, str(total).encode("ascii"), COUNT_CACHE_TTL, tags)
+    return total
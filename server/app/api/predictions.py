@@ -1,19 +1,34 @@
 """
 API endpoints for election predictions
 """
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 from sqlalchemy import func, cast, Text
-from typing import List, Optional
+from typing import Any, Dict, List, Mapping, Optional
 from datetime import datetime
 
 from app.database import get_db
-from app.models.prediction import Prediction
+from app.cache import cached, TAG_PREDICTIONS, TAG_RESULTS, TAG_CONSTITUENCIES
+from app.http_cache import PREDICTIONS, PREDICTION_COMPARISON
+from app.config import settings
+from app.rate_limiters import budget, COST_ANALYSIS, COST_LIST, COST_LOOKUP
+from app.models.prediction import Prediction, PredictionRun
 from app.models.constituency import Constituency
-from app.models.election import ElectionResult
+from app.models.election import ConstituencyResultSummary
+from app.schemas.prediction import ScenarioRequest
+from app.services.constituency_index import get_constituency_index
+from app.services.seat_projection import (
+    DEFAULT_SEED, MAX_SIMULATIONS, NATIONAL_SD, REGIONAL_SD,
+    load_prediction_matrix, load_seat_distribution, simulate_seats
+)
+from app.services.prediction_runs import current_run_id, diff_runs, list_runs, run_record, served_predictions
+from app.services.vote_matrix import DEFAULT_YEARS, apply_swing, get_vote_matrix
 
 router = APIRouter()
 
+# Bump when the thresholds in reclassify_confidence_level change (invalidates memoized distributions)
+CONFIDENCE_THRESHOLDS_VERSION = "relaxed-2"
+
 
 def reclassify_confidence_level(win_probability: float, margin_pct: float) -> str:
     """
@@ -36,8 +51,55 @@ def reclassify_confidence_level(win_probability: float, margin_pct: float) -> st
         return "Toss-up"
 
 
-@router.get("/summary")
+def prediction_detail(prediction: Prediction, constituency: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Prediction as shown on the constituency page
+    constituency is a record from the constituency index
+    """
+    # Get alliance from extra_data
+    alliance = prediction.extra_data.get('predicted_winner_alliance') if prediction.extra_data else prediction.predicted_winner_party
+    top_alliances = prediction.extra_data.get('top_alliances', []) if prediction.extra_data else []
+
+    # Reclassify confidence based on relaxed thresholds
+    reclassified_confidence = reclassify_confidence_level(prediction.win_probability, prediction.predicted_margin_pct)
+
+    # If toss-up, show as "Toss-up" instead of alliance
+    if reclassified_confidence.lower() == 'toss-up':
+        alliance = 'Toss-up'
+        party = 'Toss-up'
+    else:
+        party = prediction.predicted_winner_party
+
+    return {
+        "id": prediction.id,
+        "constituency_id": prediction.constituency_id,
+        "constituency": {
+            "name": constituency["name"],
+            "ac_number": constituency["ac_number"],
+            "district": constituency["district"],
+            "region": constituency["region"],
+            "population": constituency["population"],
+            "urban_pct": constituency["urban_population_pct"],
+            "literacy_rate": constituency["literacy_rate"]
+        },
+        "predicted_winner_alliance": alliance,
+        "predicted_winner_party": party,
+        "confidence_level": reclassified_confidence,
+        "win_probability": prediction.win_probability,
+        "predicted_vote_share": prediction.predicted_vote_share,
+        "predicted_margin_pct": prediction.predicted_margin_pct,
+        "top_alliances": top_alliances,
+        "swing_from_last_election": prediction.swing_from_last_election,
+        "key_factors": prediction.key_factors,
+        "created_at": prediction.created_at.isoformat()
+    }
+
+
+@router.get("/summary", dependencies=[Depends(PREDICTIONS)])
+@budget(COST_LIST)
+@cached(ttl=settings.CACHE_TTL_PREDICTIONS, tags=[TAG_PREDICTIONS])
 async def get_predictions_summary(
+    request: Request,
     year: int = Query(default=2026, description="Election year"),
     db: Session = Depends(get_db)
 ):
@@ -47,7 +109,7 @@ async def get_predictions_summary(
     """
     # Get all predictions for the year
     predictions = db.query(Prediction).filter(
-        Prediction.predicted_year == year
+        served_predictions(db, year)
     ).all()
 
     if not predictions:
@@ -108,6 +170,7 @@ async def get_predictions_summary(
     generated_date = latest_pred.created_at.isoformat()
 
     return {
+        "run_id": current_run_id(db, year),
         "total_seats": total_seats,
         "majority_mark": 117,
         "predictions_complete": predictions_complete,
@@ -120,8 +183,11 @@ async def get_predictions_summary(
     }
 
 
-@router.get("/")
+@router.get("/", dependencies=[Depends(PREDICTIONS)])
+@budget(COST_LIST)
+@cached(ttl=settings.CACHE_TTL_PREDICTIONS, tags=[TAG_PREDICTIONS, TAG_CONSTITUENCIES])
 async def get_all_predictions(
+    request: Request,
     year: int = Query(default=2026),
     alliance: Optional[str] = Query(default=None),
     confidence_level: Optional[str] = Query(default=None),
@@ -145,7 +211,7 @@ async def get_all_predictions(
         Constituency,
         Prediction.constituency_id == Constituency.id
     ).filter(
-        Prediction.predicted_year == year
+        served_predictions(db, year)
     )
 
     # Apply SQL filters (except alliance and confidence_level which need reclassification)
@@ -212,8 +278,11 @@ async def get_all_predictions(
     }
 
 
-@router.get("/constituency/{constituency_id}")
+@router.get("/constituency/{constituency_id}", dependencies=[Depends(PREDICTIONS)])
+@budget(COST_LOOKUP)
+@cached(ttl=settings.CACHE_TTL_PREDICTIONS, tags=[TAG_PREDICTIONS, TAG_CONSTITUENCIES])
 async def get_constituency_prediction(
+    request: Request,
     constituency_id: int,
     year: int = Query(default=2026),
     db: Session = Depends(get_db)
@@ -224,7 +293,7 @@ async def get_constituency_prediction(
     # Get prediction
     prediction = db.query(Prediction).filter(
         Prediction.constituency_id == constituency_id,
-        Prediction.predicted_year == year
+        served_predictions(db, year)
     ).first()
 
     if not prediction:
@@ -234,54 +303,19 @@ async def get_constituency_prediction(
         )
 
     # Get constituency details
-    constituency = db.query(Constituency).filter(Constituency.id == constituency_id).first()
+    constituency = get_constituency_index(db).get_by_id(constituency_id)
 
     if not constituency:
         raise HTTPException(status_code=404, detail="Constituency not found")
 
-    # Get alliance from extra_data
-    alliance = prediction.extra_data.get('predicted_winner_alliance') if prediction.extra_data else prediction.predicted_winner_party
-    top_alliances = prediction.extra_data.get('top_alliances', []) if prediction.extra_data else []
-
-    # Reclassify confidence based on relaxed thresholds
-    reclassified_confidence = reclassify_confidence_level(prediction.win_probability, prediction.predicted_margin_pct)
+    return {"prediction": prediction_detail(prediction, constituency)}
 
-    # If toss-up, show as "Toss-up" instead of alliance
-    if reclassified_confidence.lower() == 'toss-up':
-        alliance = 'Toss-up'
-        party = 'Toss-up'
-    else:
-        party = prediction.predicted_winner_party
 
-    return {
-        "prediction": {
-            "id": prediction.id,
-            "constituency_id": prediction.constituency_id,
-            "constituency": {
-                "name": constituency.name,
-                "ac_number": constituency.ac_number,
-                "district": constituency.district,
-                "region": constituency.region,
-                "population": constituency.population,
-                "urban_pct": constituency.urban_population_pct,
-                "literacy_rate": constituency.literacy_rate
-            },
-            "predicted_winner_alliance": alliance,
-            "predicted_winner_party": party,
-            "confidence_level": reclassified_confidence,
-            "win_probability": prediction.win_probability,
-            "predicted_vote_share": prediction.predicted_vote_share,
-            "predicted_margin_pct": prediction.predicted_margin_pct,
-            "top_alliances": top_alliances,
-            "swing_from_last_election": prediction.swing_from_last_election,
-            "key_factors": prediction.key_factors,
-            "created_at": prediction.created_at.isoformat()
-        }
-    }
-
-
-@router.get("/regional-summary")
+@router.get("/regional-summary", dependencies=[Depends(PREDICTIONS)])
+@budget(COST_LIST)
+@cached(ttl=settings.CACHE_TTL_PREDICTIONS, tags=[TAG_PREDICTIONS, TAG_CONSTITUENCIES])
 async def get_regional_summary(
+    request: Request,
     year: int = Query(default=2026),
     db: Session = Depends(get_db)
 ):
@@ -296,7 +330,7 @@ async def get_regional_summary(
         Constituency,
         Prediction.constituency_id == Constituency.id
     ).filter(
-        Prediction.predicted_year == year
+        served_predictions(db, year)
     ).all()
 
     # Structure data by region
@@ -324,8 +358,105 @@ async def get_regional_summary(
     }
 
 
-@router.get("/comparison")
+@router.get("/seat-distribution", dependencies=[Depends(PREDICTIONS)])
+@budget(COST_LIST)
+@cached(ttl=settings.CACHE_TTL_PREDICTIONS, tags=[TAG_PREDICTIONS, TAG_CONSTITUENCIES])
+def get_seat_distribution(
+    request: Request,
+    year: int = Query(default=2026, description="Election year"),
+    db: Session = Depends(get_db)
+):
+    """
+    Exact seat-count distribution per alliance
+    Each seat's win_probability is an independent Bernoulli trial (Poisson-binomial);
+    point seats and confidence counts match /summary
+    """
+    distribution, version = load_seat_distribution(
+        db, year, reclassify_confidence_level, CONFIDENCE_THRESHOLDS_VERSION
+    )
+    if distribution is None:
+        raise HTTPException(status_code=404, detail=f"No predictions found for year {year}")
+
+    return {
+        "year": year,
+        "prediction_version": version,
+        "thresholds_version": CONFIDENCE_THRESHOLDS_VERSION,
+        **distribution,
+    }
+
+
+@router.get("/simulation", dependencies=[Depends(PREDICTIONS)])
+@budget(COST_ANALYSIS)
+@cached(ttl=settings.CACHE_TTL_PREDICTIONS, tags=[TAG_PREDICTIONS, TAG_CONSTITUENCIES])
+def get_seat_simulation(
+    request: Request,
+    year: int = Query(default=2026),
+    simulations: int = Query(default=100_000, ge=1_000, le=MAX_SIMULATIONS),
+    national_sd: float = Query(default=NATIONAL_SD, ge=0, le=15, description="Statewide error per alliance (vote-share points)"),
+    regional_sd: float = Query(default=REGIONAL_SD, ge=0, le=15, description="Regional error per alliance (vote-share points)"),
+    seed: int = Query(default=DEFAULT_SEED, ge=0),
+    db: Session = Depends(get_db)
+):
+    """
+    Monte Carlo seat projection from the stored predictions
+    Seat distribution per alliance, P(majority) and tipping-point seats
+    (sync route: the simulation is CPU-bound, so it runs in the threadpool)
+    """
+    matrix, version = load_prediction_matrix(db, year)
+    if matrix is None:
+        raise HTTPException(status_code=404, detail=f"No predictions found for year {year}")
+
+    projection = simulate_seats(matrix, simulations, national_sd, regional_sd, seed)
+    return {
+        "year": year,
+        "prediction_version": version,
+        "national_sd": national_sd,
+        "regional_sd": regional_sd,
+        "seed": seed,
+        **projection,
+    }
+
+
+@router.post("/scenario")
+@budget(COST_LOOKUP)
+def run_swing_scenario(request: Request, scenario: ScenarioRequest, db: Session = Depends(get_db)):
+    """
+    Seat counts and flipped seats under a uniform swing
+    Applied to a preloaded seat x alliance vote-share matrix (no per-request queries)
+    """
+    year = scenario.year or DEFAULT_YEARS[scenario.base]
+    matrix = get_vote_matrix(db, scenario.base, year)
+    if matrix is None:
+        raise HTTPException(status_code=404, detail=f"No {scenario.base} found for year {year}")
+
+    alliances = set(matrix.alliances)
+    unknown = set(scenario.swing).union(*scenario.regional_swing.values()) - alliances
+    if unknown:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown alliance(s) {sorted(unknown)}; expected one of {matrix.alliances}"
+        )
+    unknown_regions = set(scenario.regional_swing) - set(matrix.regions)
+    if unknown_regions:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown region(s) {sorted(unknown_regions)}; expected one of {matrix.regions}"
+        )
+
+    return {
+        "base": scenario.base,
+        "year": year,
+        "swing": scenario.swing,
+        "regional_swing": scenario.regional_swing,
+        **apply_swing(matrix, scenario.swing, scenario.regional_swing),
+    }
+
+
+@router.get("/comparison", dependencies=[Depends(PREDICTION_COMPARISON)])
+@budget(COST_ANALYSIS)
+@cached(ttl=settings.CACHE_TTL_PREDICTIONS, tags=[TAG_PREDICTIONS, TAG_RESULTS])
 async def get_prediction_comparison(
+    request: Request,
     from_year: int = Query(default=2021),
     to_year: int = Query(default=2026),
     db: Session = Depends(get_db)
@@ -335,16 +466,15 @@ async def get_prediction_comparison(
     """
     # Get historical results for from_year
     historical_results = db.query(
-        ElectionResult.party,
-        func.count(ElectionResult.id).label('seats')
+        ConstituencyResultSummary.winner_party,
+        func.count(ConstituencyResultSummary.id).label('seats')
     ).filter(
-        ElectionResult.year == from_year,
-        ElectionResult.is_winner == 1
-    ).group_by(ElectionResult.party).all()
+        ConstituencyResultSummary.year == from_year
+    ).group_by(ConstituencyResultSummary.winner_party).all()
 
     # Get predictions for to_year
     predictions = db.query(Prediction).filter(
-        Prediction.predicted_year == to_year
+        served_predictions(db, to_year)
     ).all()
 
     # Map parties to alliances for historical data
@@ -399,3 +529,52 @@ async def get_prediction_comparison(
         "to_year": to_year,
         "comparison": comparison
     }
+
+
+@router.get("/runs", dependencies=[Depends(PREDICTIONS)])
+@budget(COST_LOOKUP)
+@cached(ttl=settings.CACHE_TTL_PREDICTIONS, tags=[TAG_PREDICTIONS])
+async def get_prediction_runs(
+    request: Request,
+    year: int = Query(default=2026),
+    db: Session = Depends(get_db)
+):
+    """
+    Prediction runs for a year, newest first
+    current marks the run the other prediction endpoints serve
+    """
+    return {
+        "year": year,
+        "current_run_id": current_run_id(db, year),
+        "runs": list_runs(db, year)
+    }
+
+
+@router.get("/runs/{from_run_id}/diff/{to_run_id}", dependencies=[Depends(PREDICTIONS)])
+@budget(COST_ANALYSIS)
+@cached(ttl=settings.CACHE_TTL_PREDICTIONS, tags=[TAG_PREDICTIONS, TAG_CONSTITUENCIES])
+async def get_prediction_run_diff(
+    request: Request,
+    from_run_id: int,
+    to_run_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    Changes between two prediction runs
+    Changed winners, confidence moves (reclassified as on the site) and
+    vote-share, margin and probability deltas per seat, from one query
+    """
+    runs = {run.id: run for run in db.query(PredictionRun).filter(PredictionRun.id.in_([from_run_id, to_run_id]))}
+    for run_id in (from_run_id, to_run_id):
+        if run_id not in runs:
+            raise HTTPException(status_code=404, detail=f"Prediction run {run_id} not found")
+
+    diff = diff_runs(db, from_run_id, to_run_id, reclassify_confidence_level)
+    current = current_run_id(db, runs[to_run_id].predicted_year)
+
+    return {
+        "from_run": run_record(runs[from_run_id], diff["seats_compared"] + diff["removed"], current),
+        "to_run": run_record(runs[to_run_id], diff["seats_compared"] + diff["added"], current),
+        "thresholds_version": CONFIDENCE_THRESHOLDS_VERSION,
+        **diff,
+    }
@@ -0,0 +1,508 @@
+"""
+Shared response cache
+
+Backends:
+- memory: per-process dict (default, fine for a single uvicorn worker)
+- redis: any Redis-protocol server, shared by every worker behind nginx
+- none: caching disabled
+
+Route functions opt in with the @cached decorator. Entries carry tags
+("results", "predictions", ...) so writers can drop everything derived from
+the data they changed with invalidate().
+"""
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import threading
+import time
+import types
+import typing
+import uuid
+from datetime import date
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from fastapi import BackgroundTasks, Request, Response, params
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.serialization import dumps, fast_json
+
+# Tags for the data a cached response was built from
+TAG_CONSTITUENCIES = "constituencies"
+TAG_ELECTIONS = "elections"
+TAG_RESULTS = "results"
+TAG_PREDICTIONS = "predictions"
+
+# Single-flight: how long a computing request holds the lock, and how long
+# (and how often) other requests wait for its result before computing themselves
+LOCK_TTL = 30.0  # seconds
+LOCK_WAIT = 10.0  # seconds
+LOCK_POLL_INTERVAL = 0.025  # seconds
+
+# In-memory backend: how often expired entries are swept
+MEMORY_SWEEP_INTERVAL = 60.0  # seconds
+
+# Keys longer than this (e.g. from request bodies) are replaced by their hash
+MAX_KEY_LENGTH = 250
+
+CACHE_HEADER = "X-Cache"
+
+
+class CacheBackend:
+    """Interface shared by all backends (values are bytes)"""
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl: float, tags: Iterable[str] = ()):
+        raise NotImplementedError
+
+    def acquire_lock(self, key: str, ttl: float) -> Optional[str]:
+        """Take the single-flight lock for a key; returns a token, or None if already held"""
+        raise NotImplementedError
+
+    def release_lock(self, key: str, token: str):
+        raise NotImplementedError
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """Delete every entry carrying any of the tags; returns the number of entries removed"""
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class NullCache(CacheBackend):
+    """Caching disabled - every lookup misses"""
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value, ttl, tags=()):
+        pass
+
+    def acquire_lock(self, key, ttl):
+        return "none"
+
+    def release_lock(self, key, token):
+        pass
+
+    def invalidate_tags(self, tags):
+        return 0
+
+    def clear(self):
+        pass
+
+
+class InMemoryCache(CacheBackend):
+    """
+    Process-local cache (each uvicorn worker keeps its own copy)
+
+    Holds at most max_entries: expired entries (and their tag memberships)
+    are swept every MEMORY_SWEEP_INTERVAL and whenever the cache is full,
+    then the oldest entries are evicted down to 90% of the limit.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: Dict[str, Tuple[float, bytes, Tuple[str, ...]]] = {}
+        self._tags: Dict[str, Set[str]] = {}
+        self._locks: Dict[str, Tuple[float, str]] = {}
+        self._mutex = threading.Lock()
+        self._next_sweep = time.monotonic() + MEMORY_SWEEP_INTERVAL
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _drop(self, key: str) -> bool:
+        """Remove an entry and its tag memberships (caller holds the mutex)"""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        for tag in entry[2]:
+            members = self._tags.get(tag)
+            if members is not None:
+                members.discard(key)
+                if not members:
+                    del self._tags[tag]
+        return True
+
+    def _sweep(self, now: float):
+        """Remove expired entries and locks (caller holds the mutex)"""
+        for key in [key for key, entry in self._entries.items() if entry[0] <= now]:
+            self._drop(key)
+        for key in [key for key, lock in self._locks.items() if lock[0] <= now]:
+            del self._locks[key]
+        self._next_sweep = now + MEMORY_SWEEP_INTERVAL
+
+    def get(self, key):
+        with self._mutex:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                self._drop(key)
+                return None
+            return entry[1]
+
+    def set(self, key, value, ttl, tags=()):
+        now = time.monotonic()
+        with self._mutex:
+            self._drop(key)
+            if now >= self._next_sweep or len(self._entries) >= self.max_entries:
+                self._sweep(now)
+            if len(self._entries) >= self.max_entries:
+                # Oldest first (dicts keep insertion order)
+                excess = len(self._entries) - int(self.max_entries * 0.9) + 1
+                for old_key in list(self._entries)[:excess]:
+                    self._drop(old_key)
+
+            entry_tags = tuple(dict.fromkeys(tags))
+            self._entries[key] = (now + ttl, value, entry_tags)
+            for tag in entry_tags:
+                self._tags.setdefault(tag, set()).add(key)
+
+    def acquire_lock(self, key, ttl):
+        now = time.monotonic()
+        with self._mutex:
+            held = self._locks.get(key)
+            if held and held[0] > now:
+                return None
+            token = uuid.uuid4().hex
+            self._locks[key] = (now + ttl, token)
+            return token
+
+    def release_lock(self, key, token):
+        with self._mutex:
+            held = self._locks.get(key)
+            if held and held[1] == token:
+                del self._locks[key]
+
+    def invalidate_tags(self, tags):
+        removed = 0
+        with self._mutex:
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    removed += self._drop(key)
+                self._tags.pop(tag, None)
+        return removed
+
+    def clear(self):
+        with self._mutex:
+            self._entries.clear()
+            self._tags.clear()
+            self._locks.clear()
+
+
+class RedisCache(CacheBackend):
+    """
+    Cache shared by all workers through a Redis-protocol server
+
+    Only plain commands are used (GET, SET with EX/PX/NX, DEL, SADD,
+    SMEMBERS, SCAN), so any redis-py compatible client works, including
+    in-process fakes.
+    """
+
+    def __init__(self, client, prefix: str = "votelytics:cache:"):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisCache":
+        """Connect with redis-py (requires the redis package)"""
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("CACHE_BACKEND=redis requires the redis package (poetry install -E cache)")
+        return cls(redis.Redis.from_url(url))
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+
+    def _lock_key(self, key: str) -> str:
+        return f"{self.prefix}lock:{key}"
+
+    def get(self, key):
+        return self.client.get(self._key(key))
+
+    def set(self, key, value, ttl, tags=()):
+        full_key = self._key(key)
+        self.client.set(full_key, value, px=int(ttl * 1000))
+        # Tag sets only list keys; members that expired on their own are
+        # harmless and are dropped on the next invalidation
+        for tag in tags:
+            self.client.sadd(self._tag_key(tag), full_key)
+
+    def acquire_lock(self, key, ttl):
+        token = uuid.uuid4().hex
+        if self.client.set(self._lock_key(key), token, nx=True, px=int(ttl * 1000)):
+            return token
+        return None
+
+    def release_lock(self, key, token):
+        lock_key = self._lock_key(key)
+        held = self.client.get(lock_key)
+        if held is not None and (held.decode() if isinstance(held, bytes) else held) == token:
+            self.client.delete(lock_key)
+
+    def invalidate_tags(self, tags):
+        removed = 0
+        for tag in tags:
+            tag_key = self._tag_key(tag)
+            members = list(self.client.smembers(tag_key))
+            if members:
+                removed += self.client.delete(*members)
+            self.client.delete(tag_key)
+        return removed
+
+    def clear(self):
+        keys = list(self.client.scan_iter(match=f"{self.prefix}*"))
+        if keys:
+            self.client.delete(*keys)
+
+
+_backend: Optional[CacheBackend] = None
+_backend_mutex = threading.Lock()
+
+
+def create_cache_backend(name: str, redis_url: str = "", max_entries: int = 10000) -> CacheBackend:
+    if name == "redis":
+        return RedisCache.from_url(redis_url)
+    if name == "none":
+        return NullCache()
+    if name == "memory":
+        return InMemoryCache(max_entries)
+    raise RuntimeError(f"Unknown CACHE_BACKEND '{name}' (expected memory, redis or none)")
+
+
+def get_cache() -> CacheBackend:
+    """The process-wide cache backend, created from settings on first use"""
+    global _backend
+
+    if _backend is None:
+        with _backend_mutex:
+            if _backend is None:
+                _backend = create_cache_backend(
+                    settings.CACHE_BACKEND, settings.CACHE_REDIS_URL, settings.CACHE_MAX_ENTRIES
+                )
+    return _backend
+
+
+def set_cache(backend: CacheBackend):
+    """Replace the process-wide backend (e.g. with a fake Redis client in tests)"""
+    global _backend
+    _backend = backend
+
+
+def invalidate(*tags: str) -> int:
+    """Drop every cached response built from the tagged data"""
+    return get_cache().invalidate_tags(tags)
+
+
+# Arguments FastAPI injects rather than parses from the request; not part of the key
+INJECTED_TYPES = (Request, Response, BackgroundTasks, Session)
+# Argument types a cache key can be built from (containers of these, too)
+KEY_TYPES = (str, int, float, bool, type(None), Enum, date, BaseModel, list, tuple, set, frozenset, dict)
+
+
+def _injected(parameter: inspect.Parameter) -> bool:
+    if isinstance(parameter.default, params.Depends):
+        return True
+    annotation = parameter.annotation
+    if typing.get_origin(annotation) is typing.Annotated:
+        if any(isinstance(meta, params.Depends) for meta in annotation.__metadata__):
+            return True
+        annotation = typing.get_args(annotation)[0]
+    return isinstance(annotation, type) and issubclass(annotation, INJECTED_TYPES)
+
+
+def _keyable(annotation: Any) -> bool:
+    """Whether values of an annotated type can be turned into a cache key"""
+    if annotation is inspect.Parameter.empty or annotation is Any:
+        return True  # checked per value by _key_value
+    origin = typing.get_origin(annotation)
+    if origin is typing.Literal:
+        return True
+    if origin is typing.Annotated:
+        return _keyable(typing.get_args(annotation)[0])
+    if origin is not None:  # Optional, Union, List[...], Dict[...], ...
+        return (origin in KEY_TYPES or origin in (typing.Union, types.UnionType)) and all(
+            _keyable(arg) for arg in typing.get_args(annotation) if arg is not Ellipsis
+        )
+    return isinstance(annotation, type) and issubclass(annotation, KEY_TYPES)
+
+
+def _key_parameters(func: Callable, signature: inspect.Signature) -> List[str]:
+    """
+    Names of the route arguments that make up its cache key (path, query and
+    body parameters; injected sessions, requests and responses are skipped)
+
+    Raises TypeError for a parameter whose type cannot be part of a key, so a
+    route never shares entries between requests that differ in it.
+    """
+    names = []
+    for name, parameter in signature.parameters.items():
+        if _injected(parameter):
+            continue
+        if not _keyable(parameter.annotation):
+            raise TypeError(
+                f"@cached {func.__qualname__}: parameter '{name}' ({parameter.annotation}) "
+                f"cannot be part of a cache key"
+            )
+        names.append(name)
+    return names
+
+
+def _key_value(value: Any) -> Any:
+    """JSON-able form of an argument value for the cache key"""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, dict):
+        return {str(k): _key_value(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_key_value(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted((_key_value(v) for v in value), key=repr)
+    raise TypeError(f"Cannot build a cache key from a {type(value).__name__} argument")
+
+
+def _cache_key(
+    prefix: str,
+    signature: inspect.Signature,
+    names: Sequence[str],
+    args,
+    kwargs,
+) -> Tuple[str, Dict[str, Any]]:
+    """Build the cache key from the route's key parameters (see _key_parameters)"""
+    bound = signature.bind_partial(*args, **kwargs)
+    key_params = {name: _key_value(bound.arguments[name]) for name in names if name in bound.arguments}
+    encoded = json.dumps(key_params, sort_keys=True, separators=(',', ':'))
+    if len(encoded) > MAX_KEY_LENGTH:
+        encoded = hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+    return f"{prefix}:{encoded}", key_params
+
+
+def _claim(backend: CacheBackend, key: str) -> Tuple[Optional[str], Optional[bytes]]:
+    """One single-flight attempt: the cached body, or else the lock token (None if held elsewhere)"""
+    body = backend.get(key)
+    if body is not None:
+        return None, body
+    return backend.acquire_lock(key, LOCK_TTL), None
+
+
+def _encoder(model: Any, trusted: bool) -> Callable[[Any], bytes]:
+    if model is None:
+        return dumps
+    if trusted:
+        return lambda result: fast_json(result, model)
+
+    adapter = TypeAdapter(model)
+    return lambda result: adapter.dump_json(adapter.validate_python(result, from_attributes=True))
+
+
+def _response(body: bytes, status: str) -> Response:
+    return Response(content=body, media_type="application/json", headers={CACHE_HEADER: status})
+
+
+def cached(
+    ttl: float,
+    tags: Sequence[str] = (),
+    model: Any = None,
+    key_prefix: Optional[str] = None,
+    trusted: bool = False,
+):
+    """
+    Cache a route function's JSON response
+
+    Args:
+        ttl: Seconds an entry stays fresh
+        tags: Data the response depends on; may reference arguments, e.g. "predictions:{year}"
+        model: Response model used to serialize ORM results (the route's response_model)
+        key_prefix: Cache key namespace (default: module.function)
+        trusted: Map results onto the model without validating them (see app.serialization)
+
+    Concurrent misses for the same key are collapsed: one request computes
+    while the others wait for its result (across workers with the Redis backend).
+    Errors (HTTPException) are never cached; waiters then take the lock
+    themselves as soon as it is released.
+
+    Usage:
+        @router.get("/{year}/party-summary", response_model=PartySummaryResponse)
+        @cached(ttl=300, tags=[TAG_RESULTS], model=PartySummaryResponse)
+        def get_party_summary(year: int, db: Session = Depends(get_db)):
+            ...
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        names = _key_parameters(func, signature)
+        prefix = key_prefix or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+        encode = _encoder(model, trusted)
+
+        def prepare(args, kwargs):
+            key, key_params = _cache_key(prefix, signature, names, args, kwargs)
+            return key, [tag.format(**key_params) for tag in tags]
+
+        def store(backend, key, entry_tags, result):
+            if isinstance(result, Response):
+                return result
+            body = encode(result)
+            backend.set(key, body, ttl, entry_tags)
+            return _response(body, "MISS")
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                backend = get_cache()
+                key, entry_tags = prepare(args, kwargs)
+
+                token, body = _claim(backend, key)
+                deadline = time.monotonic() + LOCK_WAIT
+                while token is None and body is None and time.monotonic() < deadline:
+                    await asyncio.sleep(LOCK_POLL_INTERVAL)
+                    token, body = _claim(backend, key)
+                if body is not None:
+                    return _response(body, "HIT")
+
+                try:
+                    return store(backend, key, entry_tags, await func(*args, **kwargs))
+                finally:
+                    if token:
+                        backend.release_lock(key, token)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            backend = get_cache()
+            key, entry_tags = prepare(args, kwargs)
+
+            token, body = _claim(backend, key)
+            deadline = time.monotonic() + LOCK_WAIT
+            while token is None and body is None and time.monotonic() < deadline:
+                time.sleep(LOCK_POLL_INTERVAL)
+                token, body = _claim(backend, key)
+            if body is not None:
+                return _response(body, "HIT")
+
+            try:
+                return store(backend, key, entry_tags, func(*args, **kwargs))
+            finally:
+                if token:
+                    backend.release_lock(key, token)
+
+        return wrapper
+
+    return decorator
@@ -6,6 +6,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
+from app.metrics import instrument_engine
 
 # Create database engine
 engine = create_engine(
@@ -14,6 +15,9 @@ engine = create_engine(
     echo=False,  # Set to True to see SQL queries in logs
 )
 
+# Attribute SQL statement counts and DB time to the request being served
+instrument_engine(engine)
+
 # Create SessionLocal class for database sessions
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -34,3 +38,31 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Session factory for analytic endpoints, created on first use
+AnalyticsSessionLocal = None
+
+
+def get_analytics_db():
+    """
+    Dependency function for read-only analytic endpoints
+
+    Uses the main database unless ANALYTICS_BACKEND is "duckdb", in which
+    case sessions run against the Parquet snapshot in ANALYTICS_SNAPSHOT_DIR.
+    """
+    global AnalyticsSessionLocal
+
+    if settings.ANALYTICS_BACKEND != "duckdb":
+        yield from get_db()
+        return
+
+    if AnalyticsSessionLocal is None:
+        from app.analytics import create_snapshot_sessionmaker
+        AnalyticsSessionLocal = create_snapshot_sessionmaker(settings.ANALYTICS_SNAPSHOT_DIR)
+
+    db = AnalyticsSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
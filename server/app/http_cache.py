@@ -0,0 +1,221 @@
+"""
+HTTP caching policies for API routes
+Emits Cache-Control and Last-Modified so nginx and browsers can reuse
+responses, and answers conditional requests (If-Modified-Since) with 304
+
+Usage:
+    @router.get("/year/{year}/results", dependencies=[Depends(HISTORICAL_RESULTS)])
+"""
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional, Sequence
+
+from fastapi import Depends, HTTPException, Request
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.cache import get_cache, TAG_CONSTITUENCIES, TAG_ELECTIONS, TAG_PREDICTIONS, TAG_RESULTS
+from app.database import get_db, get_analytics_db
+from app.models.constituency import Constituency
+from app.models.election import Election, ElectionResult, ConstituencyResultSummary, PartyVoteRollup
+from app.models.prediction import CurrentPredictionRun, Prediction, PredictionRun
+
+# Per-table data versions (max updated_at) are looked up at most this often
+DATA_VERSION_TTL = 60  # seconds
+# How long the last (updated_at, row count) observation is kept to detect deletes
+DATA_VERSION_STATE_TTL = 30 * 86400  # seconds
+
+# Cache tag that invalidates each table's data version
+TABLE_TAGS = {
+    Constituency: TAG_CONSTITUENCIES,
+    Election: TAG_ELECTIONS,
+    ElectionResult: TAG_RESULTS,
+    ConstituencyResultSummary: TAG_RESULTS,
+    PartyVoteRollup: TAG_RESULTS,
+    Prediction: TAG_PREDICTIONS,
+    PredictionRun: TAG_PREDICTIONS,
+    CurrentPredictionRun: TAG_PREDICTIONS,
+}
+
+
+def _utc_seconds(value: Optional[datetime]) -> Optional[datetime]:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def _isoformat(value: Optional[datetime]) -> str:
+    return value.isoformat() if value else ""
+
+
+def _parse(value: str) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def data_version(db: Session, model) -> Optional[datetime]:
+    """
+    Version of a table's data (UTC, whole seconds), cached for DATA_VERSION_TTL
+    Versions are kept per backend, so a DuckDB analytics session reports the
+    Parquet snapshot's version rather than the primary database's
+
+    Normally the latest updated_at. Deletes don't move that, so the table's
+    row count is kept in the shared cache next to the version it produced:
+    when the rows change without a newer updated_at, the version moves one
+    second past the stored one. It is derived from the stored state only, so
+    every worker reports the same version. Without a stored observation
+    (first lookup, or the state expired) the version is the latest
+    updated_at; deletes are only detected while the state is kept, which
+    needs a shared cache backend (CACHE_BACKEND=redis) across processes.
+    """
+    cache = get_cache()
+    key = f"data_version:{db.get_bind().dialect.name}:{model.__tablename__}"
+
+    cached = cache.get(key)
+    if cached is not None:
+        return _parse(cached.decode("ascii"))
+
+    latest, rows = db.query(func.max(model.updated_at), func.count()).select_from(model).one()
+    latest = _utc_seconds(latest)
+    observed = f"{_isoformat(latest)}|{rows}"
+
+    # Last observation and the version it produced: "<latest>|<rows>|<version>"
+    state_key = f"{key}:state"
+    state = cache.get(state_key)
+    previous_observed, previous_version = None, None
+    if state is not None:
+        previous_observed, _, version = state.decode("ascii").rpartition("|")
+        previous_version = _parse(version)
+
+    if observed == previous_observed:
+        version = previous_version
+    elif previous_version is not None and (latest is None or latest <= previous_version):
+        version = previous_version + timedelta(seconds=1)  # Rows deleted
+    else:
+        version = latest  # Inserts and updates move updated_at; None for an empty table
+
+    cache.set(state_key, f"{observed}|{_isoformat(version)}".encode("ascii"), DATA_VERSION_STATE_TTL)
+    cache.set(key, _isoformat(version).encode("ascii"), DATA_VERSION_TTL, [TABLE_TAGS[model]])
+    return version
+
+
+class CachePolicy:
+    """
+    Route dependency applying one caching policy
+
+    - Cache-Control: public, max-age, stale-while-revalidate
+    - Last-Modified: newest updated_at across the tables the route reads
+    - 304 Not Modified when If-Modified-Since is at least that recent
+
+    Headers are left in request.state and added to successful responses by
+    HTTPCacheMiddleware, so they also apply to responses served by @cached.
+    Versions are read through get_db; routes on get_analytics_db use
+    AnalyticsCachePolicy.
+    """
+
+    def __init__(self, max_age: int, stale_while_revalidate: int, tables: Sequence):
+        self.max_age = max_age
+        self.stale_while_revalidate = stale_while_revalidate
+        self.tables = tuple(tables)
+        self.cache_control = (
+            f"public, max-age={max_age}, stale-while-revalidate={stale_while_revalidate}"
+        )
+
+    def __call__(self, request: Request, db: Session = Depends(get_db)):
+        self.apply(request, db)
+
+    def apply(self, request: Request, db: Session):
+        """Set the cache headers from the data versions in db, or raise 304"""
+        headers = {"Cache-Control": self.cache_control}
+
+        versions = [v for v in (data_version(db, model) for model in self.tables) if v]
+        if versions:
+            last_modified = max(versions)
+            headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+
+            if_modified_since = request.headers.get("if-modified-since")
+            if if_modified_since and request.method in ("GET", "HEAD"):
+                try:
+                    since = parsedate_to_datetime(if_modified_since)
+                except (TypeError, ValueError):
+                    since = None
+                if since is not None and since.tzinfo is not None and last_modified <= since:
+                    raise HTTPException(status_code=304, headers=headers)
+
+        request.state.cache_headers = headers
+
+
+class AnalyticsCachePolicy(CachePolicy):
+    """
+    CachePolicy for routes that read through get_analytics_db
+    Versions come from the same session as the data, so with the DuckDB
+    backend Last-Modified follows the Parquet snapshot the route serves
+    """
+
+    def __call__(self, request: Request, db: Session = Depends(get_analytics_db)):
+        self.apply(request, db)
+
+
+# Historical results never change after an election is loaded (short of
+# corrections, which bump updated_at), so let caches keep them for a day
+# and serve stale copies for a week while they revalidate in the background
+HISTORICAL_RESULTS = CachePolicy(
+    max_age=86400,
+    stale_while_revalidate=604800,
+    tables=[Election, ElectionResult, ConstituencyResultSummary, PartyVoteRollup],
+)
+# Same policy for the analytic routes, which may be served from the snapshot
+ANALYTIC_RESULTS = AnalyticsCachePolicy(
+    max_age=86400,
+    stale_while_revalidate=604800,
+    tables=[Election, ElectionResult, ConstituencyResultSummary, PartyVoteRollup],
+)
+ELECTIONS = CachePolicy(max_age=86400, stale_while_revalidate=604800, tables=[Election])
+CONSTITUENCIES = CachePolicy(max_age=3600, stale_while_revalidate=86400, tables=[Constituency])
+
+# Predictions are regenerated while a campaign runs; publishing a run moves the current-run pointer
+PREDICTIONS = CachePolicy(
+    max_age=60,
+    stale_while_revalidate=600,
+    tables=[Prediction, PredictionRun, CurrentPredictionRun, Constituency],
+)
+# The constituency page bundles a prediction, so it follows the prediction policy
+CONSTITUENCY_PAGE = CachePolicy(
+    max_age=60,
+    stale_while_revalidate=600,
+    tables=[Constituency, ElectionResult, Prediction, CurrentPredictionRun],
+)
+PREDICTION_COMPARISON = CachePolicy(
+    max_age=60,
+    stale_while_revalidate=600,
+    tables=[Prediction, CurrentPredictionRun, ConstituencyResultSummary],
+)
+
+
+class HTTPCacheMiddleware:
+    """Adds the headers chosen by a route's CachePolicy to its 200 responses"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                cache_headers = scope.get("state", {}).get("cache_headers")
+                if cache_headers:
+                    names = {name.lower().encode("latin-1") for name in cache_headers}
+                    message["headers"] = [
+                        (name, value) for name, value in message.get("headers", [])
+                        if name.lower() not in names
+                    ] + [
+                        (name.lower().encode("latin-1"), value.encode("latin-1"))
+                        for name, value in cache_headers.items()
+                    ]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
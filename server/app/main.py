@@ -2,12 +2,30 @@
 Votelytics API - FastAPI Application
 Electoral predictions and analysis platform
 """
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, PlainTextResponse
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from app.config import settings
+from app.http_cache import HTTPCacheMiddleware
+from app.metrics import MetricsMiddleware, PROMETHEUS_CONTENT_TYPE, render_metrics
 from app.rate_limiters import limiter
+from app.services.constituency_index import load_constituency_index
+from app.services.vote_matrix import load_vote_matrices
+from app.services.vote_swing import load_swing_tensor
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm per-worker state before serving requests"""
+    load_constituency_index()
+    load_vote_matrices()
+    load_swing_tensor()
+    yield
+
 
 # Create FastAPI app instance
 app = FastAPI(
@@ -16,6 +34,8 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/api/docs",
     redoc_url="/api/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # Attach limiter to app state
@@ -29,8 +49,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["Content-Type", "X-Admin-Key", "Authorization"],
+    expose_headers=["X-Next-Cursor", "Last-Modified"],
 )
 
+# Cache-Control / Last-Modified headers chosen by each route's cache policy
+app.add_middleware(HTTPCacheMiddleware)
+
+# Request metrics - latency, SQL statements, DB time and response size per route
+app.add_middleware(MetricsMiddleware, exclude_paths=["/api/metrics"])
+
 
 @app.get("/")
 async def root():
@@ -48,6 +75,12 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/api/metrics", include_in_schema=False)
+async def metrics():
+    """Request and SQL metrics in Prometheus text format"""
+    return PlainTextResponse(render_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
 # Import and include API routers
 from app.api import constituencies, elections, predictions
 
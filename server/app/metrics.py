@@ -0,0 +1,186 @@
+"""
+Request and SQL instrumentation
+Per-route latency, SQL statement count, DB time and response size,
+exposed in Prometheus text format on /api/metrics
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100, 250)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class RequestStats:
+    """SQL activity attributed to the request being served"""
+
+    __slots__ = ("statements", "db_time")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_time = 0.0
+
+
+# Set by the middleware; copied into threadpool workers running sync endpoints
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by label values"""
+
+    def __init__(self, name: str, description: str, labels: Sequence[str], buckets: Sequence[float]):
+        self.name = name
+        self.description = description
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = [[0] * (len(self.buckets) + 1), 0.0, 0]
+                self._series[label_values] = series
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            snapshot = [(labels, list(s[0]), s[1], s[2]) for labels, s in sorted(self._series.items())]
+
+        for label_values, counts, total, count in snapshot:
+            base = ",".join(f'{k}="{_escape(v)}"' for k, v in zip(self.labels, label_values))
+            prefix = base + "," if base else ""
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {count}')
+            suffix = f"{{{base}}}" if base else ""
+            lines.append(f"{self.name}_sum{suffix} {total}")
+            lines.append(f"{self.name}_count{suffix} {count}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REQUEST_LATENCY = Histogram(
+    "votelytics_http_request_duration_seconds",
+    "Time spent serving HTTP requests",
+    ("method", "route", "status"),
+    LATENCY_BUCKETS,
+)
+REQUEST_STATEMENTS = Histogram(
+    "votelytics_db_statements_per_request",
+    "SQL statements executed while serving a request",
+    ("method", "route"),
+    STATEMENT_BUCKETS,
+)
+REQUEST_DB_TIME = Histogram(
+    "votelytics_db_time_seconds",
+    "Total time spent in SQL statements per request",
+    ("method", "route"),
+    LATENCY_BUCKETS,
+)
+RESPONSE_SIZE = Histogram(
+    "votelytics_http_response_size_bytes",
+    "Response body size",
+    ("method", "route"),
+    SIZE_BUCKETS,
+)
+
+HISTOGRAMS = [REQUEST_LATENCY, REQUEST_STATEMENTS, REQUEST_DB_TIME, RESPONSE_SIZE]
+
+
+def instrument_engine(engine):
+    """Count statements and time spent in the database for the current request"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _request_stats.get() is not None:
+            conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        stats = _request_stats.get()
+        if stats is None:
+            return
+        starts = conn.info.get("query_start")
+        if starts:
+            stats.db_time += time.perf_counter() - starts.pop()
+        stats.statements += 1
+
+
+def route_label(scope) -> str:
+    """
+    Route template for a request (e.g. /api/elections/{year}/results)
+    Unmatched paths are grouped together to keep label cardinality bounded
+    """
+    route = scope.get("route")
+    path = getattr(route, "path_format", None) or getattr(route, "path", None)
+    return path or "unmatched"
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording request metrics (no response buffering)"""
+
+    def __init__(self, app, exclude_paths: Sequence[str] = ()):
+        self.app = app
+        self.exclude_paths = set(exclude_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        status = 500
+        size = 0
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            _request_stats.reset(token)
+
+            method = scope["method"]
+            route = route_label(scope)
+            REQUEST_LATENCY.observe(elapsed, method, route, str(status))
+            REQUEST_STATEMENTS.observe(stats.statements, method, route)
+            REQUEST_DB_TIME.observe(stats.db_time, method, route)
+            RESPONSE_SIZE.observe(size, method, route)
+
+
+def render_metrics() -> str:
+    """All metrics in Prometheus text exposition format"""
+    lines: List[str] = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.render())
+    return "\n".join(lines) + "\n"
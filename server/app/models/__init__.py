@@ -1,13 +1,17 @@
 """Database models for Votelytics"""
 from app.models.constituency import Constituency
-from app.models.election import Election, ElectionResult
+from app.models.election import Election, ElectionResult, ConstituencyResultSummary, PartyVoteRollup
 from app.models.candidate import Candidate
-from app.models.prediction import Prediction
+from app.models.prediction import Prediction, PredictionRun, CurrentPredictionRun
 
 __all__ = [
     "Constituency",
     "Election",
     "ElectionResult",
+    "ConstituencyResultSummary",
+    "PartyVoteRollup",
     "Candidate",
     "Prediction",
+    "PredictionRun",
+    "CurrentPredictionRun",
 ]
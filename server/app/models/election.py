@@ -1,9 +1,12 @@
 """Election models - historical election data"""
-from sqlalchemy import Column, Integer, String, Date, ForeignKey, Float, JSON, DateTime
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Float, JSON, DateTime, UniqueConstraint, Index, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database import Base
 
+# Rank that results without one (rank NULL) sort as: after every real rank
+UNRANKED = 2147483647
+
 
 class Election(Base):
     """
@@ -46,6 +49,13 @@ class ElectionResult(Base):
     """
 
     __tablename__ = "election_results"
+    __table_args__ = (
+        # Keyset pagination order within an election, unranked rows last (see app/api/pagination.py)
+        Index(
+            "ix_election_results_election_ac_rank_key",
+            "election_id", "ac_number", text(f"COALESCE(rank, {UNRANKED})"), "id",
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -98,3 +108,107 @@ class ElectionResult(Base):
 
     def __repr__(self):
         return f"<ElectionResult {self.candidate_name} - {self.party} ({self.year})>"
+
+
+class ConstituencyResultSummary(Base):
+    """
+    Constituency Result Summary model
+    One row per (election, constituency) with the winner, runner-up, margin and turnout
+    Rebuilt from election_results by the loaders (see app/services/election_summaries.py)
+    so analytic queries don't re-derive it from candidate-level rows
+    """
+
+    __tablename__ = "constituency_result_summaries"
+    __table_args__ = (
+        UniqueConstraint("election_id", "constituency_id", name="uq_summary_election_constituency"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Foreign keys
+    election_id = Column(Integer, ForeignKey("elections.id"), nullable=False, index=True)
+    constituency_id = Column(Integer, ForeignKey("constituencies.id"), nullable=False, index=True)
+
+    # Denormalized election/constituency data
+    year = Column(Integer, nullable=False, index=True)
+    ac_number = Column(Integer, nullable=False, index=True)
+    ac_name = Column(String(200), nullable=False)
+    ac_slug = Column(String(200))
+
+    # Winner (rank 1)
+    winner_name = Column(String(200), nullable=False)
+    winner_party = Column(String(100), nullable=False, index=True)
+    winner_alliance = Column(String(100))
+    winner_votes = Column(Integer, nullable=False)
+    winner_vote_share_pct = Column(Float)
+
+    # Runner-up (rank 2) - empty for uncontested seats
+    runner_up_name = Column(String(200))
+    runner_up_party = Column(String(100), index=True)
+    runner_up_alliance = Column(String(100))
+    runner_up_votes = Column(Integer)
+    runner_up_vote_share_pct = Column(Float)
+
+    # Margin (same definition as ElectionResult.margin / margin_pct of the winner)
+    margin = Column(Integer)
+    margin_pct = Column(Float)
+
+    # Totals
+    total_votes = Column(Integer, nullable=False)  # Sum of all candidates' votes
+    total_electors = Column(Integer)
+    turnout_pct = Column(Float)  # total_votes / total_electors * 100
+    candidate_count = Column(Integer, nullable=False)
+
+    # Audit fields
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<ConstituencyResultSummary {self.ac_name} - {self.winner_party} ({self.year})>"
+
+
+class PartyVoteRollup(Base):
+    """
+    Party Vote Rollup model
+    Seats and votes per party or alliance for one election, statewide and
+    broken down by district and region. Maintained incrementally from
+    election_results (see app/services/election_summaries.py)
+    """
+
+    __tablename__ = "party_vote_rollups"
+    __table_args__ = (
+        UniqueConstraint(
+            "election_id", "scope", "scope_value", "group_type", "group_name",
+            name="uq_rollup_election_scope_group",
+        ),
+        Index("ix_rollup_year_scope_group", "year", "scope", "group_type"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Foreign keys
+    election_id = Column(Integer, ForeignKey("elections.id"), nullable=False, index=True)
+
+    # Denormalized election data
+    year = Column(Integer, nullable=False)
+
+    # Breakdown: state ("Tamil Nadu"), district (district name) or region (North, South, ...)
+    scope = Column(String(20), nullable=False)
+    scope_value = Column(String(100), nullable=False)
+
+    # Grouping: party or alliance (parties without an alliance count as their own bloc)
+    group_type = Column(String(20), nullable=False)
+    group_name = Column(String(100), nullable=False)
+
+    # Aggregates
+    seats_won = Column(Integer, nullable=False, default=0)
+    seats_contested = Column(Integer, nullable=False, default=0)
+    total_votes = Column(Integer, nullable=False, default=0)
+    vote_share_pct = Column(Float)  # Share of all votes cast within the scope
+
+    # Audit fields
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<PartyVoteRollup {self.year} {self.scope}:{self.scope_value} {self.group_name}>"
@@ -1,21 +1,72 @@
-"""Prediction model - electoral forecasts and predictions"""
-from sqlalchemy import Column, Integer, String, ForeignKey, Float, DateTime, JSON, Text
+"""Prediction models - electoral forecasts, grouped into versioned runs"""
+from sqlalchemy import Column, Integer, String, ForeignKey, Float, DateTime, JSON, Text, UniqueConstraint
 from sqlalchemy.sql import func
 from app.database import Base
 
 
+class PredictionRun(Base):
+    """
+    Prediction run model
+    One generation of predictions for an election (e.g. a ChatGPT run or a
+    Baseline run). Runs are kept, so earlier forecasts can be compared.
+    """
+
+    __tablename__ = "prediction_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+
+    predicted_year = Column(Integer, nullable=False, index=True)
+    prediction_model = Column(String(100))  # ChatGPT, Baseline, ...
+    description = Column(String(500))
+    base_run_id = Column(Integer, ForeignKey("prediction_runs.id"))  # Run unchanged seats were copied from
+
+    published_at = Column(DateTime(timezone=True))  # Last time it became the current run
+
+    # Metadata (e.g. {"usage": {...}}: API calls, prompt/cached/completion tokens, latency)
+    extra_data = Column(JSON)
+
+    # Audit fields
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<PredictionRun {self.id} - {self.predicted_year} {self.prediction_model}>"
+
+
+class CurrentPredictionRun(Base):
+    """
+    Current prediction run per election year
+    The run the API serves; a one-row lookup instead of scanning runs
+    """
+
+    __tablename__ = "current_prediction_runs"
+
+    predicted_year = Column(Integer, primary_key=True)
+    run_id = Column(Integer, ForeignKey("prediction_runs.id"), nullable=False)
+
+    # Audit fields
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<CurrentPredictionRun {self.predicted_year} -> {self.run_id}>"
+
+
 class Prediction(Base):
     """
     Prediction model
-    Stores electoral predictions for constituencies
+    Stores electoral predictions for constituencies, one per constituency and run
     """
 
     __tablename__ = "predictions"
+    __table_args__ = (
+        UniqueConstraint("run_id", "constituency_id", name="uq_prediction_run_constituency"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
     # Foreign keys
     constituency_id = Column(Integer, ForeignKey("constituencies.id"), nullable=False, index=True)
+    run_id = Column(Integer, ForeignKey("prediction_runs.id"), index=True)
 
     # Prediction details
     predicted_year = Column(Integer, nullable=False, index=True)  # Which election
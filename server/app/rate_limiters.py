@@ -1,8 +1,93 @@
 """
 Rate limiting configuration for API endpoints
+
+Counters live in RATE_LIMIT_STORAGE_URI: memory:// keeps them per worker,
+redis://host:6379/1 (or any other limits storage URI, e.g. memcached://)
+shares them between every uvicorn worker behind nginx.
+
+Every public route takes a share of one per-client budget
+(RATE_LIMIT_BUDGET) weighted by how expensive it is, on top of its own
+per-route limit where it has one:
+
+    @router.get("/year/{year}/export")
+    @limiter.limit(settings.RATE_LIMIT_EXPORT)
+    @budget(COST_EXPORT)
+    async def export_results_by_year(request: Request, ...):
 """
+import ipaddress
+from functools import lru_cache
+from typing import Tuple, Union
+
 from slowapi import Limiter
 from slowapi.util import get_remote_address
+from starlette.requests import Request
+
+from app.config import settings
+
+# Share of RATE_LIMIT_BUDGET one request takes, roughly by query weight
+COST_LOOKUP = 1     # Single-row lookups (id, code, slug)
+COST_LIST = 2       # Small lists and per-constituency history
+COST_ANALYSIS = 5   # Full-table scans and aggregations (result pages, swing, bastion)
+COST_EXPORT = 20    # Streaming bulk exports
+
+BUDGET_SCOPE = "budget"
+
+IPNetwork = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+
+@lru_cache(maxsize=None)
+def _trusted_networks(trusted_proxies: str) -> Tuple[IPNetwork, ...]:
+    return tuple(
+        ipaddress.ip_network(entry.strip(), strict=False)
+        for entry in trusted_proxies.split(",")
+        if entry.strip()
+    )
+
+
+def _is_trusted(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in _trusted_networks(settings.TRUSTED_PROXIES))
+
+
+def client_address(request: Request) -> str:
+    """
+    Address of the client a request came from
+
+    X-Forwarded-For is only honored when the direct peer is a trusted proxy.
+    The list is read right to left (each proxy appends the address it saw),
+    skipping trusted proxies, so a client can't pick its own key by sending
+    a forged header.
+    """
+    peer = get_remote_address(request)
+    forwarded = request.headers.get("x-forwarded-for")
+    if not forwarded or not _is_trusted(peer):
+        return peer
+
+    hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not _is_trusted(hop):
+            return hop
+    return hops[0] if hops else peer
+
+
+def create_limiter(storage_uri: str) -> Limiter:
+    """Limiter on the given storage (memory:// in tests, redis:// in production)"""
+    return Limiter(
+        key_func=client_address,
+        storage_uri=storage_uri,
+        key_prefix="votelytics",
+        # If Redis goes away, keep limiting per worker instead of failing requests
+        in_memory_fallback_enabled=not storage_uri.startswith("memory://"),
+    )
+
 
 # Create limiter instance
-limiter = Limiter(key_func=get_remote_address)
+limiter = create_limiter(settings.RATE_LIMIT_STORAGE_URI)
+
+
+def budget(cost: int):
+    """Charge a route's requests against the client's shared RATE_LIMIT_BUDGET"""
+    return limiter.shared_limit(settings.RATE_LIMIT_BUDGET, scope=BUDGET_SCOPE, cost=cost)
@@ -1,6 +1,12 @@
 """Pydantic schemas for API request/response validation"""
 from app.schemas.constituency import ConstituencyBase, ConstituencyResponse, ConstituencyList
-from app.schemas.election import ElectionBase, ElectionResponse, ElectionResultResponse
+from app.schemas.election import (
+    ElectionBase,
+    ElectionResponse,
+    ElectionResultResponse,
+    ConstituencyResultSummaryResponse,
+    PartySummaryResponse,
+)
 
 __all__ = [
     "ConstituencyBase",
@@ -9,4 +15,6 @@ __all__ = [
     "ElectionBase",
     "ElectionResponse",
     "ElectionResultResponse",
+    "ConstituencyResultSummaryResponse",
+    "PartySummaryResponse",
 ]
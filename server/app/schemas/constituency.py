@@ -3,6 +3,8 @@ from pydantic import BaseModel, ConfigDict
 from typing import Optional, Any, List
 from datetime import datetime
 
+from app.schemas.election import ElectionYearResults
+
 
 class ConstituencyBase(BaseModel):
     """Base schema for Constituency"""
@@ -31,7 +33,15 @@ class ConstituencyResponse(ConstituencyBase):
 class ConstituencyList(BaseModel):
     """Schema for list of constituencies"""
     constituencies: List[ConstituencyResponse]
-    total: int
+    total: Optional[int] = None  # Omitted when include_total=false
+    next_cursor: Optional[str] = None  # Continuation token for the next page
+
+
+class ConstituencyPageResponse(BaseModel):
+    """Schema for everything the constituency page shows, in one response"""
+    constituency: ConstituencyResponse
+    history: List[ElectionYearResults]  # Newest election first
+    prediction: Optional[dict] = None  # Same shape as /predictions/constituency/{id}
 
 
 class ConstituencyCreate(ConstituencyBase):
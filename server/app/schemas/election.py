@@ -1,6 +1,6 @@
 """Pydantic schemas for Election API"""
-from pydantic import BaseModel, ConfigDict, field_validator
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from typing import Dict, Optional, List
 from datetime import date, datetime
 
 
@@ -107,8 +107,99 @@ class ElectionResultResponse(ElectionResultBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class ElectionResultDisplay(BaseModel):
+    """Schema for the candidate fields the constituency page shows"""
+    id: int
+    rank: Optional[int] = None
+    is_winner: int = 0
+    candidate_name: str
+    sex: Optional[str] = None
+    age: Optional[int] = None
+    category: Optional[str] = None
+    party: str
+    alliance: Optional[str] = None
+    general_votes: int = 0
+    postal_votes: int = 0
+    total_votes: int
+    vote_share_pct: Optional[float] = None
+    margin: Optional[int] = None
+    margin_pct: Optional[float] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ElectionYearResults(BaseModel):
+    """Schema for one election's results in a constituency, ordered by rank"""
+    year: int
+    election_id: int
+    # Totals cover every candidate, even when results is trimmed to the top N
+    candidate_count: int
+    total_votes: int
+    total_electors: Optional[int] = None
+    results: List[ElectionResultDisplay]
+
+
 class ConstituencyElectionHistory(BaseModel):
     """Schema for constituency's historical election results"""
     constituency_id: int
     constituency_name: str
     results: List[ElectionResultResponse]
+
+
+class ConstituencyResultSummaryResponse(BaseModel):
+    """Schema for one constituency's result summary in one election"""
+    election_id: int
+    constituency_id: int
+    year: int
+    ac_number: int
+    ac_name: str
+    ac_slug: Optional[str] = None
+
+    winner_name: str
+    winner_party: str
+    winner_alliance: Optional[str] = None
+    winner_votes: int
+    winner_vote_share_pct: Optional[float] = None
+
+    runner_up_name: Optional[str] = None
+    runner_up_party: Optional[str] = None
+    runner_up_alliance: Optional[str] = None
+    runner_up_votes: Optional[int] = None
+    runner_up_vote_share_pct: Optional[float] = None
+
+    margin: Optional[int] = None
+    margin_pct: Optional[float] = None
+    total_votes: int
+    total_electors: Optional[int] = None
+    turnout_pct: Optional[float] = None
+    candidate_count: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PartyRollupResponse(BaseModel):
+    """Schema for one party/alliance rollup row"""
+    scope_value: str
+    group_name: str
+    seats_won: int
+    seats_contested: int
+    total_votes: int
+    vote_share_pct: Optional[float] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class PartySummaryResponse(BaseModel):
+    """Schema for party-level seats and votes in one election"""
+    year: int
+    group_by: str
+    scope: str
+    results: List[PartyRollupResponse]
+
+
+class AllianceRecombinationRequest(BaseModel):
+    """What-if alliance lineup for a past election"""
+    mapping: Dict[str, str] = Field(
+        default_factory=dict,
+        description="Party -> alliance overrides, e.g. {\"PMK\": \"AIADMK+\"}; other parties keep their actual alliance",
+    )
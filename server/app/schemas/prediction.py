@@ -2,7 +2,7 @@
 Pydantic schemas for predictions
 """
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import Annotated, List, Literal, Optional, Dict, Any
 from datetime import datetime
 
 
@@ -72,3 +72,16 @@ class ChatGPTResponse(BaseModel):
     top_alliances: List[Dict[str, Any]]  # Will be converted to AllianceVoteShare
     swing_from_last_election: float
     key_factors: str
+
+
+SwingPoints = Annotated[float, Field(ge=-50, le=50)]
+
+
+class ScenarioRequest(BaseModel):
+    """Uniform swing scenario: vote-share points added per alliance"""
+    base: Literal["results", "predictions"] = Field("results", description="2021-style results or stored predictions")
+    year: Optional[int] = Field(None, description="Base year (default 2021 for results, 2026 for predictions)")
+    swing: Dict[str, SwingPoints] = Field(default_factory=dict, description="Statewide swing per alliance")
+    regional_swing: Dict[str, Dict[str, SwingPoints]] = Field(
+        default_factory=dict, description="Extra swing per region, then per alliance"
+    )
@@ -0,0 +1,109 @@
+"""
+Fast JSON serialization for trusted data
+
+Routes normally return ORM objects through response_model, so FastAPI
+validates every row with from_attributes and then encodes the result.
+For data the API itself wrote (results, constituencies, summaries) that
+validation can't fail, so hot routes map rows straight to dicts using the
+response model's field list and encode them with orjson.
+"""
+from functools import lru_cache
+from types import NoneType, UnionType
+from typing import Any, List, Mapping, Optional, Tuple, Union, get_args, get_origin
+
+import orjson
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel
+
+# Same output shape as FastAPI/Pydantic: UTC as "Z", non-string dict keys as strings
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+# (field name, nested plan or None, field is a list, default when the attribute is missing)
+FieldPlan = Tuple[str, Optional[tuple], bool, Any]
+
+
+def dumps(content: Any) -> bytes:
+    """Encode plain Python data to JSON bytes (types orjson doesn't know go through jsonable_encoder)"""
+    return orjson.dumps(content, default=jsonable_encoder, option=ORJSON_OPTIONS)
+
+
+def _unwrap(annotation) -> Tuple[Any, bool]:
+    """Strip Optional[...] and report whether the annotation is a list"""
+    origin = get_origin(annotation)
+    if origin in (Union, UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not NoneType]
+        if len(args) == 1:
+            return _unwrap(args[0])
+        return annotation, False
+    if origin in (list, List):
+        inner, _ = _unwrap(get_args(annotation)[0])
+        return inner, True
+    return annotation, False
+
+
+def _is_model(annotation) -> bool:
+    return isinstance(annotation, type) and issubclass(annotation, BaseModel)
+
+
+@lru_cache(maxsize=None)
+def _model_plan(model: type) -> tuple:
+    plan = []
+    for name, field in model.model_fields.items():
+        inner, is_list = _unwrap(field.annotation)
+        nested = _model_plan(inner) if _is_model(inner) else None
+        default = None if field.is_required() else field.get_default(call_default_factory=True)
+        plan.append((name, nested, is_list, default))
+    return tuple(plan)
+
+
+def _convert(obj: Any, plan: tuple) -> Optional[dict]:
+    if obj is None:
+        return None
+
+    data = {}
+    if isinstance(obj, Mapping):
+        for name, nested, is_list, default in plan:
+            data[name] = _convert_value(obj.get(name, default), nested, is_list)
+    else:
+        for name, nested, is_list, default in plan:
+            data[name] = _convert_value(getattr(obj, name, default), nested, is_list)
+    return data
+
+
+def _convert_value(value: Any, nested: Optional[tuple], is_list: bool) -> Any:
+    if nested is None or value is None:
+        return value
+    if is_list:
+        return [_convert(item, nested) for item in value]
+    return _convert(value, nested)
+
+
+def to_python(result: Any, model: Any) -> Any:
+    """
+    Map ORM objects (or dicts of them) onto a response model's fields without validation
+
+    model is the route's response_model: a Pydantic model class or List[Model].
+    """
+    inner, is_list = _unwrap(model)
+    if not _is_model(inner):
+        return result
+    plan = _model_plan(inner)
+    if is_list:
+        return [_convert(item, plan) for item in result]
+    return _convert(result, plan)
+
+
+def fast_json(result: Any, model: Any) -> bytes:
+    """to_python + orjson, for trusted data only"""
+    return dumps(to_python(result, model))
+
+
+def fast_response(result: Any, model: Any, headers: Optional[Mapping[str, str]] = None) -> Response:
+    """
+    JSON response built with fast_json, bypassing response_model validation
+
+    Only use with data the API wrote itself - a row that doesn't fit the
+    model is sent as is instead of raising a validation error.
+    """
+    return Response(content=fast_json(result, model), media_type="application/json", headers=headers)
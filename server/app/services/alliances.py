@@ -0,0 +1,83 @@
+"""
+Party -> alliance resolution for analytics over election results
+
+The loaders store election_results.alliance as NULL (only seeded and
+synthetic data fill it), so every aggregate that groups by alliance
+resolves each result's bloc with party_bloc: the stored alliance when
+there is one, otherwise the party's alliance from the alliance config
+(ALLIANCE_CONFIG_PATH, as used for predictions) and the name rules of
+map_party_to_alliance. Parties outside every alliance, and independents,
+stay their own bloc.
+"""
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Mapping, Optional
+
+from app.config import settings
+
+# map_party_to_alliance's bloc for parties outside every alliance
+OTHERS = "Others"
+
+
+def map_party_to_alliance(party: str, alliance_mapping: Dict) -> str:
+    """Map a party name to its 2026 alliance"""
+    # Normalize party name
+    party_normalized = party.strip().upper()
+
+    # Direct mapping
+    for key, alliance in alliance_mapping.items():
+        if key.upper() == party_normalized:
+            return alliance
+
+    # Fuzzy matching for common variations
+    # ADMK is the Election Commission's abbreviation for AIADMK
+    if 'DMK' in party_normalized and 'ADMK' not in party_normalized and 'MDMK' not in party_normalized:
+        return 'DMK+'
+    elif 'AIADMK' in party_normalized or 'ADMK' in party_normalized:
+        return 'AIADMK+'
+    elif 'CONGRESS' in party_normalized or 'INC' in party_normalized:
+        return 'DMK+'
+    elif 'BJP' in party_normalized or 'JANATA' in party_normalized:
+        return 'AIADMK+'
+    elif 'VCK' in party_normalized:
+        return 'DMK+'
+    elif 'PMK' in party_normalized:
+        return 'PMK'
+    elif 'NTK' in party_normalized or 'NAAM TAMILAR' in party_normalized:
+        return 'NTK'
+    elif 'MDMK' in party_normalized:
+        return 'DMK+'
+    elif 'CPI' in party_normalized or 'COMMUNIST' in party_normalized:
+        return 'DMK+'
+    elif 'MNM' in party_normalized:
+        return 'DMK+'
+    elif 'AMMK' in party_normalized:
+        return 'AMMK'
+    elif 'DMDK' in party_normalized:
+        return 'DMDK'
+    else:
+        return 'Others'
+
+
+@lru_cache(maxsize=1)
+def default_party_mapping() -> Dict[str, str]:
+    """party_mapping of the alliance config, or {} when the file is missing"""
+    path = Path(settings.ALLIANCE_CONFIG_PATH)
+    if not path.is_file():
+        return {}
+    with open(path, "r") as f:
+        return json.load(f).get("party_mapping", {})
+
+
+def party_bloc(party: Optional[str], alliance: Optional[str] = None, mapping: Optional[Mapping[str, str]] = None) -> str:
+    """
+    Bloc a result counts towards: its stored alliance, else the party's
+    mapped alliance, else the party itself
+    """
+    if alliance:
+        return alliance
+    if not party:
+        return ""
+    mapped = map_party_to_alliance(party, default_party_mapping() if mapping is None else mapping)
+    return party if mapped == OTHERS else mapped
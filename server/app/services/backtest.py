@@ -0,0 +1,289 @@
+"""
+Backtesting prediction methods against past elections
+
+Re-runs the prediction pipeline for an election that already happened
+(e.g. 2021 from the 2016 and 2011 results) and scores it against the
+actual winners:
+- seat accuracy and Brier score of the predicted winner's win_probability
+- calibration per confidence bucket (Safe/Likely/Lean/Toss-up)
+- mean absolute error of the predicted alliance vote shares
+
+Historical data and prompts come from fetch_constituency_historical_data,
+build_prompt_prefix and build_constituency_prompt, with alliances as they stood in the target
+year. Methods are plain callables from a case to a prediction dict in the
+ChatGPT response format; "stub" carries the latest result forward and
+"baseline" fits the regression in baseline_predictor, both without any
+network call, so a backtest is reproducible offline. "ensemble" combines
+ChatGPT with the baseline.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from statistics import NormalDist
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.constituency import Constituency
+from app.models.election import ElectionResult
+from app.services.baseline_predictor import DEFAULT_ENSEMBLE_WEIGHT, baseline_predictions, ensemble_prediction
+from app.services.prediction_generator import (
+    PromptUsage,
+    build_constituency_prompt,
+    build_prompt_prefix,
+    call_chatgpt_for_prediction,
+    fetch_constituency_historical_data,
+    prompt_confidence_level,
+)
+
+CONFIDENCE_BUCKETS = ["Safe", "Likely", "Lean", "Toss-up"]
+BACKTEST_CONTEXT = (
+    "CURRENT POLITICAL CONTEXT ({year}):\n"
+    "Backtest - use only the alliance structure and historical results below."
+)
+
+# Seat margins (points) move about this much between elections
+STUB_MARGIN_SD = 10.0
+# Independents never form one bloc
+INDEPENDENT = "IND"
+
+Case = Dict[str, Any]
+Method = Callable[[Case], Optional[Dict]]
+
+
+def target_alliance_config(db: Session, year: int) -> Dict:
+    """
+    Alliance config (as in alliance_config_2026.json) for alliances as they
+    stood in a past election: alliance partners by votes, and every party
+    mapped to its alliance, or to itself outside one
+    """
+    bloc = func.coalesce(func.nullif(ElectionResult.alliance, ""), ElectionResult.party)
+    rows = (
+        db.query(bloc, ElectionResult.party, func.sum(ElectionResult.total_votes))
+        .filter(ElectionResult.year == year)
+        .group_by(bloc, ElectionResult.party)
+        .order_by(func.sum(ElectionResult.total_votes).desc())
+        .all()
+    )
+
+    alliances: Dict[str, Dict] = {}
+    party_mapping: Dict[str, str] = {}
+    for alliance, party, _ in rows:
+        if not party or party == INDEPENDENT:
+            continue
+        alliances.setdefault(alliance, {"partners": []})["partners"].append({"party": party})
+        party_mapping[party] = alliance
+
+    return {"alliances": alliances, "party_mapping": party_mapping}
+
+
+def prepare_cases(
+    db: Session,
+    target_year: int,
+    history_years: Sequence[int],
+    alliance_config: Dict,
+    trends_summary: Optional[str] = None,
+    constituency_ids: Optional[Sequence[int]] = None,
+) -> List[Case]:
+    """
+    One case per constituency with a target-year result: historical data,
+    prompt (instructions, shared by all cases, and the constituency part)
+    and the actual outcome. Runs in the caller's thread (sessions
+    are not shared with the prediction workers).
+    """
+    if trends_summary is None:
+        trends_summary = BACKTEST_CONTEXT.format(year=target_year)
+
+    instructions = build_prompt_prefix(alliance_config, trends_summary, target_year)
+
+    query = db.query(Constituency.id).order_by(Constituency.ac_number)
+    if constituency_ids:
+        query = query.filter(Constituency.id.in_(constituency_ids))
+
+    cases = []
+    for (constituency_id,) in query.all():
+        data = fetch_constituency_historical_data(
+            constituency_id=constituency_id,
+            db=db,
+            alliance_mapping=alliance_config["party_mapping"],
+            years=[target_year, *history_years],
+        )
+        actual = data["historical_results"].pop(target_year, None) if data else None
+        if actual is None:
+            continue
+
+        cases.append({
+            "constituency": data["constituency"],
+            "historical_results": data["historical_results"],
+            "instructions": instructions,
+            "prompt": build_constituency_prompt(data, target_year),
+            "actual": {
+                "winner_alliance": actual["winner_alliance"],
+                "alliance_shares": {
+                    alliance: share["vote_share"] for alliance, share in actual["alliance_shares"].items()
+                },
+            },
+        })
+    return cases
+
+
+def stub_prediction(case: Case) -> Optional[Dict]:
+    """
+    Offline stand-in for the LLM: the latest election's alliance shares
+    carried forward, with win_probability from the lead over the runner-up
+    """
+    hist = case["historical_results"]
+    if not hist:
+        return None
+    latest = hist[max(hist)]
+    shares = latest["alliance_shares"]  # sorted by vote share
+    ranked = list(shares.items())
+
+    winner, first = ranked[0]
+    runner_up_share = ranked[1][1]["vote_share"] if len(ranked) > 1 else 0
+    margin = first["vote_share"] - runner_up_share
+    win_probability = round(NormalDist(0, STUB_MARGIN_SD).cdf(margin), 3)
+
+    previous = [year for year in hist if year < max(hist)]
+    swing = 0.0
+    if previous:
+        swing = first["vote_share"] - hist[max(previous)]["alliance_shares"].get(winner, {}).get("vote_share", 0)
+
+    def lead_party(share: Dict) -> Optional[str]:
+        return share["top_candidate"]["party"] if share["top_candidate"] else None
+
+    return {
+        "predicted_winner_alliance": winner,
+        "predicted_winner_party": lead_party(first),
+        "predicted_winner_name": None,
+        "confidence_level": prompt_confidence_level(win_probability, margin),
+        "win_probability": win_probability,
+        "predicted_vote_share": first["vote_share"],
+        "predicted_margin_pct": round(margin, 2),
+        "top_alliances": [
+            {"alliance": alliance, "lead_party": lead_party(share), "vote_share": share["vote_share"]}
+            for alliance, share in ranked[:4]
+        ],
+        "swing_from_last_election": round(swing, 2),
+        "key_factors": f"Carried forward from {max(hist)}",
+    }
+
+
+def llm_method(api_key: str, model: str = "gpt-5", usage: Optional[PromptUsage] = None) -> Method:
+    """Method calling ChatGPT with the case's prompt, recording tokens and latency in usage"""
+    def predict(case: Case) -> Optional[Dict]:
+        return call_chatgpt_for_prediction(
+            prompt=case["prompt"],
+            api_key=api_key,
+            model=model,
+            instructions=case["instructions"],
+            usage=usage,
+        )
+    return predict
+
+
+def baseline_method(cases: List[Case], target_year: int, alliance_config: Optional[Dict] = None) -> Method:
+    """Baseline regression fitted once on the cases' history, looked up per case"""
+    predictions = baseline_predictions(cases, target_year, alliance_config)
+
+    def predict(case: Case) -> Optional[Dict]:
+        return predictions.get(case["constituency"]["id"])
+    return predict
+
+
+def ensemble_method(
+    cases: List[Case],
+    target_year: int,
+    alliance_config: Optional[Dict],
+    api_key: str,
+    model: str = "gpt-5",
+    llm_weight: float = DEFAULT_ENSEMBLE_WEIGHT,
+    usage: Optional[PromptUsage] = None,
+) -> Method:
+    """ChatGPT and baseline predictions combined per case (the baseline alone where ChatGPT fails)"""
+    llm = llm_method(api_key, model, usage)
+    baseline = baseline_method(cases, target_year, alliance_config)
+
+    def predict(case: Case) -> Optional[Dict]:
+        llm_prediction, baseline_prediction = llm(case), baseline(case)
+        if llm_prediction and baseline_prediction:
+            return ensemble_prediction(llm_prediction, baseline_prediction, llm_weight)
+        return llm_prediction or baseline_prediction
+    return predict
+
+
+def run_predictions(cases: List[Case], method: Method, workers: int = 1) -> List[Optional[Dict]]:
+    """Predictions in case order; workers > 1 runs the method in a thread pool"""
+    if workers <= 1:
+        return [method(case) for case in cases]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(method, cases))
+
+
+def _rounded(value: float) -> float:
+    return round(value, 4)
+
+
+def score_backtest(
+    cases: List[Case],
+    predictions: List[Optional[Dict]],
+    classify: Optional[Callable[[float, float], str]] = None,
+) -> Dict[str, Any]:
+    """
+    Accuracy, Brier score and calibration of predictions against actual results
+
+    Cases without a prediction count as failed and are left out of the
+    scores. Buckets come from classify(win_probability, margin_pct), or the
+    prediction's own confidence_level without one.
+    """
+    scored = []
+    failed = []
+    for case, prediction in zip(cases, predictions):
+        if not prediction:
+            failed.append(case["constituency"]["id"])
+            continue
+
+        probability = float(prediction["win_probability"])
+        margin = float(prediction["predicted_margin_pct"])
+        actual_shares = case["actual"]["alliance_shares"]
+        scored.append({
+            "predicted": prediction["predicted_winner_alliance"],
+            "actual": case["actual"]["winner_alliance"],
+            "probability": probability,
+            "hit": prediction["predicted_winner_alliance"] == case["actual"]["winner_alliance"],
+            "bucket": classify(probability, margin) if classify else prediction["confidence_level"],
+            "share_errors": [
+                abs(float(entry["vote_share"]) - actual_shares.get(entry["alliance"], 0))
+                for entry in prediction.get("top_alliances", [])
+            ],
+        })
+
+    def summary(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        count = len(rows)
+        if not count:
+            return {"seats": 0, "accuracy": None, "brier_score": None, "mean_win_probability": None}
+        return {
+            "seats": count,
+            "accuracy": _rounded(sum(row["hit"] for row in rows) / count),
+            "brier_score": _rounded(sum((row["probability"] - row["hit"]) ** 2 for row in rows) / count),
+            "mean_win_probability": _rounded(sum(row["probability"] for row in rows) / count),
+        }
+
+    errors = [error for row in scored for error in row["share_errors"]]
+    buckets: Dict[str, List[Dict[str, Any]]] = {bucket: [] for bucket in CONFIDENCE_BUCKETS}
+    predicted_seats: Dict[str, int] = {}
+    actual_seats: Dict[str, int] = {}
+    for row in scored:
+        buckets.setdefault(row["bucket"], []).append(row)
+        predicted_seats[row["predicted"]] = predicted_seats.get(row["predicted"], 0) + 1
+        actual_seats[row["actual"]] = actual_seats.get(row["actual"], 0) + 1
+
+    return {
+        **summary(scored),
+        "vote_share_mae": _rounded(sum(errors) / len(errors)) if errors else None,
+        "calibration": [{"confidence_level": bucket, **summary(rows)} for bucket, rows in buckets.items()],
+        "seat_totals": {
+            alliance: {"predicted": predicted_seats.get(alliance, 0), "actual": actual_seats.get(alliance, 0)}
+            for alliance in sorted(set(predicted_seats) | set(actual_seats))
+        },
+        "failed": failed,
+    }
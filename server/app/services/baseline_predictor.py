@@ -0,0 +1,474 @@
+"""
+Local statistical baseline predictor (prediction_model="Baseline")
+
+A ridge regression of how far each alliance's vote share in a seat sits
+from its statewide share (its local deviation) on:
+- its deviation there in the previous two elections
+- seat incumbency (won the seat last time)
+- the last deviation scaled by the seat's demographics (urban %, literacy,
+  population), so local strength can hold differently in urban seats
+
+The projected share is the alliance's latest statewide share plus the
+projected deviation. Statewide movement is deliberately not regressed: with
+two or three past elections, alliance-level features (statewide share,
+government incumbency) just learn the last transition's swing and replay
+it. It is simulated instead (below).
+
+Shares are the historical results mapped to the target alliances by
+fetch_constituency_historical_data. The model is fitted on every
+consecutive-election transition in the history (2011 -> 2016, 2016 -> 2021)
+and applied to the latest elections; for the earliest election, which has
+no election before it, the previous deviation is imputed as 0 (the
+statewide share). Win probabilities come from simulations that draw one
+statewide swing per alliance, shared by every seat (the part a fit on past
+transitions cannot foresee, sized by the swings between past elections),
+plus the residual spread of the fit per seat.
+
+Predictions carry every field of a ChatGPT prediction, so they save
+through the same path, can stand in for failed ChatGPT calls, or be
+combined with them (ensemble_prediction, prediction_model="Ensemble"). Fitting
+and predicting the whole state takes well under a second on CPU; reading
+the history dominates.
+
+Alliances with no history in a seat (new entrants) are not predicted there.
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.models.constituency import Constituency
+from app.services.prediction_generator import (
+    fetch_constituency_historical_data,
+    prompt_confidence_level,
+)
+
+PREDICTION_MODEL = "Baseline"
+ENSEMBLE_MODEL = "Ensemble"
+FEATURES = [
+    "deviation", "previous_deviation", "seat_incumbent",
+    "deviation_x_urban", "deviation_x_literacy", "deviation_x_population",
+]
+DEFAULT_ALPHA = 10.0
+DEFAULT_SIMULATIONS = 4000
+DEFAULT_SEED = 2026
+# Weight of the ChatGPT prediction in an ensemble (the baseline gets the rest)
+DEFAULT_ENSEMBLE_WEIGHT = 0.5
+
+
+class BaselineModel:
+    """Ridge regression (standardized features, unpenalized intercept) of next-election deviation"""
+
+    def __init__(
+        self,
+        weights: np.ndarray,
+        intercept: float,
+        mean: np.ndarray,
+        scale: np.ndarray,
+        residual_sd: float,
+        swing_sd: float,
+        alpha: float,
+        transitions: List[Tuple[int, int]],
+    ):
+        self.weights = weights
+        self.intercept = intercept
+        self.mean = mean
+        self.scale = scale
+        self.residual_sd = residual_sd  # share points
+        self.swing_sd = swing_sd  # share points
+        self.alpha = alpha
+        self.transitions = transitions
+
+    @classmethod
+    def fit(
+        cls,
+        X: np.ndarray,
+        y: np.ndarray,
+        alpha: float,
+        swing_sd: float,
+        transitions: List[Tuple[int, int]],
+    ) -> "BaselineModel":
+        mean = X.mean(axis=0)
+        scale = X.std(axis=0)
+        scale[scale == 0] = 1
+        Z = (X - mean) / scale
+
+        intercept = float(y.mean())
+        weights = np.linalg.solve(Z.T @ Z + alpha * np.eye(Z.shape[1]), Z.T @ (y - intercept))
+
+        residual = y - (Z @ weights + intercept)
+        dof = max(len(y) - Z.shape[1] - 1, 1)
+        residual_sd = float(np.sqrt(residual @ residual / dof))
+        return cls(weights, intercept, mean, scale, residual_sd, swing_sd, alpha, transitions)
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return ((X - self.mean) / self.scale) @ self.weights + self.intercept
+
+    @property
+    def spread(self) -> float:
+        """Standard deviation of a predicted seat share (statewide swing and seat residual)"""
+        return float(np.hypot(self.residual_sd, self.swing_sd))
+
+    def summary(self) -> Dict[str, Any]:
+        """Stored in extra_data of every prediction"""
+        return {
+            "model": "ridge",
+            "alpha": self.alpha,
+            "residual_sd": round(self.residual_sd, 3),
+            "swing_sd": round(self.swing_sd, 3),
+            "trained_on": [f"{before}->{after}" for before, after in self.transitions],
+            "coefficients": {name: round(float(w), 3) for name, w in zip(FEATURES, self.weights)},
+        }
+
+
+def _years(seats: List[Dict]) -> List[int]:
+    return sorted({year for seat in seats for year in seat["historical_results"]})
+
+
+def _statewide(seats: List[Dict], year: int) -> Dict[str, float]:
+    """Alliance share (percent) of all votes cast in a year"""
+    votes: Dict[str, float] = {}
+    total = 0
+    for seat in seats:
+        result = seat["historical_results"].get(year)
+        if not result:
+            continue
+        total += result["total_votes"] or 0
+        for alliance, share in result["alliance_shares"].items():
+            votes[alliance] = votes.get(alliance, 0) + share["votes"]
+    return {alliance: count * 100 / total for alliance, count in votes.items()} if total else {}
+
+
+def _swing_sd(seats: List[Dict], years: List[int]) -> float:
+    """
+    Typical statewide share change of an alliance between consecutive
+    elections: root mean square weighted by the alliance's share
+    """
+    squares = weights = 0.0
+    for before, after in zip(years, years[1:]):
+        shares_before, shares_after = _statewide(seats, before), _statewide(seats, after)
+        for alliance in set(shares_before) | set(shares_after):
+            old, new = shares_before.get(alliance, 0), shares_after.get(alliance, 0)
+            weight = max(old, new)
+            squares += weight * (new - old) ** 2
+            weights += weight
+    return float(np.sqrt(squares / weights)) if weights else 0.0
+
+
+def _demographics(seats: List[Dict]) -> np.ndarray:
+    """seats x (urban, literacy, log population) z-scores; missing values score 0"""
+    columns = []
+    for key, transform in (("urban_pct", float), ("literacy_rate", float), ("population", np.log1p)):
+        values = np.array([
+            transform(seat["constituency"][key]) if seat["constituency"].get(key) is not None else np.nan
+            for seat in seats
+        ], dtype=float)
+        known = values[~np.isnan(values)]
+        if known.size and known.std() > 0:
+            values = (values - known.mean()) / known.std()
+        columns.append(np.nan_to_num(values, nan=0.0))
+    return np.column_stack(columns) if seats else np.zeros((0, 3))
+
+
+def _rows(
+    seats: List[Dict],
+    demographics: np.ndarray,
+    last_year: int,
+    previous_year: Optional[int],
+    target_year: Optional[int] = None,
+) -> Tuple[List[Tuple[int, str]], np.ndarray, np.ndarray]:
+    """
+    One row per seat and alliance that polled in last_year: (seat index,
+    alliance) keys, FEATURES and, when target_year is given, the actual
+    deviation from the statewide share
+    """
+    statewide = _statewide(seats, last_year)
+    statewide_previous = _statewide(seats, previous_year) if previous_year else {}
+    statewide_target = _statewide(seats, target_year) if target_year is not None else {}
+
+    keys, features, targets = [], [], []
+    for i, seat in enumerate(seats):
+        hist = seat["historical_results"]
+        last = hist.get(last_year)
+        if last is None or (target_year is not None and target_year not in hist):
+            continue
+        previous = hist.get(previous_year) if previous_year else None
+        urban, literacy, population = demographics[i]
+
+        for alliance, share in last["alliance_shares"].items():
+            deviation = share["vote_share"] - statewide.get(alliance, 0)
+            previous_deviation = 0.0  # No election before last_year here: the statewide share
+            if previous is not None:
+                previous_share = previous["alliance_shares"].get(alliance, {}).get("vote_share", 0)
+                previous_deviation = previous_share - statewide_previous.get(alliance, 0)
+            keys.append((i, alliance))
+            features.append([
+                deviation,
+                previous_deviation,
+                float(last["winner_alliance"] == alliance),
+                deviation * urban,
+                deviation * literacy,
+                deviation * population,
+            ])
+            if target_year is not None:
+                actual = hist[target_year]["alliance_shares"].get(alliance, {}).get("vote_share", 0)
+                targets.append(actual - statewide_target.get(alliance, 0))
+
+    return keys, np.array(features, dtype=float).reshape(-1, len(FEATURES)), np.array(targets, dtype=float)
+
+
+def fit_baseline(seats: List[Dict], alpha: float = DEFAULT_ALPHA) -> BaselineModel:
+    """Fit on every consecutive-election transition in the seats' history"""
+    years = _years(seats)
+    if len(years) < 2:
+        raise ValueError("The baseline needs results from at least two elections")
+    demographics = _demographics(seats)
+
+    X_parts, y_parts, transitions = [], [], []
+    for k in range(1, len(years)):
+        previous_year = years[k - 2] if k >= 2 else None
+        _, X, y = _rows(seats, demographics, years[k - 1], previous_year, target_year=years[k])
+        X_parts.append(X)
+        y_parts.append(y)
+        transitions.append((years[k - 1], years[k]))
+
+    return BaselineModel.fit(
+        np.vstack(X_parts), np.concatenate(y_parts), alpha, _swing_sd(seats, years), transitions
+    )
+
+
+def baseline_predictions(
+    seats: List[Dict],
+    target_year: int,
+    alliance_config: Optional[Dict] = None,
+    alpha: float = DEFAULT_ALPHA,
+    simulations: int = DEFAULT_SIMULATIONS,
+    seed: int = DEFAULT_SEED,
+) -> Dict[int, Dict]:
+    """
+    Predictions for target_year keyed by constituency id, in the format of
+    generate_prediction_for_constituency
+
+    seats are fetch_constituency_historical_data results for the whole state
+    (statewide shares need every seat).
+    """
+    model = fit_baseline(seats, alpha)
+    years = _years(seats)
+    last_year = years[-1]
+    previous_year = years[-2]
+    demographics = _demographics(seats)
+    keys, X, _ = _rows(seats, demographics, last_year, previous_year)
+    statewide = _statewide(seats, last_year)
+    projected = np.clip(
+        np.array([statewide.get(alliance, 0) for _, alliance in keys]) + model.predict(X), 0, None
+    )
+    alliances = (alliance_config or {}).get("alliances", {})
+    rng = np.random.default_rng(seed)
+
+    # One statewide swing per simulation and alliance, shared by every seat
+    blocs = sorted({alliance for _, alliance in keys})
+    bloc_index = {alliance: j for j, alliance in enumerate(blocs)}
+    statewide_swing = rng.normal(0, model.swing_sd, (simulations, len(blocs)))
+
+    # Rows of one seat are contiguous
+    bounds: Dict[int, List[int]] = {}
+    for row, (i, _) in enumerate(keys):
+        bounds.setdefault(i, [row, row])[1] = row + 1
+
+    predictions = {}
+    for i, (start, end) in bounds.items():
+        seat = seats[i]
+        last = seat["historical_results"][last_year]
+        names = [alliance for _, alliance in keys[start:end]]
+        last_shares = np.array([last["alliance_shares"][name]["vote_share"] for name in names])
+
+        # Keep the seat's modelled total at last election's level
+        shares = projected[start:end]
+        if shares.sum() > 0:
+            shares = shares * last_shares.sum() / shares.sum()
+
+        swing = statewide_swing[:, [bloc_index[name] for name in names]]
+        draws = shares + swing + rng.normal(0, model.residual_sd, (simulations, len(names)))
+        win_share = np.bincount(draws.argmax(axis=1), minlength=len(names)) / simulations
+
+        order = np.argsort(-shares, kind="stable")
+        winner = order[0]
+        margin = float(shares[winner] - shares[order[1]]) if len(order) > 1 else float(shares[winner])
+        win_probability = round(float(win_share[winner]), 3)
+
+        def lead_party(name: str) -> str:
+            candidate = last["alliance_shares"][name]["top_candidate"]
+            if candidate:
+                return candidate["party"]
+            partners = alliances.get(name, {}).get("partners")
+            return partners[0]["party"] if partners else name
+
+        winner_name = names[winner]
+        runner_up = names[order[1]] if len(order) > 1 else None
+        held = "held the seat" if last["winner_alliance"] == winner_name else "did not hold the seat"
+        factors = (
+            f"Baseline regression on {len(model.transitions)} past election transitions. "
+            f"{winner_name} polled {last_shares[winner]:.1f}% here in {last_year} and {held}; "
+            f"projected {shares[winner]:.1f}%"
+        )
+        if runner_up:
+            factors += f" against {runner_up} on {shares[order[1]]:.1f}%"
+
+        predictions[seat["constituency"]["id"]] = {
+            "constituency_id": seat["constituency"]["id"],
+            "predicted_year": target_year,
+            "prediction_model": PREDICTION_MODEL,
+            "predicted_winner_alliance": winner_name,
+            "predicted_winner_party": lead_party(winner_name),
+            "predicted_winner_name": None,
+            "confidence_level": prompt_confidence_level(win_probability, margin),
+            "win_probability": win_probability,
+            "predicted_vote_share": round(float(shares[winner]), 2),
+            "predicted_margin_pct": round(margin, 2),
+            "top_alliances": [
+                {"alliance": names[j], "lead_party": lead_party(names[j]), "vote_share": round(float(shares[j]), 2)}
+                for j in order[:4]
+            ],
+            "swing_from_last_election": round(float(shares[winner] - last_shares[winner]), 2),
+            "key_factors": factors + ".",
+            "extra_data": {
+                "historical_data_years": years[::-1],
+                "win_probabilities": {
+                    names[j]: round(float(win_share[j]), 3) for j in order if win_share[j] > 0
+                },
+                **model.summary(),
+            },
+        }
+    return predictions
+
+
+def _member_probabilities(prediction: Dict) -> Dict[str, float]:
+    """
+    Win probability per alliance: the baseline's simulated ones, or for a
+    ChatGPT prediction its winner's probability with the rest split by
+    vote share among the other alliances it lists
+    """
+    simulated = (prediction.get("extra_data") or {}).get("win_probabilities")
+    if simulated:
+        return dict(simulated)
+
+    winner = prediction["predicted_winner_alliance"]
+    probability = float(prediction["win_probability"])
+    others = {
+        entry["alliance"]: float(entry["vote_share"])
+        for entry in prediction.get("top_alliances", []) if entry["alliance"] != winner
+    }
+    total = sum(others.values())
+    probabilities = {winner: probability}
+    for alliance, share in others.items():
+        probabilities[alliance] = (1 - probability) * share / total if total else 0.0
+    return probabilities
+
+
+def ensemble_prediction(
+    llm: Dict,
+    baseline: Dict,
+    llm_weight: float = DEFAULT_ENSEMBLE_WEIGHT,
+) -> Dict:
+    """
+    Combine a ChatGPT and a baseline prediction of one seat
+
+    Win probabilities and vote shares are weighted averages per alliance (an
+    alliance one member leaves out of top_alliances takes the other's share);
+    the winner is the alliance with the highest combined win probability.
+    """
+    weights = {"llm": llm_weight, "baseline": 1 - llm_weight}
+    members = {"llm": llm, "baseline": baseline}
+
+    probabilities: Dict[str, float] = {}
+    for name, member in members.items():
+        for alliance, probability in _member_probabilities(member).items():
+            probabilities[alliance] = probabilities.get(alliance, 0.0) + weights[name] * probability
+
+    member_shares = {
+        name: {entry["alliance"]: float(entry["vote_share"]) for entry in member.get("top_alliances", [])}
+        for name, member in members.items()
+    }
+    shares = {}
+    for alliance in set(member_shares["llm"]) | set(member_shares["baseline"]):
+        llm_share = member_shares["llm"].get(alliance, member_shares["baseline"].get(alliance))
+        baseline_share = member_shares["baseline"].get(alliance, llm_share)
+        shares[alliance] = weights["llm"] * llm_share + weights["baseline"] * baseline_share
+
+    ranked = sorted(shares, key=lambda alliance: (-probabilities.get(alliance, 0.0), -shares[alliance]))
+    winner = ranked[0]
+    runner_up_share = max((share for alliance, share in shares.items() if alliance != winner), default=0.0)
+    margin = shares[winner] - runner_up_share
+    win_probability = round(probabilities.get(winner, 0.0), 3)
+
+    def lead_party(alliance: str) -> str:
+        for member in members.values():
+            for entry in member.get("top_alliances", []):
+                if entry["alliance"] == alliance and entry.get("lead_party"):
+                    return entry["lead_party"]
+        return alliance
+
+    agreeing = [member for member in members.values() if member["predicted_winner_alliance"] == winner]
+    swings = [
+        (weights[name], member["swing_from_last_election"])
+        for name, member in members.items()
+        if member["predicted_winner_alliance"] == winner and member.get("swing_from_last_election") is not None
+    ]
+    swing = sum(w * value for w, value in swings) / sum(w for w, _ in swings) if swings else None
+
+    return {
+        "constituency_id": baseline.get("constituency_id", llm.get("constituency_id")),
+        "predicted_year": baseline.get("predicted_year", llm.get("predicted_year")),
+        "prediction_model": ENSEMBLE_MODEL,
+        "predicted_winner_alliance": winner,
+        "predicted_winner_party": lead_party(winner),
+        "predicted_winner_name": llm.get("predicted_winner_name") if llm["predicted_winner_alliance"] == winner else None,
+        "confidence_level": prompt_confidence_level(win_probability, margin),
+        "win_probability": win_probability,
+        "predicted_vote_share": round(shares[winner], 2),
+        "predicted_margin_pct": round(margin, 2),
+        "top_alliances": [
+            {"alliance": alliance, "lead_party": lead_party(alliance), "vote_share": round(shares[alliance], 2)}
+            for alliance in sorted(shares, key=lambda alliance: -shares[alliance])[:4]
+        ],
+        "swing_from_last_election": round(swing, 2) if swing is not None else None,
+        "key_factors": (
+            f"Ensemble of ChatGPT ({llm['predicted_winner_alliance']}, {float(llm['win_probability']):.0%}) "
+            f"and the baseline ({baseline['predicted_winner_alliance']}, {float(baseline['win_probability']):.0%}), "
+            f"{len(agreeing)} of 2 picking {winner}. {llm.get('key_factors', '')}"
+        ).strip(),
+        "extra_data": {
+            **(llm.get("extra_data") or {}),
+            "ensemble": {
+                "weights": {"ChatGPT": weights["llm"], PREDICTION_MODEL: weights["baseline"]},
+                "members": {
+                    label: {
+                        "winner_alliance": member["predicted_winner_alliance"],
+                        "win_probability": member["win_probability"],
+                    }
+                    for label, member in (("ChatGPT", llm), (PREDICTION_MODEL, baseline))
+                },
+            },
+        },
+    }
+
+
+def generate_baseline_predictions(
+    db: Session,
+    alliance_config: Dict,
+    target_year: int = 2026,
+    years: Sequence[int] = (2021, 2016, 2011),
+    **options,
+) -> Dict[int, Dict]:
+    """Baseline predictions for every constituency from the database"""
+    seats = []
+    for (constituency_id,) in db.query(Constituency.id).order_by(Constituency.ac_number).all():
+        data = fetch_constituency_historical_data(
+            constituency_id=constituency_id,
+            db=db,
+            alliance_mapping=alliance_config["party_mapping"],
+            years=years,
+        )
+        if data and data["historical_results"]:
+            seats.append(data)
+    return baseline_predictions(seats, target_year, alliance_config, **options)
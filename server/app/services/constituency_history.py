@@ -0,0 +1,80 @@
+"""
+Service for a constituency's results across elections, grouped by year
+Only the fields the constituency page shows are selected, and trimming to
+the top N candidates per election happens in SQL (ROW_NUMBER over rank)
+"""
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.election import ElectionResult
+
+DISPLAY_COLUMNS = [
+    ElectionResult.id,
+    ElectionResult.rank,
+    ElectionResult.is_winner,
+    ElectionResult.candidate_name,
+    ElectionResult.sex,
+    ElectionResult.age,
+    ElectionResult.category,
+    ElectionResult.party,
+    ElectionResult.alliance,
+    ElectionResult.general_votes,
+    ElectionResult.postal_votes,
+    ElectionResult.total_votes,
+    ElectionResult.vote_share_pct,
+    ElectionResult.margin,
+    ElectionResult.margin_pct,
+]
+DISPLAY_FIELDS = [column.key for column in DISPLAY_COLUMNS]
+
+
+def history_query(constituency_id: int, top_n: Optional[int] = None):
+    """
+    One row per candidate, ordered by year (newest first) then rank
+    Each row also carries its election's totals, computed before trimming
+    """
+    per_election = {"partition_by": ElectionResult.election_id}
+    ranked = (
+        select(
+            *DISPLAY_COLUMNS,
+            ElectionResult.year,
+            ElectionResult.election_id,
+            func.row_number().over(
+                order_by=(ElectionResult.rank.asc().nulls_last(), ElectionResult.id), **per_election
+            ).label("position"),
+            func.count().over(**per_election).label("candidate_count"),
+            func.sum(ElectionResult.total_votes).over(**per_election).label("votes_cast"),
+            func.max(ElectionResult.total_electors).over(**per_election).label("electors"),
+        )
+        .where(ElectionResult.constituency_id == constituency_id)
+        .subquery()
+    )
+
+    query = select(ranked).order_by(ranked.c.year.desc(), ranked.c.election_id, ranked.c.position)
+    if top_n is not None:
+        query = query.where(ranked.c.position <= top_n)
+    return query
+
+
+def load_history_by_year(db: Session, constituency_id: int, top_n: Optional[int] = None) -> List[Dict]:
+    """
+    A constituency's results grouped by election (newest first), in one query
+
+    Args:
+        top_n: Keep only the top N candidates of each election (default: all)
+    """
+    groups: List[Dict] = []
+    for row in db.execute(history_query(constituency_id, top_n)).mappings():
+        if not groups or groups[-1]["election_id"] != row["election_id"]:
+            groups.append({
+                "year": row["year"],
+                "election_id": row["election_id"],
+                "candidate_count": row["candidate_count"],
+                "total_votes": row["votes_cast"] or 0,
+                "total_electors": row["electors"],
+                "results": [],
+            })
+        groups[-1]["results"].append({field: row[field] for field in DISPLAY_FIELDS})
+    return groups
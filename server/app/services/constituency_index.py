@@ -0,0 +1,187 @@
+"""
+Process-wide constituency index
+Answers id/code/slug lookups from memory instead of the database
+
+The constituency table has 234 rows and changes almost never, so each
+worker keeps every row (already mapped to ConstituencyResponse fields) plus
+lookup tables for:
+- id, code (as stored and upper-cased)
+- slug, normalized (lower-case, parentheses/periods dropped, hyphens collapsed)
+- historic aliases: slugs and names the constituency appeared under in
+  election_results (e.g. renamed or re-spelt seats)
+
+The index is built at startup and keyed by the data versions of both
+tables (like the vote swing and vote matrix tensors): every worker rebuilds
+it once a write moves data_version, and in any case once it is older than
+CONSTITUENCY_INDEX_TTL.
+"""
+import re
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.http_cache import data_version
+from app.models.constituency import Constituency
+from app.models.election import ElectionResult
+from app.schemas.constituency import ConstituencyResponse
+from app.serialization import to_python
+
+
+@lru_cache(maxsize=4096)
+def normalize_slug(slug: str) -> str:
+    """
+    Canonical form of a slug, tolerant of malformed URLs
+    e.g. "Gummidipoondi-(SC)." -> "gummidipoondi-sc"
+    """
+    normalized = slug.strip().lower()
+    normalized = re.sub(r'[().]', '', normalized)  # Remove parentheses and periods
+    normalized = re.sub(r'[-\s_]+', '-', normalized)  # Spaces/underscores to hyphens, collapse runs
+    return normalized.strip('-')
+
+
+class ConstituencyIndex:
+    """Immutable snapshot of the constituency table with lookup tables"""
+
+    def __init__(self, records: List[dict], aliases: Dict[str, int], version: Tuple = ()):
+        self.records = records
+        self.version = version
+        self.by_id: Dict[int, dict] = {record["id"]: record for record in records}
+        self.by_code: Dict[str, dict] = {}
+        self.by_slug: Dict[str, dict] = {}
+
+        for record in records:
+            self.by_code[record["code"]] = record
+            self.by_code.setdefault(record["code"].upper(), record)
+
+        # Canonical slugs win over aliases
+        for alias, constituency_id in aliases.items():
+            self.by_slug[alias] = self.by_id[constituency_id]
+        for record in records:
+            if record["slug"]:
+                self.by_slug[normalize_slug(record["slug"])] = record
+
+        self.built_at = time.monotonic()
+
+    @classmethod
+    def build(cls, db: Session) -> "ConstituencyIndex":
+        # Read before the rows, so a write during the build triggers another one
+        version = index_version(db)
+        rows = db.query(Constituency).order_by(Constituency.ac_number).all()
+        records = to_python(rows, List[ConstituencyResponse])
+        known_ids = {record["id"] for record in records}
+
+        # Alias -> constituency ids it was seen with; ambiguous aliases are dropped
+        candidates: Dict[str, set] = {}
+
+        def add_alias(value: Optional[str], constituency_id: int):
+            if value and constituency_id in known_ids:
+                alias = normalize_slug(value)
+                if alias:
+                    candidates.setdefault(alias, set()).add(constituency_id)
+
+        for record in records:
+            add_alias(record["name"], record["id"])
+
+        historic = (
+            db.query(ElectionResult.constituency_id, ElectionResult.ac_slug, ElectionResult.ac_name)
+            .distinct()
+            .all()
+        )
+        for constituency_id, ac_slug, ac_name in historic:
+            add_alias(ac_slug, constituency_id)
+            add_alias(ac_name, constituency_id)
+
+        aliases = {alias: ids.pop() for alias, ids in candidates.items() if len(ids) == 1}
+        return cls(records, aliases, version)
+
+    def get_by_id(self, constituency_id: int) -> Optional[dict]:
+        return self.by_id.get(constituency_id)
+
+    def get_by_code(self, code: str) -> Optional[dict]:
+        return self.by_code.get(code) or self.by_code.get(code.upper())
+
+    def get_by_slug(self, slug: str) -> Optional[dict]:
+        return self.by_slug.get(normalize_slug(slug))
+
+
+def index_version(db: Session) -> Tuple[Optional[str], Optional[str]]:
+    """Data versions of the tables the index is built from"""
+    return tuple(
+        latest.isoformat() if latest else None
+        for latest in (data_version(db, Constituency), data_version(db, ElectionResult))
+    )
+
+
+_index: Optional[ConstituencyIndex] = None
+_index_lock = threading.Lock()
+# (version, time) of the last failed rebuild; not retried for that version within the TTL
+_failed: Tuple[Tuple, float] = ((), 0.0)
+
+
+def refresh_constituency_index(db: Optional[Session] = None) -> ConstituencyIndex:
+    """Rebuild the index from the database (call after writing constituencies)"""
+    global _index
+
+    if db is not None:
+        index = ConstituencyIndex.build(db)
+    else:
+        session = SessionLocal()
+        try:
+            index = ConstituencyIndex.build(session)
+        finally:
+            session.close()
+
+    _index = index
+    return index
+
+
+def load_constituency_index() -> Optional[ConstituencyIndex]:
+    """Build the index at startup; a database error only delays it to the first lookup"""
+    try:
+        return refresh_constituency_index()
+    except Exception as e:
+        print(f"WARNING: Constituency index not built at startup: {e}")
+        return None
+
+
+def get_constituency_index(db: Session) -> ConstituencyIndex:
+    """
+    The current index, rebuilt first if it is missing, the constituency or
+    election result data changed, or it is older than CONSTITUENCY_INDEX_TTL
+
+    The versions come from data_version (cached), so lookups normally don't
+    query the database. When a rebuild fails the previous index keeps serving,
+    and the same version is retried after another TTL. Without any index the
+    error is raised.
+    """
+    global _failed
+
+    version = index_version(db)
+    index = _index
+    now = time.monotonic()
+    if index is not None:
+        fresh = index.version == version and now - index.built_at < settings.CONSTITUENCY_INDEX_TTL
+        if fresh or (_failed[0] == version and now - _failed[1] < settings.CONSTITUENCY_INDEX_TTL):
+            return index
+
+    # One thread rebuilds; the others keep using the previous index meanwhile
+    if not _index_lock.acquire(blocking=index is None):
+        return index
+    try:
+        if _index is not index:
+            return _index
+        try:
+            return refresh_constituency_index(db)
+        except Exception as e:
+            if index is None:
+                raise
+            _failed = (version, now)
+            print(f"WARNING: Constituency index refresh failed, serving previous index: {e}")
+            return index
+    finally:
+        _index_lock.release()
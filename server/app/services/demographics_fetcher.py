@@ -3,7 +3,7 @@ Service for fetching constituency demographics using LLM
 """
 from openai import OpenAI
 import json
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 import time
 
 
@@ -156,3 +156,118 @@ def fetch_demographics_from_llm(
 
     print(f"Failed to fetch demographics after {max_retries} attempts")
     return None
+
+
+def build_batch_demographics_prompt(constituencies: List[Dict]) -> str:
+    """
+    Build prompt asking for demographics of several constituencies at once
+    constituencies: dicts with ac_number, name, district, region
+    """
+    listing = "\n".join(
+        f"- AC #{c['ac_number']}: {c['name']} ({c['district']} district, {c['region']} region)"
+        for c in constituencies
+    )
+
+    prompt = f"""You are a data assistant providing demographic information for Tamil Nadu constituencies.
+
+Assembly constituencies:
+{listing}
+
+For EACH constituency above, provide the following demographic data based on latest available census/statistical data:
+1. Total population (approximate, from 2011 census or estimates)
+2. Urban population percentage (0-100)
+3. Literacy rate percentage (0-100)
+
+Return ONLY valid JSON in this exact format, one entry per constituency, identified by its AC number:
+{{"constituencies": [{{"ac_number": 1, "population": 250000, "urban_pct": 45.5, "literacy_rate": 78.2}}]}}
+
+If exact data is unavailable, provide best estimates based on district averages for Tamil Nadu."""
+
+    return prompt
+
+
+def parse_batch_demographics_response(response_text: str, ac_numbers: List[int]) -> Dict[int, Dict[str, float]]:
+    """
+    Parse a batched response into demographics per AC number
+    Each entry is validated like a single response (parse_demographics_response);
+    invalid, unknown and repeated entries are dropped, so callers can fetch
+    the missing constituencies one by one. Returns {} if the JSON is invalid.
+    """
+    try:
+        entries = json.loads(response_text)["constituencies"]
+    except (json.JSONDecodeError, KeyError, TypeError) as e:
+        print(f"Invalid batched response: {e}")
+        return {}
+
+    expected = set(ac_numbers)
+    results = {}
+    repeated = set()
+    for entry in entries if isinstance(entries, list) else []:
+        ac_number = entry.get("ac_number") if isinstance(entry, dict) else None
+        # bool is an int subclass; anything else (e.g. [1]) is not hashable or not an AC number
+        if not isinstance(ac_number, int) or isinstance(ac_number, bool) or ac_number not in expected:
+            print(f"Unexpected entry in batched response: {entry}")
+            continue
+        if ac_number in results or ac_number in repeated:
+            repeated.add(ac_number)
+            results.pop(ac_number, None)
+            continue
+
+        demographics = parse_demographics_response(json.dumps(entry))
+        if demographics:
+            results[ac_number] = demographics
+
+    return results
+
+
+def fetch_demographics_batch_from_llm(
+    constituencies: List[Dict],
+    api_key: str,
+    model: str = "gpt-5-mini",
+    max_retries: int = 2
+) -> Dict[int, Dict[str, float]]:
+    """
+    Fetch demographics for a group of constituencies in one LLM request
+
+    Args:
+        constituencies: Dicts with ac_number, name, district, region
+        api_key: OpenAI API key
+        model: Model to use (default: gpt-5-mini)
+        max_retries: Maximum retry attempts (API errors or unparseable JSON)
+
+    Returns:
+        Dict of AC number -> population, urban_pct, literacy_rate for the
+        entries that passed validation (possibly not all of them)
+    """
+    client = OpenAI(api_key=api_key)
+    ac_numbers = [c["ac_number"] for c in constituencies]
+    prompt = build_batch_demographics_prompt(constituencies)
+
+    for attempt in range(max_retries):
+        try:
+            response = client.chat.completions.create(
+                model=model,
+                messages=[
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                response_format={"type": "json_object"}
+            )
+
+            results = parse_batch_demographics_response(response.choices[0].message.content or "", ac_numbers)
+            if results:
+                return results
+            print(f"Attempt {attempt + 1}/{max_retries}: No valid entries in batched response")
+
+        except Exception as e:
+            print(f"Attempt {attempt + 1}/{max_retries}: API error - {e}")
+
+        # Exponential backoff
+        if attempt < max_retries - 1:
+            wait_time = (2 ** attempt) * 5  # 5s, 10s
+            print(f"Waiting {wait_time}s before retry...")
+            time.sleep(wait_time)
+
+    return {}
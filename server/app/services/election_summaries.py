@@ -0,0 +1,295 @@
+"""
+Service for maintaining precomputed election aggregates
+- Constituency summaries: one row per (election, constituency)
+- Party rollups: seats and votes per party/alliance, statewide and by district/region
+"""
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy.orm import Session
+
+from app.cache import invalidate, TAG_RESULTS
+from app.models.constituency import Constituency
+from app.models.election import ElectionResult, ConstituencyResultSummary, PartyVoteRollup
+from app.services.alliances import party_bloc
+
+STATE_SCOPE_VALUE = "Tamil Nadu"
+
+# (scope, scope_value, group_type, group_name)
+RollupKey = Tuple[str, str, str, str]
+
+
+def build_summary_row(results: List[ElectionResult]) -> Optional[Dict]:
+    """
+    Build a summary row from one constituency's results
+    Results must already be ordered by rank (winner first)
+    """
+    if not results:
+        return None
+
+    winner = results[0]
+    runner_up = results[1] if len(results) > 1 else None
+    total_votes = sum(r.total_votes or 0 for r in results)
+    total_electors = winner.total_electors
+
+    return {
+        'election_id': winner.election_id,
+        'constituency_id': winner.constituency_id,
+        'year': winner.year,
+        'ac_number': winner.ac_number,
+        'ac_name': winner.ac_name,
+        'ac_slug': winner.ac_slug,
+        'winner_name': winner.candidate_name,
+        'winner_party': winner.party,
+        'winner_alliance': winner.alliance,
+        'winner_votes': winner.total_votes or 0,
+        'winner_vote_share_pct': winner.vote_share_pct,
+        'runner_up_name': runner_up.candidate_name if runner_up else None,
+        'runner_up_party': runner_up.party if runner_up else None,
+        'runner_up_alliance': runner_up.alliance if runner_up else None,
+        'runner_up_votes': runner_up.total_votes if runner_up else None,
+        'runner_up_vote_share_pct': runner_up.vote_share_pct if runner_up else None,
+        'margin': winner.margin,
+        'margin_pct': winner.margin_pct,
+        'total_votes': total_votes,
+        'total_electors': total_electors,
+        'turnout_pct': round(total_votes / total_electors * 100, 2) if total_electors else None,
+        'candidate_count': len(results),
+    }
+
+
+def refresh_constituency_summaries(
+    db: Session,
+    election_id: int,
+    constituency_ids: Optional[Iterable[int]] = None,
+) -> int:
+    """
+    Rebuild summary rows for an election from its candidate-level results
+
+    Args:
+        db: Database session (committed by this function)
+        election_id: Election to refresh
+        constituency_ids: Only refresh these constituencies (default: all)
+
+    Returns:
+        Number of summary rows written
+    """
+    query = db.query(ElectionResult).filter(ElectionResult.election_id == election_id)
+    delete_query = db.query(ConstituencyResultSummary).filter(
+        ConstituencyResultSummary.election_id == election_id
+    )
+
+    if constituency_ids is not None:
+        constituency_ids = list(constituency_ids)
+        query = query.filter(ElectionResult.constituency_id.in_(constituency_ids))
+        delete_query = delete_query.filter(ConstituencyResultSummary.constituency_id.in_(constituency_ids))
+
+    # Single pass over the election's results, grouped by constituency in rank order
+    results = query.order_by(
+        ElectionResult.constituency_id,
+        ElectionResult.rank,
+        ElectionResult.total_votes.desc(),
+    ).all()
+
+    grouped: Dict[int, List[ElectionResult]] = {}
+    for result in results:
+        grouped.setdefault(result.constituency_id, []).append(result)
+
+    rows = [build_summary_row(group) for group in grouped.values()]
+    rows = [row for row in rows if row]
+
+    delete_query.delete(synchronize_session=False)
+    if rows:
+        db.bulk_insert_mappings(ConstituencyResultSummary, rows)
+    db.commit()
+
+    return len(rows)
+
+
+def seat_contributions(
+    db: Session,
+    election_id: int,
+    constituency_ids: Optional[Iterable[int]] = None,
+) -> Dict[RollupKey, List[int]]:
+    """
+    Compute what a set of seats contributes to the party rollups
+
+    Returns a mapping of rollup key -> [seats_won, seats_contested, total_votes].
+    Rollups are additive over seats, so the difference between two snapshots
+    of the same seats is exactly the change to apply to the stored rows.
+    Alliance groups come from party_bloc (the loaders store no alliance), so
+    rebuild rollups (scripts/refresh_result_summaries.py) after changing
+    the alliance config.
+    """
+    query = db.query(
+        ElectionResult.constituency_id,
+        ElectionResult.party,
+        ElectionResult.alliance,
+        ElectionResult.total_votes,
+        ElectionResult.is_winner,
+        Constituency.district,
+        Constituency.region,
+    ).join(
+        Constituency, ElectionResult.constituency_id == Constituency.id
+    ).filter(
+        ElectionResult.election_id == election_id
+    )
+
+    if constituency_ids is not None:
+        query = query.filter(ElectionResult.constituency_id.in_(list(constituency_ids)))
+
+    contributions: Dict[RollupKey, List[int]] = {}
+    contested = set()
+
+    for const_id, party, alliance, votes, is_winner, district, region in query:
+        scopes = [
+            ('state', STATE_SCOPE_VALUE),
+            ('district', district or 'Unknown'),
+            ('region', region or 'Unknown'),
+        ]
+        groups = [('party', party), ('alliance', party_bloc(party, alliance))]
+
+        for scope, scope_value in scopes:
+            for group_type, group_name in groups:
+                key = (scope, scope_value, group_type, group_name)
+                entry = contributions.setdefault(key, [0, 0, 0])
+                entry[2] += votes or 0
+                if is_winner == 1:
+                    entry[0] += 1
+                # A party can field several candidates in one seat (e.g. IND)
+                if (const_id, key) not in contested:
+                    contested.add((const_id, key))
+                    entry[1] += 1
+
+    return contributions
+
+
+def apply_rollup_delta(
+    db: Session,
+    election_id: int,
+    year: int,
+    before: Dict[RollupKey, List[int]],
+    after: Dict[RollupKey, List[int]],
+) -> int:
+    """
+    Apply the difference between two contribution snapshots to party_vote_rollups
+    Only touches rows whose keys changed and re-derives vote share for the affected scopes
+
+    Returns:
+        Number of rollup rows inserted, updated or deleted
+    """
+    deltas: Dict[RollupKey, List[int]] = {}
+    for key in set(before) | set(after):
+        old = before.get(key, [0, 0, 0])
+        new = after.get(key, [0, 0, 0])
+        delta = [n - o for n, o in zip(new, old)]
+        if any(delta):
+            deltas[key] = delta
+
+    if not deltas:
+        return 0
+
+    existing = {
+        (row.scope, row.scope_value, row.group_type, row.group_name): row
+        for row in db.query(PartyVoteRollup).filter(PartyVoteRollup.election_id == election_id)
+    }
+
+    changed = 0
+    for key, (seats_won, seats_contested, votes) in deltas.items():
+        row = existing.get(key)
+        if row is None:
+            if seats_contested <= 0:
+                continue
+            row = PartyVoteRollup(
+                election_id=election_id,
+                year=year,
+                scope=key[0],
+                scope_value=key[1],
+                group_type=key[2],
+                group_name=key[3],
+                seats_won=0,
+                seats_contested=0,
+                total_votes=0,
+            )
+            db.add(row)
+            existing[key] = row
+
+        row.seats_won += seats_won
+        row.seats_contested += seats_contested
+        row.total_votes += votes
+        changed += 1
+
+        if row.seats_contested <= 0:
+            db.delete(row)
+            del existing[key]
+
+    # Vote share denominators change for every group in an affected scope
+    affected_scopes = {(key[0], key[1], key[2]) for key in deltas}
+    scope_totals: Dict[Tuple[str, str, str], int] = {}
+    for key, row in existing.items():
+        scope_key = (key[0], key[1], key[2])
+        if scope_key in affected_scopes:
+            scope_totals[scope_key] = scope_totals.get(scope_key, 0) + row.total_votes
+
+    for key, row in existing.items():
+        scope_key = (key[0], key[1], key[2])
+        if scope_key in affected_scopes:
+            total = scope_totals[scope_key]
+            row.vote_share_pct = round(row.total_votes / total * 100, 2) if total else 0
+
+    db.commit()
+    return changed
+
+
+def refresh_party_rollups(db: Session, election_id: int, year: int) -> int:
+    """Rebuild all party rollups for an election from scratch"""
+    db.query(PartyVoteRollup).filter(
+        PartyVoteRollup.election_id == election_id
+    ).delete(synchronize_session=False)
+    db.commit()
+
+    return apply_rollup_delta(db, election_id, year, {}, seat_contributions(db, election_id))
+
+
+def refresh_election_aggregates(db: Session, election_id: int, year: int) -> Tuple[int, int]:
+    """
+    Rebuild every precomputed aggregate for an election
+    Loaders call this once an election's results are inserted
+
+    Returns:
+        (summary rows written, rollup rows written)
+    """
+    summary_count = refresh_constituency_summaries(db, election_id)
+    rollup_count = refresh_party_rollups(db, election_id, year)
+    invalidate(TAG_RESULTS)
+    return summary_count, rollup_count
+
+
+@contextmanager
+def track_result_changes(
+    db: Session,
+    election_id: int,
+    year: int,
+    constituency_ids: Optional[Iterable[int]] = None,
+):
+    """
+    Keep aggregates in sync while correcting results for some seats
+
+    Usage:
+        with track_result_changes(db, election.id, election.year, [const_id]):
+            result.party = "AIADMK"
+            db.commit()
+
+    Only the listed constituencies (default: all) are re-read before and after
+    the block; summaries for them are rebuilt and rollups receive the delta.
+    """
+    if constituency_ids is not None:
+        constituency_ids = list(constituency_ids)
+
+    before = seat_contributions(db, election_id, constituency_ids)
+    yield
+    db.flush()
+    after = seat_contributions(db, election_id, constituency_ids)
+
+    refresh_constituency_summaries(db, election_id, constituency_ids)
+    apply_rollup_delta(db, election_id, year, before, after)
+    invalidate(TAG_RESULTS)
@@ -3,13 +3,17 @@ Service for generating election predictions using ChatGPT
 Maps historical results to current alliances and generates 2026 predictions
 """
 from openai import OpenAI
+import hashlib
 import json
-from typing import Dict, List, Optional, Any
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Sequence
 from sqlalchemy.orm import Session
 import time
 
 from app.models.constituency import Constituency
-from app.models.election import ElectionResult
+from app.models.election import ElectionResult, ConstituencyResultSummary
+from app.services.alliances import map_party_to_alliance
 from app.schemas.prediction import ChatGPTResponse
 
 
@@ -68,76 +72,55 @@ PARTY PERFORMANCE CONTEXT:
     return summary
 
 
-def map_party_to_alliance(party: str, alliance_mapping: Dict) -> str:
-    """Map a party name to its 2026 alliance"""
-    # Normalize party name
-    party_normalized = party.strip().upper()
-
-    # Direct mapping
-    for key, alliance in alliance_mapping.items():
-        if key.upper() == party_normalized:
-            return alliance
-
-    # Fuzzy matching for common variations
-    if 'DMK' in party_normalized and 'AIADMK' not in party_normalized and 'MDMK' not in party_normalized:
-        return 'DMK+'
-    elif 'AIADMK' in party_normalized or 'ADMK' in party_normalized:
-        return 'AIADMK+'
-    elif 'CONGRESS' in party_normalized or 'INC' in party_normalized:
-        return 'DMK+'
-    elif 'BJP' in party_normalized or 'JANATA' in party_normalized:
-        return 'AIADMK+'
-    elif 'VCK' in party_normalized:
-        return 'DMK+'
-    elif 'PMK' in party_normalized:
-        return 'PMK'
-    elif 'NTK' in party_normalized or 'NAAM TAMILAR' in party_normalized:
-        return 'NTK'
-    elif 'MDMK' in party_normalized:
-        return 'DMK+'
-    elif 'CPI' in party_normalized or 'COMMUNIST' in party_normalized:
-        return 'DMK+'
-    elif 'MNM' in party_normalized:
-        return 'DMK+'
-    elif 'AMMK' in party_normalized:
-        return 'AMMK'
-    elif 'DMDK' in party_normalized:
-        return 'DMDK'
-    else:
-        return 'Others'
-
-
 def fetch_constituency_historical_data(
     constituency_id: int,
     db: Session,
-    alliance_mapping: Dict
+    alliance_mapping: Dict,
+    years: Sequence[int] = (2021, 2016, 2011)
 ) -> Dict[str, Any]:
     """
     Fetch historical election results for a constituency
-    Map parties to current 2026 alliances
+    Map parties to current 2026 alliances (or the alliances in alliance_mapping)
     """
     constituency = db.query(Constituency).filter(Constituency.id == constituency_id).first()
 
     if not constituency:
         return None
 
-    # Get results for 2021, 2016, 2011
-    years = [2021, 2016, 2011]
+    # Get results for the requested years (2021, 2016, 2011 by default)
+    years = list(years)
     historical_data = {}
 
+    # Seat-level totals come from the precomputed summaries, so only the
+    # top candidates need to be read from election_results
+    summaries = {
+        s.year: s for s in db.query(ConstituencyResultSummary).filter(
+            ConstituencyResultSummary.constituency_id == constituency_id,
+            ConstituencyResultSummary.year.in_(years)
+        ).all()
+    }
+
+    top_results = db.query(ElectionResult).filter(
+        ElectionResult.constituency_id == constituency_id,
+        ElectionResult.year.in_(years),
+        ElectionResult.rank <= 10
+    ).order_by(ElectionResult.year, ElectionResult.rank).all()
+
+    results_by_year = {}
+    for result in top_results:
+        results_by_year.setdefault(result.year, []).append(result)
+
     for year in years:
-        results = db.query(ElectionResult).filter(
-            ElectionResult.constituency_id == constituency_id,
-            ElectionResult.year == year
-        ).order_by(ElectionResult.rank).all()
+        summary = summaries.get(year)
+        results = results_by_year.get(year)
 
-        if not results:
+        if not summary or not results:
             continue
 
         # Map results to alliances
         alliance_votes = {}
         top_candidates = []
-        total_votes = sum([r.total_votes or 0 for r in results])
+        total_votes = summary.total_votes
 
         for result in results[:10]:  # Top 10 candidates
             alliance = map_party_to_alliance(result.party, alliance_mapping)
@@ -184,10 +167,10 @@ def fetch_constituency_historical_data(
             'total_votes': total_votes,
             'alliance_shares': dict(sorted_alliances),
             'top_candidates': top_candidates,
-            'winner': results[0].party if results else None,
-            'winner_alliance': map_party_to_alliance(results[0].party, alliance_mapping) if results else None,
-            'winner_vote_share': results[0].vote_share_pct if results else 0,
-            'margin_pct': results[0].margin_pct if results else 0
+            'winner': summary.winner_party,
+            'winner_alliance': map_party_to_alliance(summary.winner_party, alliance_mapping),
+            'winner_vote_share': summary.winner_vote_share_pct or 0,
+            'margin_pct': summary.margin_pct or 0
         }
 
     return {
@@ -205,60 +188,32 @@ def fetch_constituency_historical_data(
     }
 
 
-def build_prediction_prompt(
-    constituency_data: Dict,
+def build_prompt_prefix(
     alliance_config: Dict,
-    trends_summary: str
+    trends_summary: str,
+    target_year: int = 2026
 ) -> str:
-    """Build comprehensive prompt for ChatGPT"""
-
-    const = constituency_data['constituency']
-    hist = constituency_data['historical_results']
-
-    prompt = f"""You are an expert Tamil Nadu political analyst. Predict the 2026 Assembly Election outcome for this constituency based on historical data and current trends.
+    """
+    Static part of the prediction prompt: context, alliances, instructions and
+    response format. Identical for every constituency of a run, so it is sent
+    first and the provider can serve it from its prompt cache.
+    """
 
-CONSTITUENCY: {const['name']} (AC #{const['ac_number']})
-DISTRICT: {const['district']} | REGION: {const['region']}
-DEMOGRAPHICS: Population {const['population']:,} | Urban {const['urban_pct']:.1f}% | Literacy {const['literacy_rate']:.1f}%
+    prefix = f"""You are an expert Tamil Nadu political analyst. Predict the {target_year} Assembly Election outcome for the constituency given after these instructions based on its historical data and current trends.
 
 {trends_summary}
 
-CURRENT ALLIANCE STRUCTURE (2026):
+CURRENT ALLIANCE STRUCTURE ({target_year}):
 """
 
     # Add alliance details
     for alliance_name, alliance_info in alliance_config['alliances'].items():
         if alliance_name in ['DMK+', 'AIADMK+', 'NTK', 'TVK']:
             partners = ', '.join([p['party'] for p in alliance_info['partners'][:5]])
-            prompt += f"- {alliance_name}: {partners}\n"
-
-    prompt += f"\nHISTORICAL RESULTS (mapped to 2026 alliances):\n\n"
-
-    # Add historical results
-    for year in [2021, 2016, 2011]:
-        if year in hist:
-            data = hist[year]
-            prompt += f"{year} Election:\n"
-            prompt += f"Winner: {data['winner_alliance']} alliance ({data['winner']}) - {data['winner_vote_share']:.1f}% (Margin: {data['margin_pct']:.1f}%)\n"
-            prompt += f"Alliance Performance:\n"
-
-            for alliance, share_data in list(data['alliance_shares'].items())[:4]:
-                prompt += f"  - {alliance}: {share_data['vote_share']:.1f}%\n"
-            prompt += "\n"
-
-    # Calculate swing
-    if 2021 in hist and 2016 in hist:
-        prompt += "SWING ANALYSIS (2016 → 2021):\n"
-        for alliance in ['DMK+', 'AIADMK+', 'NTK', 'Others']:
-            vote_2021 = hist[2021]['alliance_shares'].get(alliance, {}).get('vote_share', 0)
-            vote_2016 = hist[2016]['alliance_shares'].get(alliance, {}).get('vote_share', 0)
-            swing = vote_2021 - vote_2016
-            if swing != 0:
-                prompt += f"  - {alliance}: {swing:+.1f}%\n"
-        prompt += "\n"
-
-    prompt += """TASK: Predict the 2026 election outcome for this constituency at ALLIANCE level.
+            prefix += f"- {alliance_name}: {partners}\n"
 
+    prefix += f"\nTASK: Predict the {target_year} election outcome for the constituency at ALLIANCE level.\n"
+    prefix += """
 Consider:
 - Historical voting patterns and swings
 - Current anti-incumbency sentiment
@@ -302,27 +257,201 @@ Use "Toss-up" when:
 - Anti-incumbency sentiment is strong but opposition is fragmented
 """
 
+    return prefix
+
+
+def build_constituency_prompt(
+    constituency_data: Dict,
+    target_year: int = 2026
+) -> str:
+    """Per-constituency part of the prediction prompt: demographics, results and swing"""
+
+    const = constituency_data['constituency']
+    hist = constituency_data['historical_results']
+    history_years = sorted(hist, reverse=True)
+
+    prompt = f"""CONSTITUENCY: {const['name']} (AC #{const['ac_number']})
+DISTRICT: {const['district']} | REGION: {const['region']}
+DEMOGRAPHICS: Population {const['population']:,} | Urban {const['urban_pct']:.1f}% | Literacy {const['literacy_rate']:.1f}%
+"""
+
+    prompt += f"\nHISTORICAL RESULTS (mapped to {target_year} alliances):\n\n"
+
+    # Add historical results, latest first
+    for year in history_years:
+        data = hist[year]
+        prompt += f"{year} Election:\n"
+        prompt += f"Winner: {data['winner_alliance']} alliance ({data['winner']}) - {data['winner_vote_share']:.1f}% (Margin: {data['margin_pct']:.1f}%)\n"
+        prompt += f"Alliance Performance:\n"
+
+        for alliance, share_data in list(data['alliance_shares'].items())[:4]:
+            prompt += f"  - {alliance}: {share_data['vote_share']:.1f}%\n"
+        prompt += "\n"
+
+    # Calculate swing between the two latest elections
+    if len(history_years) >= 2:
+        latest, previous = history_years[:2]
+        prompt += f"SWING ANALYSIS ({previous} → {latest}):\n"
+        for alliance in ['DMK+', 'AIADMK+', 'NTK', 'Others']:
+            vote_latest = hist[latest]['alliance_shares'].get(alliance, {}).get('vote_share', 0)
+            vote_previous = hist[previous]['alliance_shares'].get(alliance, {}).get('vote_share', 0)
+            swing = vote_latest - vote_previous
+            if swing != 0:
+                prompt += f"  - {alliance}: {swing:+.1f}%\n"
+        prompt += "\n"
+
+    prompt += f"Predict the {target_year} outcome for {const['name']} as instructed. Return ONLY the JSON.\n"
+
     return prompt
 
 
+def build_prediction_prompt(
+    constituency_data: Dict,
+    alliance_config: Dict,
+    trends_summary: str,
+    target_year: int = 2026
+) -> str:
+    """
+    Build comprehensive prompt for ChatGPT (prefix and constituency part as one text)
+    target_year is the election being predicted (earlier years for backtests)
+    """
+    return (
+        build_prompt_prefix(alliance_config, trends_summary, target_year)
+        + "\n"
+        + build_constituency_prompt(constituency_data, target_year)
+    )
+
+
+def prompt_cache_key(prefix: str) -> str:
+    """
+    Prompt cache routing key for a prefix: requests sharing it are sent to
+    the same cache, so one run hits the prefix cached by its first calls
+    """
+    return "predictions-" + hashlib.sha256(prefix.encode("utf-8")).hexdigest()[:16]
+
+
+class PromptUsage:
+    """
+    Token and latency accounting across ChatGPT calls (thread-safe)
+    One record per API request, retries included, since each is billed
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.failed_calls = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.completion_tokens = 0
+        self.latencies: List[float] = []
+
+    def record(self, latency_s: float, usage: Any = None):
+        """Add one request: its latency and the response's usage (None if the request failed)"""
+        details = getattr(usage, "prompt_tokens_details", None)
+        with self._lock:
+            self.calls += 1
+            self.latencies.append(latency_s)
+            if usage is None:
+                self.failed_calls += 1
+                return
+            self.prompt_tokens += usage.prompt_tokens or 0
+            self.cached_tokens += (getattr(details, "cached_tokens", None) or 0)
+            self.completion_tokens += usage.completion_tokens or 0
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            latencies = sorted(self.latencies)
+            prompt_tokens = self.prompt_tokens
+            cached_tokens = self.cached_tokens
+
+            def percentile(q: float) -> Optional[float]:
+                if not latencies:
+                    return None
+                return round(latencies[min(len(latencies) - 1, int(q * len(latencies)))], 2)
+
+            return {
+                "calls": self.calls,
+                "failed_calls": self.failed_calls,
+                "prompt_tokens": prompt_tokens,
+                "cached_tokens": cached_tokens,
+                "uncached_tokens": prompt_tokens - cached_tokens,
+                "cached_pct": round(100 * cached_tokens / prompt_tokens, 1) if prompt_tokens else None,
+                "completion_tokens": self.completion_tokens,
+                "latency_mean_s": round(sum(latencies) / len(latencies), 2) if latencies else None,
+                "latency_p50_s": percentile(0.5),
+                "latency_p95_s": percentile(0.95),
+                "latency_total_s": round(sum(latencies), 1),
+            }
+
+
+def format_usage(summary: Dict[str, Any]) -> str:
+    """PromptUsage.summary() as a short report for scripts"""
+    def fmt(value, suffix=""):
+        return "-" if value is None else f"{value}{suffix}"
+
+    return "\n".join([
+        f"API calls:         {summary['calls']} ({summary['failed_calls']} failed)",
+        f"Prompt tokens:     {summary['prompt_tokens']:,} "
+        f"({summary['cached_tokens']:,} cached, {summary['uncached_tokens']:,} uncached, "
+        f"{fmt(summary['cached_pct'], '%')} cache hits)",
+        f"Completion tokens: {summary['completion_tokens']:,}",
+        f"Latency:           mean {fmt(summary['latency_mean_s'], 's')}, p50 {fmt(summary['latency_p50_s'], 's')}, "
+        f"p95 {fmt(summary['latency_p95_s'], 's')}",
+    ])
+
+
+def prompt_confidence_level(win_probability: float, margin_pct: float) -> str:
+    """Confidence level by the guidelines the prompt gives ChatGPT"""
+    if win_probability > 0.65 and margin_pct > 10:
+        return "Safe"
+    elif win_probability > 0.55 and margin_pct > 7:
+        return "Likely"
+    elif win_probability > 0.50 and margin_pct > 4:
+        return "Lean"
+    return "Toss-up"
+
+
+@lru_cache(maxsize=4)
+def _openai_client(api_key: str) -> OpenAI:
+    """One client per key, so calls reuse its HTTP connections"""
+    return OpenAI(api_key=api_key)
+
+
 def call_chatgpt_for_prediction(
     prompt: str,
     api_key: str,
     model: str = "gpt-5",
-    max_retries: int = 3
+    max_retries: int = 3,
+    instructions: Optional[str] = None,
+    usage: Optional[PromptUsage] = None
 ) -> Optional[Dict]:
-    """Call ChatGPT API and return parsed prediction"""
+    """
+    Call ChatGPT API and return parsed prediction
+    instructions (the static prompt prefix) is sent as the system message
+    ahead of prompt, with a prompt_cache_key derived from it; usage, if
+    given, records tokens and latency of every request
+    """
 
-    client = OpenAI(api_key=api_key)
+    client = _openai_client(api_key)
+    messages = [{"role": "user", "content": prompt}]
+    options = {}
+    if instructions:
+        messages.insert(0, {"role": "system", "content": instructions})
+        options["prompt_cache_key"] = prompt_cache_key(instructions)
 
     for attempt in range(max_retries):
         try:
-            response = client.chat.completions.create(
-                model=model,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
+            response = None
+            started = time.perf_counter()
+            try:
+                response = client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    **options
+                )
+            finally:
+                if usage is not None:
+                    usage.record(time.perf_counter() - started, response.usage if response else None)
 
             response_text = response.choices[0].message.content
 
@@ -374,7 +503,8 @@ def generate_prediction_for_constituency(
     alliance_config: Dict,
     trends_summary: str,
     api_key: str,
-    model: str = "gpt-5"
+    model: str = "gpt-5",
+    usage: Optional[PromptUsage] = None
 ) -> Optional[Dict]:
     """
     Main function to generate prediction for a constituency
@@ -392,18 +522,13 @@ def generate_prediction_for_constituency(
         print(f"Failed to fetch data for constituency {constituency_id}")
         return None
 
-    # Build prompt
-    prompt = build_prediction_prompt(
-        constituency_data=constituency_data,
-        alliance_config=alliance_config,
-        trends_summary=trends_summary
-    )
-
-    # Call ChatGPT
+    # Call ChatGPT: shared prefix first, then this constituency
     prediction_data = call_chatgpt_for_prediction(
-        prompt=prompt,
+        prompt=build_constituency_prompt(constituency_data),
         api_key=api_key,
-        model=model
+        model=model,
+        instructions=build_prompt_prefix(alliance_config, trends_summary),
+        usage=usage
     )
 
     if not prediction_data:
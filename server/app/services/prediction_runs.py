@@ -0,0 +1,260 @@
+"""
+Prediction runs
+Every generation of predictions is a PredictionRun; the API serves the
+current run of each election year
+
+The current run is a one-row pointer (current_prediction_runs), read
+through the shared cache like table data versions: one primary-key lookup
+per DATA_VERSION_TTL, dropped with the prediction responses (TAG_PREDICTIONS)
+when a run is published. Runs are complete snapshots: a run that
+regenerates some seats copies the rest from the run it is based on, so
+two runs diff seat by seat in one query.
+"""
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import and_, func, insert, literal, select
+from sqlalchemy.orm import Session
+
+from app.cache import get_cache, invalidate, TAG_PREDICTIONS
+from app.http_cache import DATA_VERSION_TTL, data_version
+from app.models.constituency import Constituency
+from app.models.prediction import CurrentPredictionRun, Prediction, PredictionRun
+
+# Columns a copied prediction keeps (run_id is replaced, id and updated_at are new)
+COPIED_COLUMNS = [
+    column for column in Prediction.__table__.columns if column.name not in ("id", "run_id", "updated_at")
+]
+
+
+def current_run_id(db: Session, year: int) -> Optional[int]:
+    """Id of the run served for an election year, cached for DATA_VERSION_TTL"""
+    cache = get_cache()
+    key = f"current_prediction_run:{year}"
+
+    cached = cache.get(key)
+    if cached is not None:
+        value = cached.decode("ascii")
+        return int(value) if value else None
+
+    run_id = db.query(CurrentPredictionRun.run_id).filter(CurrentPredictionRun.predicted_year == year).scalar()
+    cache.set(key, (str(run_id) if run_id else "").encode("ascii"), DATA_VERSION_TTL, [TAG_PREDICTIONS])
+    return run_id
+
+
+def served_predictions(db: Session, year: int):
+    """
+    Filter for the predictions the API serves for a year: the current run,
+    or predictions saved without a run when the year has none
+    """
+    run_id = current_run_id(db, year)
+    if run_id is None:
+        return and_(Prediction.predicted_year == year, Prediction.run_id.is_(None))
+    return Prediction.run_id == run_id
+
+
+def predictions_version(db: Session, year: int) -> Optional[str]:
+    """
+    Version of the predictions served for a year: the latest prediction or
+    pointer update, plus the current run (publishing an older run again
+    changes the version even within the same second)
+    """
+    versions = [v for v in (data_version(db, Prediction), data_version(db, CurrentPredictionRun)) if v]
+    latest = max(versions).isoformat() if versions else None
+    run_id = current_run_id(db, year)
+    return f"{latest}/run-{run_id}" if latest and run_id else latest
+
+
+def create_run(
+    db: Session,
+    year: int,
+    prediction_model: str,
+    description: Optional[str] = None,
+    base_run_id: Optional[int] = None,
+) -> PredictionRun:
+    """A new, unpublished run"""
+    run = PredictionRun(
+        predicted_year=year,
+        prediction_model=prediction_model,
+        description=description,
+        base_run_id=base_run_id,
+    )
+    db.add(run)
+    db.commit()
+    return run
+
+
+def copy_predictions(
+    db: Session,
+    from_run_id: int,
+    to_run_id: int,
+    exclude_constituency_ids: Iterable[int] = (),
+) -> int:
+    """Copy a run's predictions into another run (INSERT ... SELECT), returning the number copied"""
+    source = select(literal(to_run_id), *COPIED_COLUMNS).where(Prediction.run_id == from_run_id)
+    excluded = list(exclude_constituency_ids)
+    if excluded:
+        source = source.where(Prediction.constituency_id.not_in(excluded))
+
+    result = db.execute(insert(Prediction).from_select(["run_id", *(c.name for c in COPIED_COLUMNS)], source))
+    db.commit()
+    return result.rowcount
+
+
+def publish_run(db: Session, run: PredictionRun):
+    """Make run the current run of its election year"""
+    pointer = db.get(CurrentPredictionRun, run.predicted_year)
+    if pointer is None:
+        db.add(CurrentPredictionRun(predicted_year=run.predicted_year, run_id=run.id))
+    else:
+        pointer.run_id = run.id
+    run.published_at = func.now()
+    db.commit()
+
+    # Drop cached pointers and prediction responses (shared with the API when CACHE_BACKEND=redis)
+    invalidate(TAG_PREDICTIONS)
+
+
+def list_runs(db: Session, year: int) -> List[Dict[str, Any]]:
+    """Runs of an election year, newest first, with their seat counts"""
+    current = current_run_id(db, year)
+    seats = func.count(Prediction.id)
+    rows = (
+        db.query(PredictionRun, seats)
+        .outerjoin(Prediction, Prediction.run_id == PredictionRun.id)
+        .filter(PredictionRun.predicted_year == year)
+        .group_by(PredictionRun.id)
+        .order_by(PredictionRun.id.desc())
+        .all()
+    )
+    return [run_record(run, count, current) for run, count in rows]
+
+
+def run_record(run: PredictionRun, seats: int, current: Optional[int]) -> Dict[str, Any]:
+    return {
+        "id": run.id,
+        "predicted_year": run.predicted_year,
+        "prediction_model": run.prediction_model,
+        "description": run.description,
+        "base_run_id": run.base_run_id,
+        "seats": seats,
+        "current": run.id == current,
+        "created_at": run.created_at.isoformat(),
+        "published_at": run.published_at.isoformat() if run.published_at else None,
+        "usage": (run.extra_data or {}).get("usage"),
+    }
+
+
+def _winner(side):
+    """Predicted winning alliance of one side of the diff (as the summary counts it)"""
+    return func.coalesce(side.c.extra_data["predicted_winner_alliance"].as_string(), side.c.predicted_winner_party)
+
+
+def _rounded(value: Optional[float]) -> Optional[float]:
+    return round(value, 2) if value is not None else None
+
+
+def diff_runs(
+    db: Session,
+    from_run_id: int,
+    to_run_id: int,
+    classify: Callable[[float, float], str],
+) -> Dict[str, Any]:
+    """
+    Seat-by-seat changes between two runs, from a single full outer join
+
+    Seats whose winner, confidence level (by classify), win probability,
+    vote share or margin changed are listed, plus seats only in one run.
+    """
+    before = select(Prediction).where(Prediction.run_id == from_run_id).subquery("before")
+    after = select(Prediction).where(Prediction.run_id == to_run_id).subquery("after")
+    constituency_id = func.coalesce(before.c.constituency_id, after.c.constituency_id)
+
+    rows = db.execute(
+        select(
+            constituency_id.label("constituency_id"),
+            Constituency.ac_number,
+            Constituency.name,
+            before.c.constituency_id.label("in_before"),
+            _winner(before).label("before_winner"),
+            before.c.win_probability.label("before_probability"),
+            before.c.predicted_vote_share.label("before_vote_share"),
+            before.c.predicted_margin_pct.label("before_margin"),
+            after.c.constituency_id.label("in_after"),
+            _winner(after).label("after_winner"),
+            after.c.win_probability.label("after_probability"),
+            after.c.predicted_vote_share.label("after_vote_share"),
+            after.c.predicted_margin_pct.label("after_margin"),
+        )
+        .select_from(before.join(after, before.c.constituency_id == after.c.constituency_id, full=True))
+        .join(Constituency, Constituency.id == constituency_id)
+        .order_by(Constituency.ac_number)
+    ).all()
+
+    def side(row, prefix: str) -> Optional[Dict[str, Any]]:
+        if getattr(row, f"in_{prefix}") is None:
+            return None
+        probability = getattr(row, f"{prefix}_probability") or 0.0
+        margin = getattr(row, f"{prefix}_margin") or 0.0
+        return {
+            "winner_alliance": getattr(row, f"{prefix}_winner"),
+            "confidence_level": classify(probability, margin),
+            "win_probability": getattr(row, f"{prefix}_probability"),
+            "vote_share": getattr(row, f"{prefix}_vote_share"),
+            "margin_pct": getattr(row, f"{prefix}_margin"),
+        }
+
+    seats = []
+    seat_totals: Dict[str, Dict[str, int]] = {}
+    confidence_moves: Dict[str, int] = {}
+    compared = winner_changes = 0
+    vote_share_change = 0.0
+
+    for row in rows:
+        old, new = side(row, "before"), side(row, "after")
+        for key, prediction in (("from", old), ("to", new)):
+            if prediction:
+                totals = seat_totals.setdefault(prediction["winner_alliance"], {"from": 0, "to": 0})
+                totals[key] += 1
+
+        entry = {"constituency_id": row.constituency_id, "ac_number": row.ac_number, "name": row.name,
+                 "from": old, "to": new}
+        if old is None or new is None:
+            seats.append({**entry, "change": "added" if old is None else "removed"})
+            continue
+
+        compared += 1
+        winner_changed = old["winner_alliance"] != new["winner_alliance"]
+        confidence_move = None
+        if old["confidence_level"] != new["confidence_level"]:
+            confidence_move = f"{old['confidence_level']} -> {new['confidence_level']}"
+            confidence_moves[confidence_move] = confidence_moves.get(confidence_move, 0) + 1
+        deltas = {
+            "vote_share_delta": _rounded((new["vote_share"] or 0) - (old["vote_share"] or 0)),
+            "margin_delta": _rounded((new["margin_pct"] or 0) - (old["margin_pct"] or 0)),
+            "win_probability_delta": round((new["win_probability"] or 0) - (old["win_probability"] or 0), 3),
+        }
+        winner_changes += winner_changed
+        vote_share_change += abs(deltas["vote_share_delta"])
+
+        if winner_changed or confidence_move or any(deltas.values()):
+            seats.append({
+                **entry,
+                "change": "winner" if winner_changed else "confidence" if confidence_move else "shares",
+                "confidence_move": confidence_move,
+                **deltas,
+            })
+
+    return {
+        "seats_compared": compared,
+        "added": sum(seat["change"] == "added" for seat in seats),
+        "removed": sum(seat["change"] == "removed" for seat in seats),
+        "winner_changes": winner_changes,
+        "confidence_changes": sum(confidence_moves.values()),
+        "mean_abs_vote_share_delta": round(vote_share_change / compared, 2) if compared else None,
+        "confidence_moves": dict(sorted(confidence_moves.items(), key=lambda item: -item[1])),
+        "seat_totals": {
+            alliance: {**totals, "change": totals["to"] - totals["from"]}
+            for alliance, totals in sorted(seat_totals.items(), key=lambda item: -item[1]["to"])
+        },
+        "seats": seats,
+    }
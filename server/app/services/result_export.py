@@ -0,0 +1,139 @@
+"""
+Service for streaming bulk exports of election results
+Rows are read through a server-side cursor and encoded chunk by chunk,
+so memory stays flat regardless of how many candidates an election has
+"""
+import csv
+import io
+import json
+from typing import Iterator, List, Tuple
+
+from sqlalchemy import select
+
+from app.database import SessionLocal
+from app.models.election import ElectionResult
+
+# Rows fetched from the cursor per round trip
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_COLUMNS = [
+    ElectionResult.id,
+    ElectionResult.election_id,
+    ElectionResult.constituency_id,
+    ElectionResult.year,
+    ElectionResult.ac_number,
+    ElectionResult.ac_name,
+    ElectionResult.ac_slug,
+    ElectionResult.total_electors,
+    ElectionResult.candidate_name,
+    ElectionResult.sex,
+    ElectionResult.age,
+    ElectionResult.category,
+    ElectionResult.party,
+    ElectionResult.symbol,
+    ElectionResult.alliance,
+    ElectionResult.general_votes,
+    ElectionResult.postal_votes,
+    ElectionResult.total_votes,
+    ElectionResult.vote_share_pct,
+    ElectionResult.rank,
+    ElectionResult.is_winner,
+    ElectionResult.margin,
+    ElectionResult.margin_pct,
+]
+EXPORT_FIELDS = [column.key for column in EXPORT_COLUMNS]
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+
+def iter_result_batches(election_id: int) -> Iterator[List[Tuple]]:
+    """
+    Yield election results in batches straight from a server-side cursor
+
+    Opens its own session because the response body is produced after the
+    request's dependencies have been resolved.
+    """
+    stmt = (
+        select(*EXPORT_COLUMNS)
+        .where(ElectionResult.election_id == election_id)
+        .order_by(ElectionResult.ac_number, ElectionResult.rank)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+    db = SessionLocal()
+    try:
+        for partition in db.execute(stmt).partitions():
+            yield partition
+    finally:
+        db.close()
+
+
+def iter_ndjson(election_id: int) -> Iterator[bytes]:
+    """Stream results as newline-delimited JSON"""
+    for batch in iter_result_batches(election_id):
+        lines = [json.dumps(dict(zip(EXPORT_FIELDS, row)), default=str) for row in batch]
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def iter_csv(election_id: int) -> Iterator[bytes]:
+    """Stream results as CSV with a header row"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(EXPORT_FIELDS)
+    yield buffer.getvalue().encode("utf-8")
+
+    for batch in iter_result_batches(election_id):
+        buffer.seek(0)
+        buffer.truncate(0)
+        writer.writerows(batch)
+        yield buffer.getvalue().encode("utf-8")
+
+
+def arrow_schema():
+    """Arrow schema matching EXPORT_COLUMNS (requires pyarrow)"""
+    import pyarrow as pa
+
+    types = {
+        "ac_name": pa.string(),
+        "ac_slug": pa.string(),
+        "candidate_name": pa.string(),
+        "sex": pa.string(),
+        "category": pa.string(),
+        "party": pa.string(),
+        "symbol": pa.string(),
+        "alliance": pa.string(),
+        "vote_share_pct": pa.float64(),
+        "margin_pct": pa.float64(),
+    }
+    return pa.schema([(field, types.get(field, pa.int64())) for field in EXPORT_FIELDS])
+
+
+def iter_arrow(election_id: int) -> Iterator[bytes]:
+    """Stream results as an Arrow IPC stream, one record batch per cursor batch"""
+    import pyarrow as pa
+
+    schema = arrow_schema()
+    buffer = io.BytesIO()
+    writer = pa.ipc.new_stream(buffer, schema)
+
+    def drain() -> bytes:
+        data = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+        return data
+
+    for batch in iter_result_batches(election_id):
+        columns = list(zip(*batch))
+        writer.write_batch(pa.record_batch(
+            [pa.array(values, type=schema.field(i).type) for i, values in enumerate(columns)],
+            schema=schema,
+        ))
+        yield drain()
+
+    writer.close()
+    yield drain()
@@ -0,0 +1,484 @@
+"""
+Monte Carlo seat projection from stored predictions
+
+Each simulation perturbs every seat's predicted alliance vote shares with
+correlated errors and takes the highest share as the winner:
+- statewide error per alliance (shared by all seats)
+- regional error per alliance (shared by the seats of a region)
+- seat error on the predicted leader, sized so that the stored
+  win_probability is reproduced given the predicted margin
+
+Simulations run in batches of vectorized NumPy operations over
+simulations x seats, looping only over alliances and regions, so 100k
+scenarios take well under a second.
+
+exact_seat_distribution() is the cheap, deterministic complement: each
+seat's win_probability as an independent Bernoulli trial, convolved into
+the exact (Poisson-binomial) seat-count distribution of every alliance.
+"""
+from statistics import NormalDist
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.models.constituency import Constituency
+from app.models.prediction import Prediction
+from app.services.prediction_runs import predictions_version, served_predictions
+
+MAJORITY = 118  # of 234 seats
+
+# Default error terms, in vote-share points
+NATIONAL_SD = 3.0
+REGIONAL_SD = 2.0
+
+# Bounds for the seat-level error implied by win_probability and margin
+MIN_SEAT_SD = 1.0
+MAX_SEAT_SD = 15.0
+DEFAULT_SEAT_SD = 5.0  # When a prediction has no usable probability
+
+MAX_SIMULATIONS = 200_000
+DEFAULT_SEED = 2026  # Fixed so repeated requests (and cached responses) agree
+CHUNK_SIZE = 1000  # Simulations per batch; keeps the working arrays in cache
+TIPPING_POINT_SEATS = 10
+
+SHARE_SCALE = 1000  # Vote shares are compared in thousandths of a point
+NO_SHARE = np.iinfo(np.int32).min // 2  # Key for alliances not contesting a seat
+
+UNKNOWN_REGION = "Unknown"
+
+
+class PredictionMatrix:
+    """Predicted vote shares for one year as a seats x alliances matrix"""
+
+    def __init__(
+        self,
+        seats: List[Dict[str, Any]],
+        alliances: List[str],
+        shares: np.ndarray,
+        win_probability: np.ndarray,
+        regions: List[str],
+        region_index: np.ndarray,
+        winners: np.ndarray,
+        margin_pct: np.ndarray,
+    ):
+        self.seats = seats  # constituency_id, ac_number, name, region per row
+        self.alliances = alliances
+        self.shares = shares  # float32, 0 where an alliance has no predicted share
+        self.win_probability = win_probability
+        self.regions = regions
+        self.region_index = region_index
+        self.winners = winners  # Stored predicted_winner_alliance (column index) per seat
+        self.margin_pct = margin_pct
+
+    @property
+    def leaders(self) -> np.ndarray:
+        return self.shares.argmax(axis=1)
+
+    def implied_seat_sd(self, national_sd: float, regional_sd: float) -> np.ndarray:
+        """
+        Seat-level error that reproduces each stored win_probability
+
+        The leader's lead over the runner-up is treated as normal with
+        sd = margin / z(win_probability); the statewide and regional terms
+        already explain 2 * (national_sd^2 + regional_sd^2) of its variance.
+        """
+        ordered = np.sort(self.shares, axis=1)
+        margin = ordered[:, -1] - ordered[:, -2] if ordered.shape[1] > 1 else ordered[:, -1]
+
+        total_sd = np.full(len(self.seats), DEFAULT_SEAT_SD, dtype=np.float64)
+        normal = NormalDist()
+        for i, probability in enumerate(self.win_probability):
+            if 0.5 < probability < 1.0 and margin[i] > 0:
+                total_sd[i] = margin[i] / normal.inv_cdf(min(probability, 0.999))
+        total_sd = np.clip(total_sd, MIN_SEAT_SD, MAX_SEAT_SD)
+
+        shared_variance = 2 * (national_sd ** 2 + regional_sd ** 2)
+        return np.sqrt(np.maximum(total_sd ** 2 - shared_variance, MIN_SEAT_SD ** 2)).astype(np.float32)
+
+
+def _alliance_shares(prediction: Prediction) -> Dict[str, float]:
+    """Predicted vote share per alliance (top_alliances, else top_candidates, else the winner alone)"""
+    extra = prediction.extra_data or {}
+    shares = {
+        entry.get("alliance"): entry.get("vote_share")
+        for entry in extra.get("top_alliances") or []
+    }
+    if not shares:
+        shares = {entry.get("party"): entry.get("vote_share") for entry in prediction.top_candidates or []}
+    if not shares:
+        winner = extra.get("predicted_winner_alliance") or prediction.predicted_winner_party
+        shares = {winner: prediction.predicted_vote_share}
+    return {alliance: float(share) for alliance, share in shares.items() if alliance and share}
+
+
+def _predicted_winner(prediction: Prediction) -> Optional[str]:
+    """Winning alliance as the predictions summary counts it"""
+    if prediction.extra_data:
+        return prediction.extra_data.get("predicted_winner_alliance")
+    return prediction.predicted_winner_party
+
+
+def build_prediction_matrix(db: Session, year: int) -> Optional[PredictionMatrix]:
+    rows = (
+        db.query(Prediction, Constituency.ac_number, Constituency.name, Constituency.region)
+        .join(Constituency, Prediction.constituency_id == Constituency.id)
+        .filter(served_predictions(db, year))
+        .order_by(Constituency.ac_number)
+        .all()
+    )
+    if not rows:
+        return None
+
+    seat_shares = [_alliance_shares(prediction) for prediction, *_ in rows]
+    seat_winners = [_predicted_winner(prediction) for prediction, *_ in rows]
+    alliances = sorted(
+        {alliance for shares in seat_shares for alliance in shares} | {winner for winner in seat_winners if winner}
+    )
+    column = {alliance: i for i, alliance in enumerate(alliances)}
+
+    shares = np.zeros((len(rows), len(alliances)), dtype=np.float32)
+    for i, seat in enumerate(seat_shares):
+        for alliance, share in seat.items():
+            shares[i, column[alliance]] = share
+
+    regions = sorted({region or UNKNOWN_REGION for *_, region in rows})
+    region_column = {region: i for i, region in enumerate(regions)}
+
+    return PredictionMatrix(
+        seats=[
+            {"constituency_id": prediction.constituency_id, "ac_number": ac_number, "name": name,
+             "region": region or UNKNOWN_REGION}
+            for prediction, ac_number, name, region in rows
+        ],
+        alliances=alliances,
+        shares=shares,
+        win_probability=np.array([prediction.win_probability or 0.0 for prediction, *_ in rows]),
+        regions=regions,
+        region_index=np.array([region_column[region or UNKNOWN_REGION] for *_, region in rows]),
+        # Seats without a stored winner fall back to the highest predicted share
+        winners=np.array([
+            column[winner] if winner else int(shares[i].argmax())
+            for i, winner in enumerate(seat_winners)
+        ]),
+        margin_pct=np.array([prediction.predicted_margin_pct or 0.0 for prediction, *_ in rows]),
+    )
+
+
+# (year, prediction version) -> matrix; rebuilt when predictions or the current run change
+_matrices: Dict[Tuple[int, Optional[str]], Optional[PredictionMatrix]] = {}
+
+
+def load_prediction_matrix(db: Session, year: int) -> Tuple[Optional[PredictionMatrix], Optional[str]]:
+    """The prediction matrix for a year, memoized per prediction version (see predictions_version)"""
+    version = predictions_version(db, year)
+    key = (year, version)
+
+    if key not in _matrices:
+        for stale in [k for k in _matrices if k[0] == year]:
+            del _matrices[stale]
+        _matrices[key] = build_prediction_matrix(db, year)
+    return _matrices[key], version
+
+
+def _seat_keys(shares: np.ndarray, alliance_bits: int) -> np.ndarray:
+    """
+    Pack vote shares and alliance indices into sortable int32 keys
+
+    key = share in thousandths of a point << alliance_bits | alliance index,
+    so one elementwise maximum over alliances yields both the best share and
+    the alliance holding it (key & mask). Alliances without a share get
+    NO_SHARE, which no error term can lift above a real share.
+    """
+    keys = np.rint(shares.astype(np.float64) * SHARE_SCALE).astype(np.int64) << alliance_bits
+    keys |= np.arange(shares.shape[1])
+    return np.where(shares > 0, keys, NO_SHARE).astype(np.int32)
+
+
+def simulate_seats(
+    matrix: PredictionMatrix,
+    simulations: int,
+    national_sd: float = NATIONAL_SD,
+    regional_sd: float = REGIONAL_SD,
+    seed: int = DEFAULT_SEED,
+) -> Dict[str, Any]:
+    """
+    Run the simulations and summarize them
+
+    Returns per-alliance seat distributions, majority probabilities and the
+    favourite's most likely tipping-point seats (the seat that delivers its
+    MAJORITY-th seat when its seats are ordered by margin).
+
+    Each batch draws half its scenarios and mirrors them (antithetic pairs),
+    halving the random draws; the error model is symmetric, so every
+    scenario is still drawn from it.
+    """
+    rng = np.random.default_rng(seed)
+    alliance_count = len(matrix.alliances)
+    alliance_bits = max(1, (alliance_count - 1).bit_length())
+    alliance_mask = (1 << alliance_bits) - 1
+
+    # Group seats by region so regional errors broadcast over contiguous blocks
+    order = np.argsort(matrix.region_index, kind="stable")
+    region_index = matrix.region_index[order]
+    region_count = len(matrix.regions)
+    bounds = np.searchsorted(region_index, np.arange(region_count + 1))
+    seat_count = len(order)
+    seat_rows = np.arange(seat_count)
+
+    shares = matrix.shares[order]
+    leaders = shares.argmax(axis=1)
+    seat_sd = matrix.implied_seat_sd(national_sd, regional_sd)[order] * SHARE_SCALE
+
+    # Only the leader carries seat error; everyone else moves with the shared errors
+    keys = _seat_keys(shares, alliance_bits)
+    leader_keys = np.rint(shares[seat_rows, leaders] * SHARE_SCALE).astype(np.int32) << alliance_bits
+    leader_keys |= leaders.astype(np.int32)
+    keys[seat_rows, leaders] = NO_SHARE
+    leader_columns = region_index * alliance_count + leaders
+
+    # Favourite: the alliance leading the most seats on point predictions
+    favourite = int(np.bincount(leaders, minlength=alliance_count).argmax())
+    favourite_leads = leaders == favourite
+    track_tipping = seat_count >= MAJORITY
+
+    seats_won = np.empty((simulations, alliance_count), dtype=np.int32)
+    tipping_counts = np.zeros(seat_count, dtype=np.int64)
+
+    chunk = min(CHUNK_SIZE, simulations)
+    noise = np.empty((chunk, seat_count), dtype=np.float32)
+    lead = np.empty((chunk, seat_count), dtype=np.int32)
+    current = np.empty((chunk, seat_count), dtype=np.int32)
+    best = np.empty((chunk, seat_count), dtype=np.int32)
+    best_rival = np.empty((chunk, seat_count), dtype=np.int32)
+    offsets = np.arange(chunk, dtype=np.int32)[:, None] * alliance_count
+
+    for start in range(0, simulations, chunk):
+        n = min(chunk, simulations - start)
+        half = (n + 1) // 2
+
+        errors = rng.standard_normal((half, region_count, alliance_count), dtype=np.float32) * regional_sd
+        errors += rng.standard_normal((half, 1, alliance_count), dtype=np.float32) * national_sd
+        errors = np.rint(np.concatenate([errors, -errors])[:n] * SHARE_SCALE).astype(np.int32) << alliance_bits
+
+        seat_noise = noise[:n]
+        rng.standard_normal(dtype=np.float32, out=seat_noise[:half])
+        np.negative(seat_noise[:n - half], out=seat_noise[half:])
+        seat_noise *= seat_sd
+
+        lead_key = lead[:n]
+        np.copyto(lead_key, seat_noise, casting="unsafe")
+        lead_key <<= alliance_bits
+        lead_key += leader_keys
+        lead_key += errors.reshape(n, -1)[:, leader_columns]
+
+        winner, rival, key = best[:n], best_rival[:n], current[:n]
+        winner[...] = lead_key
+        if track_tipping:
+            np.copyto(rival, lead_key)
+            rival[:, favourite_leads] = NO_SHARE
+
+        for alliance in range(alliance_count):
+            for region in range(region_count):
+                low, high = bounds[region], bounds[region + 1]
+                np.add(keys[low:high, alliance], errors[:, region, alliance, None], out=key[:, low:high])
+            np.maximum(winner, key, out=winner)
+            if not track_tipping:
+                continue
+            if alliance == favourite:
+                favourite_key = np.where(favourite_leads, lead_key, key)
+            else:
+                np.maximum(rival, key, out=rival)
+
+        winner &= alliance_mask
+        winner += offsets[:n]
+        counts = np.bincount(winner.ravel(), minlength=n * alliance_count).reshape(n, alliance_count)
+        seats_won[start:start + n] = counts
+
+        if track_tipping:
+            won = counts[:, favourite] >= MAJORITY
+            if won.any():
+                # Seat holding the MAJORITY-th largest margin, in simulations the favourite wins outright
+                margin = (rival[won] >> alliance_bits) - (favourite_key[won] >> alliance_bits)
+                threshold = np.partition(margin, MAJORITY - 1, axis=1)[:, MAJORITY - 1, None]
+                tipping_counts += np.bincount((margin == threshold).argmax(axis=1), minlength=seat_count)
+
+    # Back to the matrix's seat order
+    restored = np.zeros_like(tipping_counts)
+    restored[order] = tipping_counts
+    return _summarize(matrix, seats_won, favourite, restored, simulations)
+
+
+def _summarize(
+    matrix: PredictionMatrix,
+    seats_won: np.ndarray,
+    favourite: int,
+    tipping_counts: np.ndarray,
+    simulations: int,
+) -> Dict[str, Any]:
+    most_seats = seats_won.max(axis=1, keepdims=True)
+    # Ties for most seats are split evenly
+    leads = (seats_won == most_seats) / (seats_won == most_seats).sum(axis=1, keepdims=True)
+
+    alliances = []
+    for i, alliance in enumerate(matrix.alliances):
+        seats = seats_won[:, i]
+        histogram = np.bincount(seats, minlength=len(matrix.seats) + 1)
+        alliances.append({
+            "alliance": alliance,
+            "point_prediction_seats": int((matrix.leaders == i).sum()),
+            "mean_seats": round(float(seats.mean()), 2),
+            "median_seats": int(np.median(seats)),
+            "p05_seats": int(np.percentile(seats, 5)),
+            "p95_seats": int(np.percentile(seats, 95)),
+            "majority_probability": round(float((seats >= MAJORITY).mean()), 4),
+            "most_seats_probability": round(float(leads[:, i].mean()), 4),
+            "seat_distribution": {
+                str(count): round(float(histogram[count]) / simulations, 5)
+                for count in np.flatnonzero(histogram)
+            },
+        })
+    alliances.sort(key=lambda entry: entry["mean_seats"], reverse=True)
+
+    favourite_wins = int(tipping_counts.sum())
+    tipping_points = [
+        {
+            **matrix.seats[seat],
+            "probability": round(float(tipping_counts[seat]) / favourite_wins, 4),
+        }
+        for seat in np.argsort(-tipping_counts, kind="stable")[:TIPPING_POINT_SEATS]
+        if tipping_counts[seat] > 0
+    ]
+
+    return {
+        "simulations": simulations,
+        "total_seats": len(matrix.seats),
+        "majority_mark": MAJORITY,
+        "hung_assembly_probability": round(float((seats_won.max(axis=1) < MAJORITY).mean()), 4),
+        "alliances": alliances,
+        "tipping_point": {
+            "alliance": matrix.alliances[favourite],
+            "seats": tipping_points,
+        },
+    }
+
+
+def poisson_binomial(probabilities: np.ndarray) -> np.ndarray:
+    """
+    Exact distribution of the number of successes in independent Bernoulli trials
+
+    Returns P(k) for k = 0..len(probabilities). Dynamic programming adds one
+    trial at a time (O(n^2), ~1 ms for 234 seats) and, unlike the FFT form,
+    stays accurate far into the tails.
+    """
+    distribution = np.zeros(len(probabilities) + 1)
+    distribution[0] = 1.0
+    for trials, probability in enumerate(probabilities, start=1):
+        # k successes after this trial: k before and a failure, or k - 1 before and a success
+        distribution[1:trials + 1] = (
+            distribution[1:trials + 1] * (1 - probability) + distribution[:trials] * probability
+        )
+        distribution[0] *= 1 - probability
+    return distribution
+
+
+def seat_win_probabilities(matrix: PredictionMatrix) -> np.ndarray:
+    """
+    P(alliance wins seat) as a seats x alliances matrix
+
+    The stored winner gets win_probability; the rest goes to the runner-up
+    (the other alliance with the highest predicted share), or is left
+    unassigned when the prediction names no other alliance.
+    """
+    seat_count, alliance_count = matrix.shares.shape
+    seat_rows = np.arange(seat_count)
+    win_probability = np.clip(matrix.win_probability, 0.0, 1.0)
+
+    probabilities = np.zeros((seat_count, alliance_count))
+    probabilities[seat_rows, matrix.winners] = win_probability
+
+    rivals = matrix.shares.copy()
+    rivals[seat_rows, matrix.winners] = 0
+    runner_up = rivals.argmax(axis=1)
+    contested = rivals[seat_rows, runner_up] > 0
+    probabilities[seat_rows[contested], runner_up[contested]] += 1 - win_probability[contested]
+    return probabilities
+
+
+def _quantile(cumulative: np.ndarray, q: float) -> int:
+    return int(np.searchsorted(cumulative, q - 1e-12))
+
+
+def exact_seat_distribution(
+    matrix: PredictionMatrix,
+    classify: Callable[[float, float], str],
+) -> Dict[str, Any]:
+    """
+    Exact seat-count distribution per alliance
+
+    Seats are treated as independent, so this is narrower than the
+    simulation (which correlates errors statewide and by region). classify
+    maps (win_probability, margin_pct) to the summary's confidence level;
+    point_seats and the safe/likely/lean counts match /predictions/summary.
+    """
+    probabilities = seat_win_probabilities(matrix)
+    confidence = [
+        classify(float(probability), float(margin)).lower()
+        for probability, margin in zip(matrix.win_probability, matrix.margin_pct)
+    ]
+
+    alliances = []
+    for i, alliance in enumerate(matrix.alliances):
+        seat_probabilities = probabilities[:, i]
+        distribution = poisson_binomial(seat_probabilities[seat_probabilities > 0])
+        cumulative = np.cumsum(distribution)
+        levels = [level for level, winner in zip(confidence, matrix.winners) if winner == i and level != "toss-up"]
+
+        alliances.append({
+            "alliance": alliance,
+            "point_seats": len(levels),
+            "safe": levels.count("safe"),
+            "likely": levels.count("likely"),
+            "lean": levels.count("lean"),
+            "expected_seats": round(float(seat_probabilities.sum()), 2),
+            "most_likely_seats": int(distribution.argmax()),
+            "p05_seats": _quantile(cumulative, 0.05),
+            "p95_seats": _quantile(cumulative, 0.95),
+            "majority_probability": round(float(distribution[MAJORITY:].sum()), 6),
+            "seat_distribution": {
+                str(count): round(float(probability), 6)
+                for count, probability in enumerate(distribution)
+                if probability >= 1e-6
+            },
+        })
+    alliances.sort(key=lambda entry: entry["expected_seats"], reverse=True)
+
+    return {
+        "total_seats": len(matrix.seats),
+        "majority_mark": MAJORITY,
+        "toss_up": confidence.count("toss-up"),
+        "alliances": alliances,
+    }
+
+
+# (year, prediction version, thresholds version) -> distribution
+_distributions: Dict[Tuple[int, Optional[str], str], Dict[str, Any]] = {}
+
+
+def load_seat_distribution(
+    db: Session,
+    year: int,
+    classify: Callable[[float, float], str],
+    thresholds_version: str,
+) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """exact_seat_distribution() for a year, memoized per prediction and confidence-threshold version"""
+    matrix, version = load_prediction_matrix(db, year)
+    if matrix is None:
+        return None, version
+
+    key = (year, version, thresholds_version)
+    if key not in _distributions:
+        for stale in [k for k in _distributions if k[0] == year]:
+            del _distributions[stale]
+        _distributions[key] = exact_seat_distribution(matrix, classify)
+    return _distributions[key], version
@@ -0,0 +1,449 @@
+"""
+Preloaded seat x alliance vote-share matrices for swing scenarios
+
+A scenario request only adds swing vectors to an in-memory matrix and
+recomputes every seat's winner at once, so a slider UI gets answers in
+well under a millisecond of compute. Two bases are available:
+- results: alliance vote shares from an election's results (default 2021);
+  results without a stored alliance are mapped with party_bloc, parties
+  outside every alliance count as their own bloc, independents as the
+  seat's strongest independent
+- predictions: the stored top_alliances shares (default 2026)
+
+PartyVoteMatrix answers alliance what-ifs over past results ("who wins
+2016 if PMK had been with AIADMK+?"): votes per (seat, party) are loaded
+once per year, and regrouping them under any party -> alliance mapping is
+a single sparse product with the one-hot mapping matrix. Unmapped parties
+keep the alliance they contested in (resolved with party_bloc).
+
+Matrices are built at startup, then rebuilt when the source table's
+data version (latest updated_at) changes.
+"""
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.http_cache import data_version
+from app.models.constituency import Constituency
+from app.models.election import ElectionResult
+from app.services.alliances import party_bloc
+from app.services.prediction_runs import predictions_version
+from app.services.seat_projection import MAJORITY, UNKNOWN_REGION, load_prediction_matrix
+
+BASE_RESULTS = "results"
+BASE_PREDICTIONS = "predictions"
+DEFAULT_YEARS = {BASE_RESULTS: 2021, BASE_PREDICTIONS: 2026}
+
+INDEPENDENT = "IND"
+
+
+class VoteMatrix:
+    """Vote share (percent) per seat and alliance; 0 where an alliance did not contest"""
+
+    def __init__(
+        self,
+        seats: List[Dict[str, Any]],
+        alliances: List[str],
+        shares: np.ndarray,
+        regions: List[str],
+        region_index: np.ndarray,
+    ):
+        self.seats = seats  # constituency_id, ac_number, name, region per row
+        self.alliances = alliances
+        self.shares = shares
+        self.regions = regions
+        self.region_index = region_index
+        self.contested = shares > 0
+
+        # Baseline (no swing) winners and margins
+        self.winners, self.margins = _winners(shares, self.contested)
+        self.baseline_seats = np.bincount(self.winners, minlength=len(alliances))
+
+
+def _winners(shares: np.ndarray, contested: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Winning alliance per seat and its lead over the runner-up (points)"""
+    ranked = np.where(contested, shares, -np.inf)
+    winners = ranked.argmax(axis=1)
+    if ranked.shape[1] < 2:
+        return winners, ranked[:, 0]
+
+    top_two = -np.partition(-ranked, 1, axis=1)[:, :2]
+    # Walkovers (a single contestant) lead by their whole share
+    runner_up = np.where(np.isfinite(top_two[:, 1]), top_two[:, 1], 0.0)
+    return winners, top_two[:, 0] - runner_up
+
+
+def _matrix(rows: List[Tuple[Dict[str, Any], Dict[str, float]]]) -> VoteMatrix:
+    """Build a VoteMatrix from (seat, {alliance: share}) rows"""
+    alliances = sorted({alliance for _, shares in rows for alliance in shares})
+    column = {alliance: i for i, alliance in enumerate(alliances)}
+    regions = sorted({seat["region"] for seat, _ in rows})
+    region_column = {region: i for i, region in enumerate(regions)}
+
+    shares = np.zeros((len(rows), len(alliances)))
+    for i, (_, seat_shares) in enumerate(rows):
+        for alliance, share in seat_shares.items():
+            shares[i, column[alliance]] = share
+
+    return VoteMatrix(
+        seats=[seat for seat, _ in rows],
+        alliances=alliances,
+        shares=shares,
+        regions=regions,
+        region_index=np.array([region_column[seat["region"]] for seat, _ in rows], dtype=np.intp),
+    )
+
+
+def build_results_matrix(db: Session, year: int) -> Optional[VoteMatrix]:
+    """Alliance vote shares per seat from an election's results"""
+    query = (
+        db.query(
+            ElectionResult.constituency_id,
+            Constituency.ac_number,
+            Constituency.name,
+            Constituency.region,
+            ElectionResult.alliance,
+            ElectionResult.party,
+            ElectionResult.total_votes,
+        )
+        .join(Constituency, ElectionResult.constituency_id == Constituency.id)
+        .filter(ElectionResult.year == year)
+        .order_by(Constituency.ac_number)
+    )
+
+    seats: Dict[int, Tuple[Dict[str, Any], Dict[str, float]]] = {}
+    totals: Dict[int, float] = {}
+    for constituency_id, ac_number, name, region, alliance, party, votes in query:
+        _, blocs = seats.setdefault(constituency_id, (
+            {"constituency_id": constituency_id, "ac_number": ac_number, "name": name,
+             "region": region or UNKNOWN_REGION},
+            {},
+        ))
+        votes = float(votes or 0)
+        totals[constituency_id] = totals.get(constituency_id, 0.0) + votes
+
+        bloc = party_bloc(party, alliance)
+        if bloc == INDEPENDENT:
+            # Independents don't pool votes; only the strongest one could win
+            blocs[bloc] = max(blocs.get(bloc, 0.0), votes)
+        else:
+            blocs[bloc] = blocs.get(bloc, 0.0) + votes
+
+    if not seats:
+        return None
+
+    for constituency_id, (_, blocs) in seats.items():
+        total = totals[constituency_id] or 1.0
+        for bloc in blocs:
+            blocs[bloc] = blocs[bloc] * 100 / total
+    return _matrix(list(seats.values()))
+
+
+def build_predictions_matrix(db: Session, year: int) -> Optional[VoteMatrix]:
+    """Stored top_alliances shares per seat (shares the seat projection's matrix)"""
+    prediction, _ = load_prediction_matrix(db, year)
+    if prediction is None:
+        return None
+
+    return _matrix([
+        (seat, {
+            alliance: float(share)
+            for alliance, share in zip(prediction.alliances, prediction.shares[i])
+            if share > 0
+        })
+        for i, seat in enumerate(prediction.seats)
+    ])
+
+
+def _results_version(db: Session, year: int) -> Optional[str]:
+    latest = data_version(db, ElectionResult)
+    return latest.isoformat() if latest else None
+
+
+# base -> (data version of its source, builder)
+SOURCES = {
+    BASE_RESULTS: (_results_version, build_results_matrix),
+    BASE_PREDICTIONS: (predictions_version, build_predictions_matrix),
+}
+
+# (base, year) -> (data version, matrix)
+_matrices: Dict[Tuple[str, int], Tuple[Optional[str], Optional[VoteMatrix]]] = {}
+_matrices_lock = threading.Lock()
+
+
+def get_vote_matrix(db: Session, base: str, year: int) -> Optional[VoteMatrix]:
+    """The preloaded matrix for a base and year, rebuilt when its source data changes"""
+    source_version, build = SOURCES[base]
+    version = source_version(db, year)
+
+    entry = _matrices.get((base, year))
+    if entry is not None and entry[0] == version:
+        return entry[1]
+
+    with _matrices_lock:
+        entry = _matrices.get((base, year))
+        if entry is None or entry[0] != version:
+            entry = (version, build(db, year))
+            _matrices[(base, year)] = entry
+    return entry[1]
+
+
+class PartyVoteMatrix:
+    """
+    Votes per seat and party for one election, stored sparsely
+
+    Only contested (seat, party) pairs are kept as (seat, party, votes)
+    triplets. Regrouping multiplies this seats x parties matrix by a
+    parties x alliances one-hot matrix, computed as one weighted bincount
+    over the triplets.
+    """
+
+    def __init__(
+        self,
+        seats: List[Dict[str, Any]],
+        parties: List[str],
+        actual_alliances: List[str],
+        seat_index: np.ndarray,
+        party_index: np.ndarray,
+        votes: np.ndarray,
+        totals: np.ndarray,
+    ):
+        self.seats = seats
+        self.parties = parties
+        self.actual_alliances = actual_alliances  # Alliance each party contested in (see party_bloc)
+        self.seat_index = seat_index
+        self.party_index = party_index
+        self.votes = votes
+        self.totals = totals  # All votes cast per seat, including pooled-out independents
+        self.party_column = {party.upper(): i for i, party in enumerate(parties)}
+
+        self.actual = self.regroup({})
+
+    def regroup(self, mapping: Mapping[str, str]) -> Dict[str, Any]:
+        """Alliance votes, winners and margins per seat with mapping (party -> alliance) overriding actual alliances"""
+        assignment = list(self.actual_alliances)
+        for party, alliance in mapping.items():
+            assignment[self.party_column[party.upper()]] = alliance
+
+        alliances = sorted(set(assignment))
+        column = {alliance: i for i, alliance in enumerate(alliances)}
+        one_hot = np.array([column[alliance] for alliance in assignment], dtype=np.intp)
+
+        cells = self.seat_index * len(alliances) + one_hot[self.party_index]
+        votes = np.bincount(cells, weights=self.votes, minlength=len(self.seats) * len(alliances))
+        votes = votes.reshape(len(self.seats), len(alliances))
+
+        ranked = -np.sort(-votes, axis=1)
+        runner_up = ranked[:, 1] if len(alliances) > 1 else np.zeros(len(self.seats))
+        return {
+            "alliances": alliances,
+            "votes": votes,
+            "winners": votes.argmax(axis=1),
+            "margins": ranked[:, 0] - runner_up,
+        }
+
+
+def build_party_matrix(db: Session, year: int) -> Optional[PartyVoteMatrix]:
+    """Votes per (seat, party) for an election year"""
+    query = (
+        db.query(
+            ElectionResult.constituency_id,
+            Constituency.ac_number,
+            Constituency.name,
+            Constituency.region,
+            ElectionResult.party,
+            ElectionResult.alliance,
+            ElectionResult.total_votes,
+        )
+        .join(Constituency, ElectionResult.constituency_id == Constituency.id)
+        .filter(ElectionResult.year == year)
+        .order_by(Constituency.ac_number)
+    )
+
+    seat_row: Dict[int, int] = {}
+    seats: List[Dict[str, Any]] = []
+    party_column: Dict[str, int] = {}
+    party_alliances: List[Counter] = []
+    cells: Dict[Tuple[int, int], float] = {}
+    totals: List[float] = []
+
+    for constituency_id, ac_number, name, region, party, alliance, votes in query:
+        if constituency_id not in seat_row:
+            seat_row[constituency_id] = len(seats)
+            seats.append({"constituency_id": constituency_id, "ac_number": ac_number, "name": name,
+                          "region": region or UNKNOWN_REGION})
+            totals.append(0.0)
+        if party not in party_column:
+            party_column[party] = len(party_column)
+            party_alliances.append(Counter())
+
+        row, column = seat_row[constituency_id], party_column[party]
+        votes = float(votes or 0)
+        totals[row] += votes
+        party_alliances[column][party_bloc(party, alliance)] += 1
+
+        if party == INDEPENDENT:
+            # Independents don't pool votes; only the strongest one could win
+            cells[row, column] = max(cells.get((row, column), 0.0), votes)
+        else:
+            cells[row, column] = cells.get((row, column), 0.0) + votes
+
+    if not seats:
+        return None
+
+    coordinates = np.array(list(cells), dtype=np.intp)
+    return PartyVoteMatrix(
+        seats=seats,
+        parties=list(party_column),
+        # A party's alliance is the one most of its candidates stood for
+        actual_alliances=[counts.most_common(1)[0][0] for counts in party_alliances],
+        seat_index=coordinates[:, 0],
+        party_index=coordinates[:, 1],
+        votes=np.array(list(cells.values())),
+        totals=np.array(totals),
+    )
+
+
+_party_matrices: Dict[int, Tuple[Optional[str], Optional[PartyVoteMatrix]]] = {}
+
+
+def get_party_matrix(db: Session, year: int) -> Optional[PartyVoteMatrix]:
+    """The preloaded party matrix for a year, rebuilt when election results change"""
+    latest = data_version(db, ElectionResult)
+    version = latest.isoformat() if latest else None
+
+    entry = _party_matrices.get(year)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+
+    with _matrices_lock:
+        entry = _party_matrices.get(year)
+        if entry is None or entry[0] != version:
+            entry = (version, build_party_matrix(db, year))
+            _party_matrices[year] = entry
+    return entry[1]
+
+
+def recombine(matrix: PartyVoteMatrix, mapping: Mapping[str, str]) -> Dict[str, Any]:
+    """Statewide outcome of an election with parties regrouped into alliances"""
+    actual = matrix.actual
+    scenario = matrix.regroup(mapping)
+
+    winners = [scenario["alliances"][i] for i in scenario["winners"]]
+    actual_winners = [actual["alliances"][i] for i in actual["winners"]]
+    seats = Counter(winners)
+    actual_seats = Counter(actual_winners)
+    totals = np.maximum(matrix.totals, 1.0)
+    all_votes = float(matrix.totals.sum()) or 1.0
+
+    alliances = [
+        {
+            "alliance": alliance,
+            "actual_seats": actual_seats.get(alliance, 0),
+            "seats": seats.get(alliance, 0),
+            "change": seats.get(alliance, 0) - actual_seats.get(alliance, 0),
+            "votes": int(votes),
+            "vote_share_pct": round(float(votes) * 100 / all_votes, 2),
+        }
+        for alliance, votes in zip(scenario["alliances"], scenario["votes"].sum(axis=0))
+    ]
+    alliances.sort(key=lambda entry: (entry["seats"], entry["votes"]), reverse=True)
+    majority = [entry["alliance"] for entry in alliances if entry["seats"] >= MAJORITY]
+
+    flipped = [
+        {
+            **matrix.seats[row],
+            "from_alliance": actual_winners[row],
+            "to_alliance": winners[row],
+            "margin": int(scenario["margins"][row]),
+            "margin_pct": round(float(scenario["margins"][row] * 100 / totals[row]), 2),
+        }
+        for row in range(len(matrix.seats))
+        if winners[row] != actual_winners[row]
+    ]
+
+    return {
+        "total_seats": len(matrix.seats),
+        "majority_mark": MAJORITY,
+        "majority_alliance": majority[0] if majority else None,
+        "alliances": alliances,
+        "flipped_count": len(flipped),
+        "flipped": flipped,
+    }
+
+
+def load_vote_matrices():
+    """Build the default scenario bases at startup; a database error only delays them to the first request"""
+    db = SessionLocal()
+    try:
+        for base, year in DEFAULT_YEARS.items():
+            get_vote_matrix(db, base, year)
+        get_party_matrix(db, DEFAULT_YEARS[BASE_RESULTS])
+    except Exception as e:
+        print(f"WARNING: Scenario vote matrices not built at startup: {e}")
+    finally:
+        db.close()
+
+
+def apply_swing(
+    matrix: VoteMatrix,
+    swing: Mapping[str, float],
+    regional_swing: Mapping[str, Mapping[str, float]],
+) -> Dict[str, Any]:
+    """
+    Uniform swing: add each alliance's statewide (plus its region's) swing to
+    its share in every seat it contested, then recompute winners
+
+    Shares are floored at 0 but not renormalized, so swings that don't sum
+    to zero move the total too (as on a swingometer).
+    """
+    column = {alliance: i for i, alliance in enumerate(matrix.alliances)}
+    region_row = {region: i for i, region in enumerate(matrix.regions)}
+
+    delta = np.zeros((len(matrix.regions), len(matrix.alliances)))
+    for alliance, points in swing.items():
+        delta[:, column[alliance]] += points
+    for region, swings in regional_swing.items():
+        for alliance, points in swings.items():
+            delta[region_row[region], column[alliance]] += points
+
+    shares = np.maximum(matrix.shares + delta[matrix.region_index], 0.0)
+    winners, margins = _winners(shares, matrix.contested)
+    seats = np.bincount(winners, minlength=len(matrix.alliances))
+
+    flipped = np.flatnonzero(winners != matrix.winners)
+    majority = np.flatnonzero(seats >= MAJORITY)
+
+    alliances = [
+        {
+            "alliance": alliance,
+            "baseline_seats": int(matrix.baseline_seats[i]),
+            "seats": int(seats[i]),
+            "change": int(seats[i] - matrix.baseline_seats[i]),
+        }
+        for i, alliance in enumerate(matrix.alliances)
+        if seats[i] or matrix.baseline_seats[i]
+    ]
+    alliances.sort(key=lambda entry: (entry["seats"], entry["baseline_seats"]), reverse=True)
+
+    return {
+        "total_seats": len(matrix.seats),
+        "majority_mark": MAJORITY,
+        "majority_alliance": matrix.alliances[majority[0]] if len(majority) else None,
+        "alliances": alliances,
+        "flipped_count": len(flipped),
+        "flipped": [
+            {
+                **matrix.seats[seat],
+                "from_alliance": matrix.alliances[matrix.winners[seat]],
+                "to_alliance": matrix.alliances[winners[seat]],
+                "baseline_margin_pct": round(float(matrix.margins[seat]), 2),
+                "margin_pct": round(float(margins[seat]), 2),
+            }
+            for seat in flipped
+        ],
+    }
@@ -0,0 +1,225 @@
+"""
+Vote-share swing between elections
+
+Complements the winner/margin comparison in get_swing_analysis with the
+movement of votes: per-bloc vote-share deltas and Butler two-party swing
+for every seat, plus the same figures for each district, region and the
+state (computed from summed votes, not averaged seat figures).
+
+All elections are preloaded into a year x seat x bloc votes tensor (blocs
+are alliances resolved with party_bloc, or the party for candidates
+outside one, as in the party rollups), so any pair of years is one
+vectorized pass. The tensor is
+rebuilt when election results change (their data version).
+"""
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.http_cache import data_version
+from app.models.constituency import Constituency
+from app.models.election import ElectionResult
+from app.services.alliances import party_bloc
+from app.services.seat_projection import UNKNOWN_REGION
+
+UNKNOWN_DISTRICT = "Unknown"
+
+
+class SwingTensor:
+    """Votes per year, seat and bloc"""
+
+    def __init__(
+        self,
+        years: List[int],
+        seats: List[Dict[str, Any]],
+        blocs: List[str],
+        votes: np.ndarray,
+    ):
+        self.years = years
+        self.seats = seats  # constituency_id, ac_number, name, district, region per row
+        self.blocs = blocs
+        self.votes = votes  # years x seats x blocs
+        self.totals = votes.sum(axis=2)  # years x seats; 0 where a seat had no contest that year
+        self.year_index = {year: i for i, year in enumerate(years)}
+
+    @classmethod
+    def build(cls, db: Session) -> Optional["SwingTensor"]:
+        grouped = (
+            db.query(
+                ElectionResult.year,
+                ElectionResult.constituency_id,
+                ElectionResult.party,
+                ElectionResult.alliance,
+                func.sum(ElectionResult.total_votes),
+            )
+            .group_by(ElectionResult.year, ElectionResult.constituency_id, ElectionResult.party, ElectionResult.alliance)
+            .all()
+        )
+        if not grouped:
+            return None
+
+        # The loaders leave alliance NULL, so blocs come from the alliance mapping
+        rows = [
+            (year, constituency_id, party_bloc(party, alliance), total)
+            for year, constituency_id, party, alliance, total in grouped
+        ]
+
+        years = sorted({year for year, *_ in rows})
+        constituency_ids = {constituency_id for _, constituency_id, *_ in rows}
+        constituencies = (
+            db.query(Constituency.id, Constituency.ac_number, Constituency.name, Constituency.district,
+                     Constituency.region)
+            .filter(Constituency.id.in_(constituency_ids))
+            .order_by(Constituency.ac_number)
+            .all()
+        )
+        seats = [
+            {"constituency_id": id_, "ac_number": ac_number, "name": name,
+             "district": district or UNKNOWN_DISTRICT, "region": region or UNKNOWN_REGION}
+            for id_, ac_number, name, district, region in constituencies
+        ]
+        seat_row = {seat["constituency_id"]: i for i, seat in enumerate(seats)}
+        blocs = sorted({name for _, _, name, _ in rows})
+        bloc_column = {name: i for i, name in enumerate(blocs)}
+        year_index = {year: i for i, year in enumerate(years)}
+
+        votes = np.zeros((len(years), len(seats), len(blocs)))
+        for year, constituency_id, name, total in rows:
+            row = seat_row.get(constituency_id)
+            if row is not None:
+                votes[year_index[year], row, bloc_column[name]] += total or 0
+        return cls(years, seats, blocs, votes)
+
+    def ranked_blocs(self, year: int) -> List[str]:
+        """Blocs by statewide votes in a year, largest first"""
+        statewide = self.votes[self.year_index[year]].sum(axis=0)
+        return [self.blocs[i] for i in np.argsort(-statewide, kind="stable")]
+
+
+def _shares(votes: np.ndarray, totals: np.ndarray) -> np.ndarray:
+    """Vote share (percent) per row and bloc; rows without votes stay 0"""
+    return votes * 100 / np.maximum(totals, 1)[..., None]
+
+
+def _grouped(
+    labels: List[str],
+    votes_from: np.ndarray,
+    votes_to: np.ndarray,
+    pair: Tuple[int, int],
+    blocs: List[str],
+) -> List[Dict[str, Any]]:
+    """Swing per group (district/region) from the group's summed votes"""
+    names = sorted(set(labels))
+    group = np.array([names.index(label) for label in labels])
+    one_hot = np.zeros((len(names), len(labels)))
+    one_hot[group, np.arange(len(labels))] = 1
+
+    # groups x seats @ seats x blocs -> groups x blocs
+    summed_from, summed_to = one_hot @ votes_from, one_hot @ votes_to
+    seat_counts = one_hot.sum(axis=1)
+    return [
+        {"name": name, "seats": int(seat_counts[i]), **_swing(summed_from[i], summed_to[i], pair, blocs)}
+        for i, name in enumerate(names)
+    ]
+
+
+def _swing(votes_from: np.ndarray, votes_to: np.ndarray, pair: Tuple[int, int], blocs: List[str]) -> Dict[str, Any]:
+    """Butler swing and per-bloc share deltas for one set of vote totals"""
+    shares_from = _shares(votes_from, votes_from.sum())
+    shares_to = _shares(votes_to, votes_to.sum())
+    delta = shares_to - shares_from
+    first, second = pair
+    return {
+        "butler_swing": round(float(delta[first] - delta[second]) / 2, 2),
+        "share_change": {
+            blocs[i]: round(float(delta[i]), 2)
+            for i in np.flatnonzero((shares_from > 0) | (shares_to > 0))
+        },
+    }
+
+
+def compute_swing(
+    tensor: SwingTensor,
+    from_year: int,
+    to_year: int,
+    pair: Tuple[str, str],
+) -> Dict[str, Any]:
+    """
+    Swing between two elections for every seat, district, region and the state
+
+    butler_swing is ((first_to - first_from) - (second_to - second_from)) / 2
+    in vote-share points; positive means a swing towards pair[0].
+    """
+    start, end = tensor.year_index[from_year], tensor.year_index[to_year]
+    column = {bloc: i for i, bloc in enumerate(tensor.blocs)}
+    first, second = column[pair[0]], column[pair[1]]
+
+    # Seats contested in both elections
+    both = (tensor.totals[start] > 0) & (tensor.totals[end] > 0)
+    rows = np.flatnonzero(both)
+    votes_from, votes_to = tensor.votes[start, rows], tensor.votes[end, rows]
+
+    shares_from = _shares(votes_from, tensor.totals[start, rows])
+    shares_to = _shares(votes_to, tensor.totals[end, rows])
+    delta = shares_to - shares_from
+    butler = (delta[:, first] - delta[:, second]) / 2
+    moved = (shares_from > 0) | (shares_to > 0)
+
+    seats = [
+        {
+            **tensor.seats[row],
+            "butler_swing": round(float(butler[i]), 2),
+            "share_change": {
+                tensor.blocs[j]: round(float(delta[i, j]), 2) for j in np.flatnonzero(moved[i])
+            },
+        }
+        for i, row in enumerate(rows)
+    ]
+    columns = (first, second)
+
+    return {
+        "from_year": from_year,
+        "to_year": to_year,
+        "pair": list(pair),
+        "seats_compared": len(rows),
+        "statewide": _swing(votes_from.sum(axis=0), votes_to.sum(axis=0), columns, tensor.blocs),
+        "regions": _grouped([seat["region"] for seat in seats], votes_from, votes_to, columns, tensor.blocs),
+        "districts": _grouped([seat["district"] for seat in seats], votes_from, votes_to, columns, tensor.blocs),
+        "seats": seats,
+    }
+
+
+_tensor: Optional[Tuple[Optional[str], Optional[SwingTensor]]] = None
+_tensor_lock = threading.Lock()
+
+
+def get_swing_tensor(db: Session) -> Optional[SwingTensor]:
+    """The preloaded tensor, rebuilt when election results change"""
+    global _tensor
+
+    latest = data_version(db, ElectionResult)
+    version = latest.isoformat() if latest else None
+
+    entry = _tensor
+    if entry is not None and entry[0] == version:
+        return entry[1]
+
+    with _tensor_lock:
+        if _tensor is None or _tensor[0] != version:
+            _tensor = (version, SwingTensor.build(db))
+        return _tensor[1]
+
+
+def load_swing_tensor():
+    """Build the tensor at startup; a database error only delays it to the first request"""
+    db = SessionLocal()
+    try:
+        get_swing_tensor(db)
+    except Exception as e:
+        print(f"WARNING: Swing tensor not built at startup: {e}")
+    finally:
+        db.close()
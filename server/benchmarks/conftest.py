@@ -0,0 +1,62 @@
+"""
+Benchmark fixtures
+
+The app is pointed at a throwaway database before it is imported, so the
+suite never touches the configured DATABASE_URL. Set BENCH_DATABASE_URL to
+benchmark against Postgres instead of the default SQLite file.
+"""
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+BENCH_DATABASE_URL = os.environ.get(
+    "BENCH_DATABASE_URL",
+    f"sqlite:///{Path(tempfile.gettempdir()) / 'votelytics_bench.db'}",
+)
+BENCH_ADMIN_KEY = "benchmark-admin-key-0000"
+
+os.environ["DATABASE_URL"] = BENCH_DATABASE_URL
+os.environ["ENV"] = "development"
+os.environ["ADMIN_API_KEY"] = BENCH_ADMIN_KEY
+os.environ["ANALYTICS_BACKEND"] = "database"
+os.environ["CACHE_BACKEND"] = "memory"
+os.environ["RATE_LIMIT_STORAGE_URI"] = "memory://"
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.cache import get_cache  # noqa: E402
+from app.main import app  # noqa: E402
+from app.rate_limiters import limiter  # noqa: E402
+from benchmarks.synthetic_data import build_database  # noqa: E402
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("votelytics")
+    group.addoption("--bench-elections", type=int, default=3, help="Synthetic elections to generate")
+    group.addoption("--bench-candidates", type=int, default=15, help="Synthetic candidates per seat")
+
+
+@pytest.fixture(scope="session")
+def dataset(request):
+    """Row counts of the synthetic dataset, built once per session"""
+    return build_database(
+        BENCH_DATABASE_URL,
+        elections=request.config.getoption("--bench-elections"),
+        candidates=request.config.getoption("--bench-candidates"),
+    )
+
+
+@pytest.fixture(scope="session")
+def client(dataset):
+    """TestClient with rate limiting disabled (test_rate_limits re-enables it per test)"""
+    limiter.enabled = False
+    with TestClient(app) as test_client:
+        yield test_client
+    limiter.enabled = True
+
+
+def clear_response_caches():
+    """Drop in-process response caches so every round measures the query path"""
+    get_cache().clear()
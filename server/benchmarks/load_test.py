@@ -0,0 +1,314 @@
+"""
+Load test replaying the page mix of the Votelytics client
+
+Each virtual user repeatedly "opens" a page and issues the same API calls
+the React page makes on first load (no browser cache), in the same order
+and with the same parallelism. Latency is reported per endpoint and per
+page (p50/p95/p99), along with overall throughput.
+
+Usage:
+    # Start one uvicorn worker on a fresh synthetic dataset and run for 60s
+    poetry run python benchmarks/load_test.py --users 50 --duration 60
+
+    # Against an already running server (rate limits apply there)
+    poetry run python benchmarks/load_test.py --base-url http://localhost:8000 --no-server
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SERVER_DIR))
+
+# Share of page views per client page (election-night estimate)
+DEFAULT_MIX = {
+    "home": 30,
+    "constituency": 35,
+    "predictions": 20,
+    "swing": 8,
+    "bastion": 7,
+}
+
+PREDICTION_YEAR = 2026
+
+
+class Recorder:
+    """Latency samples per endpoint and per page"""
+
+    def __init__(self):
+        self.endpoints: Dict[str, List[float]] = defaultdict(list)
+        self.pages: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.recording = False
+
+    async def get(self, client: httpx.AsyncClient, name: str, url: str, **params) -> Optional[httpx.Response]:
+        start = time.perf_counter()
+        try:
+            response = await client.get(url, params=params or None)
+        except httpx.HTTPError:
+            response = None
+        elapsed = time.perf_counter() - start
+
+        if self.recording:
+            self.endpoints[name].append(elapsed)
+            if response is None or response.status_code >= 400:
+                self.errors[name] += 1
+        return response
+
+
+class Site:
+    """Page scenarios, mirroring client/src/pages/*.tsx"""
+
+    def __init__(self, recorder: Recorder, slugs: List[str], latest_election_id: int):
+        self.recorder = recorder
+        self.slugs = slugs
+        self.latest_election_id = latest_election_id
+
+    async def home(self, client, rnd):
+        get = self.recorder.get
+        await get(client, "/elections/", "/elections/", limit=100)
+        await asyncio.gather(
+            get(client, "/constituency/", "/constituency/", limit=500),
+            get(client, "/elections/{id}/results", f"/elections/{self.latest_election_id}/results",
+                winner_only="true", limit=500),
+        )
+
+    async def constituency(self, client, rnd):
+        get = self.recorder.get
+        # The navigation list and the page data load in parallel
+        await asyncio.gather(
+            get(client, "/constituency/", "/constituency/", limit=500),
+            get(client, "/constituency/slug/{slug}/page", f"/constituency/slug/{rnd.choice(self.slugs)}/page",
+                year=PREDICTION_YEAR),
+        )
+
+    async def predictions(self, client, rnd):
+        get = self.recorder.get
+        await asyncio.gather(
+            get(client, "/predictions/summary", "/predictions/summary", year=PREDICTION_YEAR),
+            get(client, "/predictions/", "/predictions/", year=PREDICTION_YEAR, limit=234),
+        )
+
+    async def swing(self, client, rnd):
+        await self.recorder.get(client, "/elections/swing-analysis/{from}/{to}", "/elections/swing-analysis/2016/2021")
+
+    async def bastion(self, client, rnd):
+        await self.recorder.get(client, "/elections/bastion-seats-three-elections",
+                                "/elections/bastion-seats-three-elections")
+
+
+async def virtual_user(site: Site, client: httpx.AsyncClient, mix: Dict[str, int], deadline: float, seed: int):
+    rnd = random.Random(seed)
+    pages = list(mix)
+    weights = [mix[page] for page in pages]
+
+    while time.perf_counter() < deadline:
+        page = rnd.choices(pages, weights)[0]
+        start = time.perf_counter()
+        await getattr(site, page)(client, rnd)
+        if site.recorder.recording:
+            site.recorder.pages[page].append(time.perf_counter() - start)
+
+
+async def discover(client: httpx.AsyncClient):
+    """Constituency slugs and the latest election, as the client would see them"""
+    constituencies = (await client.get("/constituency/", params={"limit": 500})).json()
+    elections = (await client.get("/elections/", params={"limit": 100})).json()
+    slugs = [c["slug"] for c in constituencies["constituencies"] if c.get("slug")]
+    latest = max(elections, key=lambda e: e["year"])
+    return slugs, latest["id"]
+
+
+async def run(api_url: str, users: int, duration: float, warmup: float, mix: Dict[str, int], seed: int):
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=users * 2, max_keepalive_connections=users * 2)
+
+    async with httpx.AsyncClient(base_url=api_url, timeout=30.0, limits=limits) as client:
+        slugs, latest_election_id = await discover(client)
+        site = Site(recorder, slugs, latest_election_id)
+
+        start = time.perf_counter()
+        deadline = start + warmup + duration
+        tasks = [
+            asyncio.create_task(virtual_user(site, client, mix, deadline, seed + i))
+            for i in range(users)
+        ]
+
+        await asyncio.sleep(warmup)
+        recorder.recording = True
+        measured_from = time.perf_counter()
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - measured_from
+
+    return recorder, elapsed
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def summarize(samples: Dict[str, List[float]], errors: Dict[str, int], elapsed: float) -> List[Dict]:
+    rows = []
+    for name, values in sorted(samples.items()):
+        rows.append({
+            "name": name,
+            "count": len(values),
+            "errors": errors.get(name, 0),
+            "rps": round(len(values) / elapsed, 2),
+            "p50_ms": round(percentile(values, 50) * 1000, 1),
+            "p95_ms": round(percentile(values, 95) * 1000, 1),
+            "p99_ms": round(percentile(values, 99) * 1000, 1),
+        })
+    return rows
+
+
+def print_table(title: str, rows: List[Dict]):
+    print(f"\n{title}")
+    print(f"  {'name':<44} {'count':>7} {'errors':>6} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for row in rows:
+        print(f"  {row['name']:<44} {row['count']:>7} {row['errors']:>6} {row['rps']:>8} "
+              f"{row['p50_ms']:>8} {row['p95_ms']:>8} {row['p99_ms']:>8}")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(database_url: str, port: int, workers: int) -> subprocess.Popen:
+    """Start uvicorn on the synthetic database, with rate limits out of the way"""
+    env = {
+        **os.environ,
+        "DATABASE_URL": database_url,
+        "ENV": "development",
+        "RATE_LIMIT_PUBLIC": "1000000/minute",
+        "RATE_LIMIT_HEAVY": "1000000/minute",
+        "RATE_LIMIT_EXPORT": "1000000/minute",
+        "RATE_LIMIT_BUDGET": "100000000/minute",
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app",
+         "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        cwd=SERVER_DIR,
+        env=env,
+    )
+
+    health_url = f"http://127.0.0.1:{port}/api/health"
+    for _ in range(100):
+        if process.poll() is not None:
+            raise RuntimeError("uvicorn exited during startup")
+        try:
+            if httpx.get(health_url, timeout=1.0).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+
+    process.terminate()
+    raise RuntimeError("uvicorn did not become healthy within 10s")
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    mix = {}
+    for part in value.split(","):
+        page, _, weight = part.partition("=")
+        if page.strip() not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"Unknown page '{page}'. Choose from: {', '.join(DEFAULT_MIX)}")
+        mix[page.strip()] = int(weight)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay the client's page mix against the API")
+    parser.add_argument("--base-url", help="Server root (default: start a local uvicorn worker)")
+    parser.add_argument("--no-server", action="store_true", help="Don't start uvicorn; use --base-url as is")
+    parser.add_argument("--database-url",
+                        default=f"sqlite:///{Path(tempfile.gettempdir()) / 'votelytics_load.db'}",
+                        help="Database for the local server")
+    parser.add_argument("--reuse-data", action="store_true",
+                        help="Use the existing data at --database-url instead of regenerating it")
+    parser.add_argument("--elections", type=int, default=3, help="Synthetic elections to generate")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for the local server")
+    parser.add_argument("--users", type=int, default=20, help="Concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="Unmeasured seconds before recording")
+    parser.add_argument("--mix", type=parse_mix, default=DEFAULT_MIX,
+                        help="Page weights, e.g. home=30,constituency=35,predictions=20,swing=8,bastion=7")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("VOTELYTICS LOAD TEST")
+    print("=" * 80)
+
+    server = None
+    base_url = args.base_url
+    if not args.no_server:
+        if not args.reuse_data:
+            # The app's engine is created on import, so point it at the synthetic DB first
+            os.environ["DATABASE_URL"] = args.database_url
+            from benchmarks.synthetic_data import build_database
+            counts = build_database(args.database_url, elections=args.elections)
+            print(f"  [OK] Synthetic data: {counts['election_results']} results, "
+                  f"{counts['predictions']} predictions")
+        port = free_port()
+        server = start_server(args.database_url, port, args.workers)
+        base_url = f"http://127.0.0.1:{port}"
+        print(f"  [OK] uvicorn started on {base_url} ({args.workers} worker(s))")
+    elif not base_url:
+        parser.error("--no-server needs --base-url")
+
+    print(f"  Users: {args.users} | Warmup: {args.warmup}s | Duration: {args.duration}s")
+    print(f"  Mix: {', '.join(f'{page}={weight}' for page, weight in args.mix.items())}")
+
+    try:
+        recorder, elapsed = asyncio.run(run(
+            base_url.rstrip("/") + "/api", args.users, args.duration, args.warmup, args.mix, args.seed
+        ))
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    endpoints = summarize(recorder.endpoints, recorder.errors, elapsed)
+    pages = summarize(recorder.pages, {}, elapsed)
+    total_requests = sum(row["count"] for row in endpoints)
+    total_errors = sum(row["errors"] for row in endpoints)
+
+    print_table("ENDPOINTS", endpoints)
+    print_table("PAGES", pages)
+    print(f"\n  Throughput: {total_requests / elapsed:.1f} req/s, "
+          f"{sum(row['count'] for row in pages) / elapsed:.1f} pages/s")
+    print(f"  Requests: {total_requests} | Errors: {total_errors}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({
+                "users": args.users,
+                "duration_s": round(elapsed, 2),
+                "requests_per_s": round(total_requests / elapsed, 2),
+                "errors": total_errors,
+                "endpoints": endpoints,
+                "pages": pages,
+            }, f, indent=2)
+        print(f"  [OK] Report written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
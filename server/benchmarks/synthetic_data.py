@@ -0,0 +1,342 @@
+"""
+Synthetic Tamil Nadu-shaped dataset for benchmarks and load tests
+
+234 constituencies with polygon boundaries, N assembly elections with ~15
+candidates per seat, the precomputed summary/rollup tables and two runs of
+2026 predictions. Generation is seeded, so every run produces identical data.
+
+Usage:
+    poetry run python benchmarks/synthetic_data.py --database-url sqlite:///benchmarks/bench.db
+"""
+import argparse
+import datetime
+import math
+import random
+import sys
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.database import Base
+from app.models import Constituency, CurrentPredictionRun, Election, ElectionResult, Prediction, PredictionRun
+from app.services.election_summaries import refresh_election_aggregates
+
+TOTAL_SEATS = 234
+
+DISTRICTS = [
+    "Ariyalur", "Chengalpattu", "Chennai", "Coimbatore", "Cuddalore", "Dharmapuri",
+    "Dindigul", "Erode", "Kallakurichi", "Kancheepuram", "Kanniyakumari", "Karur",
+    "Krishnagiri", "Madurai", "Mayiladuthurai", "Nagapattinam", "Namakkal", "Nilgiris",
+    "Perambalur", "Pudukkottai", "Ramanathapuram", "Ranipet", "Salem", "Sivaganga",
+    "Tenkasi", "Thanjavur", "Theni", "Thoothukudi", "Tiruchirappalli", "Tirunelveli",
+    "Tirupathur", "Tiruppur", "Tiruvallur", "Tiruvannamalai", "Tiruvarur", "Vellore",
+    "Viluppuram", "Virudhunagar",
+]
+REGIONS = ["North", "South", "Central", "West"]
+
+# Contesting alliances per election: alliance -> member parties (lead party first)
+ALLIANCES: Dict[int, Dict[str, List[str]]] = {
+    2011: {
+        "AIADMK+": ["AIADMK", "DMDK", "CPI(M)", "CPI"],
+        "DMK+": ["DMK", "INC", "PMK", "VCK"],
+    },
+    2016: {
+        "AIADMK+": ["AIADMK"],
+        "DMK+": ["DMK", "INC", "IUML"],
+        "PWF": ["DMDK", "MDMK", "VCK", "CPI"],
+    },
+    2021: {
+        "DMK+": ["DMK", "INC", "VCK", "CPI(M)", "CPI", "MDMK"],
+        "AIADMK+": ["AIADMK", "PMK", "BJP"],
+        "AMMK+": ["AMMK", "DMDK"],
+        "MNM+": ["MNM"],
+    },
+}
+MINOR_PARTIES = ["NTK", "BSP", "SDPI", "TNMMK", "PT", "BJP", "PMK", "AMMK"]
+
+
+def election_years(count: int) -> List[int]:
+    """The `count` most recent assembly election years, oldest first"""
+    return [2021 - 5 * i for i in reversed(range(count))]
+
+
+def alliances_for(year: int) -> Dict[str, List[str]]:
+    """Alliance line-up for a year (years without one reuse the nearest known year)"""
+    known = min(ALLIANCES, key=lambda y: abs(y - year))
+    return ALLIANCES[known]
+
+
+def district_for(ac_number: int) -> str:
+    """District of a synthetic seat (seats are numbered district by district)"""
+    return DISTRICTS[(ac_number - 1) * len(DISTRICTS) // TOTAL_SEATS]
+
+
+def seat_slug(ac_number: int) -> str:
+    return f"{district_for(ac_number).lower()}-{ac_number}"
+
+
+def seat_polygon(rnd: random.Random, ac_number: int, points: int) -> Dict:
+    """Irregular closed ring inside Tamil Nadu's bounding box, stored as a GeoJSON feature"""
+    row, col = divmod(ac_number - 1, 18)
+    center_lon = 76.4 + col * 0.21
+    center_lat = 8.2 + row * 0.40
+    ring = []
+    for i in range(points):
+        angle = 2 * math.pi * i / points
+        radius = 0.08 * (0.8 + 0.4 * rnd.random())
+        ring.append([round(center_lon + radius * math.cos(angle), 6),
+                     round(center_lat + radius * math.sin(angle), 6)])
+    ring.append(ring[0])
+
+    return {
+        "type": "Feature",
+        "properties": {"AC_NO": ac_number, "DIST_NAME": district_for(ac_number)},
+        "geometry": {"type": "Polygon", "coordinates": [ring]},
+    }
+
+
+def create_constituencies(db: Session, rnd: random.Random, polygon_points: int) -> List[Constituency]:
+    constituencies = []
+    for ac in range(1, TOTAL_SEATS + 1):
+        district = district_for(ac)
+        constituencies.append(Constituency(
+            ac_number=ac,
+            name=f"{district} {ac}",
+            code=f"TN{ac:03d}",
+            slug=seat_slug(ac),
+            district=district,
+            region=REGIONS[(ac - 1) * len(REGIONS) // TOTAL_SEATS],
+            population=rnd.randint(180000, 420000),
+            urban_population_pct=round(rnd.uniform(10, 95), 1),
+            literacy_rate=round(rnd.uniform(62, 92), 1),
+            geojson=seat_polygon(rnd, ac, polygon_points),
+        ))
+    db.add_all(constituencies)
+    db.flush()
+    return constituencies
+
+
+def seat_candidates(rnd: random.Random, year: int, region: str, candidates: int) -> List[tuple]:
+    """(party, alliance, strength) for every candidate in one seat"""
+    lineup = alliances_for(year)
+    rows = []
+    for index, (alliance, parties) in enumerate(lineup.items()):
+        # Lead party contests most seats; partners take the rest
+        party = parties[0] if rnd.random() < 0.7 or len(parties) == 1 else rnd.choice(parties[1:])
+        lean = 1.15 if (index + REGIONS.index(region)) % len(REGIONS) == 0 else 1.0
+        rows.append((party, alliance, rnd.uniform(0.6, 1.0) * lean / (1 + index * 0.35)))
+
+    allied = {party for parties in lineup.values() for party in parties}
+    for party in MINOR_PARTIES:
+        if len(rows) >= candidates:
+            break
+        if party not in allied and rnd.random() < 0.8:
+            rows.append((party, None, rnd.uniform(0.02, 0.12)))
+
+    while len(rows) < candidates:
+        rows.append(("IND", None, rnd.uniform(0.002, 0.02)))
+
+    return rows
+
+
+def create_election(
+    db: Session,
+    rnd: random.Random,
+    year: int,
+    constituencies: Sequence[Constituency],
+    candidates: int,
+) -> Election:
+    election = Election(
+        year=year,
+        name=f"Tamil Nadu Legislative Assembly Election {year}",
+        election_type="Assembly",
+        state="Tamil Nadu",
+        election_date=datetime.date(year, 5, 1),
+        total_seats=TOTAL_SEATS,
+    )
+    db.add(election)
+    db.flush()
+
+    rows = []
+    for constituency in constituencies:
+        electors = rnd.randint(200000, 320000)
+        polled = int(electors * rnd.uniform(0.65, 0.82))
+        contestants = seat_candidates(rnd, year, constituency.region, candidates)
+        strength_total = sum(strength for _, _, strength in contestants)
+
+        votes = [max(1, int(polled * strength / strength_total)) for _, _, strength in contestants]
+        order = sorted(range(len(contestants)), key=lambda i: votes[i], reverse=True)
+        margin = votes[order[0]] - votes[order[1]]
+        total = sum(votes)
+
+        for rank, i in enumerate(order, start=1):
+            party, alliance, _ = contestants[i]
+            postal = int(votes[i] * 0.01)
+            rows.append({
+                "election_id": election.id,
+                "constituency_id": constituency.id,
+                "year": year,
+                "ac_number": constituency.ac_number,
+                "ac_name": constituency.name,
+                "ac_slug": constituency.slug,
+                "total_electors": electors,
+                "candidate_name": f"Candidate {constituency.ac_number}-{year}-{rank}",
+                "sex": "F" if rnd.random() < 0.12 else "M",
+                "age": rnd.randint(28, 75),
+                "category": "SC" if constituency.ac_number % 5 == 0 else "GEN",
+                "party": party,
+                "symbol": party,
+                "alliance": alliance,
+                "general_votes": votes[i] - postal,
+                "postal_votes": postal,
+                "total_votes": votes[i],
+                "vote_share_pct": round(votes[i] / total * 100, 2),
+                "rank": rank,
+                "is_winner": 1 if rank == 1 else 0,
+                "margin": margin if rank <= 2 else None,
+                "margin_pct": round(margin / electors * 100, 2) if rank <= 2 else None,
+            })
+
+    db.bulk_insert_mappings(ElectionResult, rows)
+    db.commit()
+
+    refresh_election_aggregates(db, election.id, year)
+    return election
+
+
+def prediction_row(constituency_id: int, year: int, top: List[Dict], swing: float, run_id: int) -> Dict:
+    """Prediction for one seat from its top alliances (highest share first)"""
+    margin = top[0]["vote_share"] - top[1]["vote_share"]
+    probability = min(0.95, 0.5 + margin / 30)
+    return {
+        "run_id": run_id,
+        "constituency_id": constituency_id,
+        "predicted_year": year,
+        "predicted_winner_party": top[0]["lead_party"],
+        "confidence_level": "Safe" if margin > 10 else "Likely" if margin > 7 else "Lean" if margin > 4 else "Toss-up",
+        "win_probability": round(probability, 3),
+        "predicted_vote_share": top[0]["vote_share"],
+        "predicted_margin_pct": round(margin, 1),
+        "top_candidates": [{"party": t["alliance"], "vote_share": t["vote_share"]} for t in top],
+        "swing_from_last_election": swing,
+        "key_factors": "Synthetic prediction generated for benchmarking.",
+        "prediction_model": "Synthetic",
+        "extra_data": {
+            "predicted_winner_alliance": top[0]["alliance"],
+            "top_alliances": top,
+        },
+    }
+
+
+def create_predictions(db: Session, rnd: random.Random, constituencies: Sequence[Constituency], year: int = 2026):
+    """
+    Two prediction runs: an earlier one (shares moved by up to 3 points) and
+    the current one, which the API serves
+    """
+    earlier = PredictionRun(predicted_year=year, prediction_model="Synthetic", description="Earlier run")
+    current = PredictionRun(predicted_year=year, prediction_model="Synthetic", description="Current run")
+    db.add_all([earlier, current])
+    db.flush()
+
+    lineup = list(ALLIANCES[2021]) + ["NTK", "TVK"]
+    rows = []
+    for constituency in constituencies:
+        shares = sorted((rnd.uniform(5, 45) for _ in lineup), reverse=True)
+        scale = 95 / sum(shares)
+        contenders = rnd.sample(lineup, len(lineup))
+        top = [
+            {"alliance": alliance, "lead_party": alliance.rstrip("+"), "vote_share": round(share * scale, 1)}
+            for alliance, share in zip(contenders, shares)
+        ][:4]
+        rows.append(prediction_row(constituency.id, year, top, round(rnd.uniform(-6, 6), 1), current.id))
+
+    for row in list(rows):
+        moved = sorted(
+            ({**t, "vote_share": round(max(t["vote_share"] + rnd.uniform(-3, 3), 1.0), 1)}
+             for t in row["extra_data"]["top_alliances"]),
+            key=lambda t: -t["vote_share"],
+        )
+        rows.append(prediction_row(row["constituency_id"], year, moved, row["swing_from_last_election"], earlier.id))
+
+    db.bulk_insert_mappings(Prediction, rows)
+    db.add(CurrentPredictionRun(predicted_year=year, run_id=current.id))
+    db.commit()
+
+
+def generate_dataset(
+    db: Session,
+    elections: int = 3,
+    candidates: int = 15,
+    polygon_points: int = 200,
+    seed: int = 42,
+) -> Dict[str, int]:
+    """
+    Drop-in dataset for an empty schema
+
+    Returns:
+        Row counts per table
+    """
+    rnd = random.Random(seed)
+    constituencies = create_constituencies(db, rnd, polygon_points)
+    db.commit()
+
+    for year in election_years(elections):
+        create_election(db, rnd, year, constituencies, candidates)
+
+    create_predictions(db, rnd, constituencies)
+
+    return {
+        "constituencies": db.query(Constituency).count(),
+        "elections": db.query(Election).count(),
+        "election_results": db.query(ElectionResult).count(),
+        "predictions": db.query(Prediction).count(),
+    }
+
+
+def build_database(database_url: str, **options) -> Dict[str, int]:
+    """(Re)create every table at database_url and fill it with synthetic data"""
+    engine = create_engine(database_url)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    db = sessionmaker(bind=engine)()
+    try:
+        return generate_dataset(db, **options)
+    finally:
+        db.close()
+        engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic Tamil Nadu election dataset")
+    parser.add_argument("--database-url", default="sqlite:///benchmarks/bench.db",
+                        help="Target database (all tables are dropped and recreated)")
+    parser.add_argument("--elections", type=int, default=3, help="Number of assembly elections")
+    parser.add_argument("--candidates", type=int, default=15, help="Candidates per seat")
+    parser.add_argument("--polygon-points", type=int, default=200, help="Vertices per constituency boundary")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("GENERATING SYNTHETIC DATASET")
+    print("=" * 60)
+
+    counts = build_database(
+        args.database_url,
+        elections=args.elections,
+        candidates=args.candidates,
+        polygon_points=args.polygon_points,
+        seed=args.seed,
+    )
+
+    for table, count in counts.items():
+        print(f"  [OK] {table}: {count}")
+    print(f"\n[SUCCESS] Synthetic data written to {args.database_url}")
+
+
+if __name__ == "__main__":
+    main()
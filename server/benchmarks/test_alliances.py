@@ -0,0 +1,126 @@
+"""
+Alliance resolution on loader-shaped data
+
+The loaders (scripts/load_20XX_data.py) store election_results.alliance as
+NULL. The loader_shaped fixture clears the column on the synthetic dataset,
+so these tests check that alliance aggregates map parties to their alliances
+instead of treating every party as its own bloc.
+"""
+import pytest
+
+from app.database import SessionLocal
+from app.models.election import Election, ElectionResult
+from app.services import vote_matrix, vote_swing
+from app.services.alliances import party_bloc
+from app.services.election_summaries import seat_contributions
+from app.services.vote_matrix import build_party_matrix, build_results_matrix, recombine
+from benchmarks.conftest import clear_response_caches
+from benchmarks.synthetic_data import ALLIANCES
+
+
+def reset_preloaded():
+    """Drop response caches and the preloaded matrices built from election results"""
+    clear_response_caches()
+    vote_matrix._matrices.clear()
+    vote_matrix._party_matrices.clear()
+    vote_swing._tensor = None
+
+
+@pytest.fixture
+def loader_shaped(dataset):
+    """The synthetic dataset with every election_results.alliance set to NULL (restored afterwards)"""
+    db = SessionLocal()
+    saved = db.query(ElectionResult.id, ElectionResult.alliance).filter(ElectionResult.alliance.isnot(None)).all()
+    db.query(ElectionResult).update({ElectionResult.alliance: None}, synchronize_session=False)
+    db.commit()
+    reset_preloaded()
+    try:
+        yield db
+    finally:
+        db.rollback()
+        db.bulk_update_mappings(ElectionResult, [{"id": id_, "alliance": alliance} for id_, alliance in saved])
+        db.commit()
+        db.close()
+        reset_preloaded()
+
+
+def test_party_bloc():
+    assert party_bloc("INC", "DMK+") == "DMK+"
+    assert party_bloc("INC") == "DMK+"
+    assert party_bloc("ADMK") == "AIADMK+"
+    assert party_bloc("BJP", mapping={"BJP": "NDA"}) == "NDA"
+    # Parties outside every alliance and independents stay their own bloc
+    assert party_bloc("BSP") == "BSP"
+    assert party_bloc("IND") == "IND"
+
+
+def test_results_matrix_maps_parties_without_alliance(loader_shaped):
+    matrix = build_results_matrix(loader_shaped, 2021)
+
+    assert {"DMK+", "AIADMK+"} <= set(matrix.alliances)
+    assert not set(ALLIANCES[2021]["DMK+"]) & set(matrix.alliances)
+
+    # A seat's DMK+ share is the sum of its DMK+ parties' votes
+    seat = matrix.seats[0]
+    rows = loader_shaped.query(ElectionResult.party, ElectionResult.total_votes).filter(
+        ElectionResult.year == 2021, ElectionResult.constituency_id == seat["constituency_id"]
+    ).all()
+    total = sum(votes for _, votes in rows)
+    dmk = sum(votes for party, votes in rows if party_bloc(party) == "DMK+")
+    assert matrix.shares[0, matrix.alliances.index("DMK+")] == pytest.approx(dmk * 100 / total)
+
+
+def test_swing_scenario_on_loader_shaped_data(client, loader_shaped):
+    response = client.post("/api/predictions/scenario", json={"base": "results", "swing": {"DMK+": -3.0, "AIADMK+": 3.0}})
+    assert response.status_code == 200, response.text
+
+    alliances = {entry["alliance"]: entry for entry in response.json()["alliances"]}
+    assert "DMK" not in alliances and "AIADMK" not in alliances
+    assert alliances["AIADMK+"]["change"] > 0 > alliances["DMK+"]["change"]
+
+
+def test_recombination_on_loader_shaped_data(client, loader_shaped):
+    matrix = build_party_matrix(loader_shaped, 2021)
+    assert matrix.actual["alliances"].count("AIADMK+") == 1
+    assert "AIADMK" not in matrix.actual["alliances"] and "BJP" not in matrix.actual["alliances"]
+
+    # PMK joins the AIADMK+ bloc rather than forming a PMK-only one
+    pmk_votes = matrix.votes[matrix.party_index == matrix.party_column["PMK"]].sum()
+    assert pmk_votes > 0
+    scenario = recombine(matrix, {"PMK": "AIADMK+"})
+    actual = {entry["alliance"]: entry for entry in recombine(matrix, {})["alliances"]}
+    recombined = {entry["alliance"]: entry for entry in scenario["alliances"]}
+    assert "PMK" not in recombined
+    assert recombined["AIADMK+"]["votes"] == actual["AIADMK+"]["votes"] + int(pmk_votes)
+
+    response = client.post("/api/elections/2021/recombination", json={"mapping": {"PMK": "AIADMK+"}})
+    assert response.status_code == 200, response.text
+    assert {entry["alliance"] for entry in response.json()["alliances"]} == set(recombined)
+
+
+def test_vote_swing_on_loader_shaped_data(client, loader_shaped):
+    response = client.get("/api/elections/vote-swing/2016/2021")
+    assert response.status_code == 200, response.text
+    body = response.json()
+
+    # Butler swing between the two largest alliances, not the two largest parties
+    assert set(body["pair"]) == {"DMK+", "AIADMK+"}
+    statewide = body["statewide"]["share_change"]
+    assert "DMK+" in statewide and not set(ALLIANCES[2021]["DMK+"]) & set(statewide)
+
+
+def test_alliance_rollups_on_loader_shaped_data(loader_shaped):
+    election = loader_shaped.query(Election).filter(Election.year == 2021).one()
+    contributions = seat_contributions(loader_shaped, election.id)
+    state = {
+        (group_type, name): votes
+        for (scope, _, group_type, name), (_, _, votes) in contributions.items()
+        if scope == "state"
+    }
+
+    # Alliance rows total their member parties instead of copying each party row
+    members = [party for (group_type, party) in state if group_type == "party" and party_bloc(party) == "DMK+"]
+    assert {"DMK", "INC"} <= set(members)
+    assert state["alliance", "DMK+"] == sum(state["party", party] for party in members)
+    assert ("alliance", "DMK") not in state and ("alliance", "INC") not in state
+    assert sum(v for (t, _), v in state.items() if t == "alliance") == sum(v for (t, _), v in state.items() if t == "party")
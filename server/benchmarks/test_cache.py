@@ -0,0 +1,234 @@
+"""
+Response cache tests
+
+Run against both backends: InMemoryCache and RedisCache over an in-process
+fake Redis server (fakeredis), so no Redis is needed. Table data versions
+(app.http_cache) are kept in the same cache and tested here too.
+"""
+import asyncio
+import threading
+import time
+from datetime import timedelta
+from typing import List, Optional
+
+import pytest
+from fastapi import Depends, HTTPException, Request
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app import cache
+from app.cache import TAG_CONSTITUENCIES, InMemoryCache, RedisCache, cached, get_cache, set_cache
+from app.database import SessionLocal, get_db
+from app.http_cache import data_version
+from app.models.constituency import Constituency
+
+THREADS = 8
+
+
+@pytest.fixture(params=["memory", "redis"])
+def backend(request):
+    """A fresh backend installed as the process-wide cache for one test"""
+    if request.param == "redis":
+        fakeredis = pytest.importorskip("fakeredis")
+        new = RedisCache(fakeredis.FakeRedis())
+    else:
+        new = InMemoryCache()
+
+    previous = get_cache()
+    set_cache(new)
+    yield new
+    set_cache(previous)
+
+
+def run_concurrently(func, count: int = THREADS) -> List:
+    """Call func from count threads at once; returns results (or raised exceptions)"""
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def call(index):
+        barrier.wait()
+        try:
+            results[index] = func()
+        except Exception as e:
+            results[index] = e
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_get_set_and_ttl_expiry(backend):
+    backend.set("a", b"1", ttl=0.2)
+    backend.set("b", b"2", ttl=60)
+    assert backend.get("a") == b"1"
+    assert backend.get("missing") is None
+
+    time.sleep(0.3)
+    assert backend.get("a") is None
+    assert backend.get("b") == b"2"
+
+
+def test_invalidate_tags(backend):
+    backend.set("results:1", b"1", ttl=60, tags=["results"])
+    backend.set("results:2", b"2", ttl=60, tags=["results", "elections"])
+    backend.set("predictions:1", b"3", ttl=60, tags=["predictions"])
+
+    assert backend.invalidate_tags(["results"]) == 2
+    assert backend.get("results:1") is None
+    assert backend.get("results:2") is None
+    assert backend.get("predictions:1") == b"3"
+
+    # Tags of dropped entries no longer match anything
+    assert backend.invalidate_tags(["elections"]) == 0
+    assert backend.invalidate_tags(["predictions"]) == 1
+
+
+def test_lock_is_exclusive(backend):
+    token = backend.acquire_lock("key", ttl=60)
+    assert token
+    assert backend.acquire_lock("key", ttl=60) is None
+
+    backend.release_lock("key", "someone-else")
+    assert backend.acquire_lock("key", ttl=60) is None
+
+    backend.release_lock("key", token)
+    assert backend.acquire_lock("key", ttl=60)
+
+
+def test_concurrent_misses_compute_once(backend):
+    calls = []
+
+    @cached(ttl=60, tags=["results"])
+    def route(year: int, db: Session = Depends(get_db)):
+        calls.append(year)
+        time.sleep(0.2)
+        return {"year": year}
+
+    responses = run_concurrently(lambda: route(2021, db=None))
+
+    assert calls == [2021]
+    assert {response.body for response in responses} == {b'{"year":2021}'}
+    assert sorted(response.headers[cache.CACHE_HEADER] for response in responses) == ["HIT"] * (THREADS - 1) + ["MISS"]
+
+
+def test_concurrent_async_misses_compute_once(backend):
+    calls = []
+
+    @cached(ttl=60)
+    async def route(request: Request, slug: str):
+        calls.append(slug)
+        await asyncio.sleep(0.2)
+        return {"slug": slug}
+
+    async def burst():
+        return await asyncio.gather(*(route(None, "chennai") for _ in range(THREADS)))
+
+    responses = asyncio.run(burst())
+    assert calls == ["chennai"]
+    assert {response.body for response in responses} == {b'{"slug":"chennai"}'}
+
+
+def test_errors_are_not_cached_and_waiters_take_over(backend):
+    calls = []
+
+    @cached(ttl=60)
+    def route(year: int):
+        calls.append(year)
+        time.sleep(0.1)
+        raise HTTPException(status_code=404, detail="No results")
+
+    start = time.monotonic()
+    results = run_concurrently(lambda: route(1990), count=4)
+    elapsed = time.monotonic() - start
+
+    assert all(isinstance(result, HTTPException) and result.status_code == 404 for result in results)
+    assert backend.get(f"{route.__module__.rsplit('.', 1)[-1]}.route:{{\"year\":1990}}") is None
+    # Each waiter computes once the holder fails, instead of waiting out LOCK_WAIT
+    assert len(calls) == 4
+    assert elapsed < cache.LOCK_WAIT / 2
+
+
+def test_key_includes_list_and_body_arguments(backend):
+    from pydantic import BaseModel
+
+    class Scenario(BaseModel):
+        swing: dict
+
+    calls = []
+
+    @cached(ttl=60)
+    def route(parties: Optional[List[str]] = None, scenario: Optional[Scenario] = None):
+        calls.append((parties, scenario))
+        return {"calls": len(calls)}
+
+    assert route(["DMK"]).body != route(["AIADMK"]).body
+    assert route(["DMK"]).headers[cache.CACHE_HEADER] == "HIT"
+    assert route(scenario=Scenario(swing={"DMK+": 1})).body != route(scenario=Scenario(swing={"DMK+": -1})).body
+    assert len(calls) == 4
+
+
+def test_unsupported_key_argument_raises_at_decoration():
+    class Opaque:
+        pass
+
+    with pytest.raises(TypeError, match="cache key"):
+        @cached(ttl=60)
+        def route(value: Opaque):
+            return {}
+
+
+def test_memory_cache_is_bounded():
+    backend = InMemoryCache(max_entries=100)
+    for i in range(1000):
+        backend.set(f"page:{i}", b"x", ttl=60, tags=["constituencies", f"page:{i}"])
+
+    assert len(backend) <= 100
+    assert backend.get("page:999") == b"x"
+    assert backend.get("page:0") is None
+    # Tag sets only hold live entries
+    assert len(backend._tags["constituencies"]) == len(backend)
+    assert len(backend._tags) == len(backend) + 1
+
+
+def test_memory_cache_sweeps_expired_entries(monkeypatch):
+    backend = InMemoryCache(max_entries=100)
+    for i in range(50):
+        backend.set(f"cursor:{i}", b"x", ttl=0.01, tags=["results"])
+
+    time.sleep(0.05)
+    monkeypatch.setattr(cache, "MEMORY_SWEEP_INTERVAL", 0.0)
+    backend._next_sweep = 0.0
+    backend.set("fresh", b"y", ttl=60, tags=["results"])
+
+    assert len(backend) == 1
+    assert backend._tags["results"] == {"fresh"}
+
+
+def test_data_version_is_shared_and_tracks_deletes(backend, dataset):
+    db = SessionLocal()
+    try:
+        latest = db.query(func.max(Constituency.updated_at)).scalar()
+        extra = Constituency(ac_number=9999, name="Extra", code="AC9999", updated_at=latest - timedelta(days=1))
+        db.add(extra)
+        db.commit()
+
+        # Without stored state the version is the latest updated_at, whichever worker asks
+        version = data_version(db, Constituency)
+        assert version == latest.replace(tzinfo=version.tzinfo, microsecond=0)
+        set_cache(InMemoryCache())
+        assert data_version(db, Constituency) == version
+        set_cache(backend)
+
+        # A delete leaves updated_at alone; the stored row count moves the version past it
+        db.delete(extra)
+        db.commit()
+        backend.invalidate_tags([TAG_CONSTITUENCIES])
+        assert data_version(db, Constituency) == version + timedelta(seconds=1)
+        assert data_version(db, Constituency) == version + timedelta(seconds=1)
+    finally:
+        db.query(Constituency).filter(Constituency.ac_number == 9999).delete()
+        db.commit()
+        db.close()
@@ -0,0 +1,95 @@
+"""
+Constituency index refresh tests
+
+Writes here go straight to the database, like a data load: nothing calls
+refresh_constituency_index, so the index only changes because the tables'
+data versions moved once the cache tags are invalidated.
+"""
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import func
+
+from app.cache import invalidate, TAG_CONSTITUENCIES, TAG_RESULTS
+from app.database import SessionLocal
+from app.models.constituency import Constituency
+from app.models.election import ElectionResult
+from benchmarks.synthetic_data import district_for, seat_slug
+
+AC_NUMBER = 50
+NEW_NAME, NEW_SLUG = "Renamed Nagar", "renamed-nagar"
+
+
+@pytest.fixture
+def rename(client):
+    """Renames seat AC_NUMBER (optionally its election results too); restored afterwards"""
+    db = SessionLocal()
+    seat = db.query(Constituency).filter(Constituency.ac_number == AC_NUMBER).one()
+    saved_seat = {"id": seat.id, "name": seat.name, "slug": seat.slug, "updated_at": seat.updated_at}
+    results = db.query(ElectionResult).filter(ElectionResult.constituency_id == seat.id)
+    saved_results = [
+        {"id": id_, "ac_name": ac_name, "ac_slug": ac_slug, "updated_at": updated_at}
+        for id_, ac_name, ac_slug, updated_at in results.with_entities(
+            ElectionResult.id, ElectionResult.ac_name, ElectionResult.ac_slug, ElectionResult.updated_at
+        )
+    ]
+
+    def apply(name: str, slug: str, results_too: bool = False):
+        # One second past both tables' versions, so the bump doesn't depend on the clock
+        latest = max(
+            db.query(func.max(Constituency.updated_at)).scalar(),
+            db.query(func.max(ElectionResult.updated_at)).scalar(),
+        )
+        bumped = latest + timedelta(seconds=1)
+        db.query(Constituency).filter(Constituency.id == seat.id).update(
+            {Constituency.name: name, Constituency.slug: slug, Constituency.updated_at: bumped},
+            synchronize_session=False,
+        )
+        if results_too:
+            results.update(
+                {ElectionResult.ac_name: name, ElectionResult.ac_slug: slug, ElectionResult.updated_at: bumped},
+                synchronize_session=False,
+            )
+        db.commit()
+        invalidate(TAG_CONSTITUENCIES, TAG_RESULTS)
+
+    try:
+        yield apply
+    finally:
+        db.rollback()
+        db.bulk_update_mappings(Constituency, [saved_seat])
+        db.bulk_update_mappings(ElectionResult, saved_results)
+        db.commit()
+        db.close()
+        invalidate(TAG_CONSTITUENCIES, TAG_RESULTS)
+
+
+def lookup(client, slug: str):
+    response = client.get(f"/api/constituency/slug/{slug}")
+    assert response.status_code in (200, 404), response.text
+    return response.json()["ac_number"] if response.status_code == 200 else None
+
+
+def test_rename_replaces_slug(client, rename):
+    old_slug = seat_slug(AC_NUMBER)
+    assert lookup(client, old_slug) == AC_NUMBER
+
+    # A corrected spelling: the old one appears nowhere any more
+    rename(NEW_NAME, NEW_SLUG, results_too=True)
+
+    assert lookup(client, NEW_SLUG) == AC_NUMBER
+    assert lookup(client, "Renamed_Nagar.") == AC_NUMBER
+    assert lookup(client, old_slug) is None
+    assert lookup(client, f"{district_for(AC_NUMBER)} {AC_NUMBER}") is None
+
+
+def test_rename_keeps_historic_aliases(client, rename):
+    # A renamed seat: past results still carry the old name and slug
+    rename(NEW_NAME, NEW_SLUG)
+
+    assert lookup(client, NEW_SLUG) == AC_NUMBER
+    assert lookup(client, seat_slug(AC_NUMBER)) == AC_NUMBER
+    # Malformed spellings of the old name and slug normalize onto the aliases
+    assert lookup(client, f"{district_for(AC_NUMBER)}  {AC_NUMBER}".upper()) == AC_NUMBER
+    assert lookup(client, f"({seat_slug(AC_NUMBER)})--.") == AC_NUMBER
+    assert lookup(client, "renamed-nagar-old") is None
@@ -0,0 +1,302 @@
+"""
+Endpoint benchmarks
+
+Every GET route registered by the API routers has a case below;
+test_every_route_is_benchmarked fails when a new route is added without one,
+and each case checks the response shape and row counts against the dataset.
+Constituency 100 and the 2016 -> 2021 pair are used wherever a route needs ids.
+"""
+import base64
+import itertools
+import json
+
+import pytest
+from fastapi.routing import APIRoute
+
+from app.api.pagination import NEXT_CURSOR_HEADER
+from app.database import SessionLocal
+from app.main import app
+from app.models.election import ElectionResult
+from benchmarks.conftest import BENCH_ADMIN_KEY, clear_response_caches
+from benchmarks.synthetic_data import REGIONS, district_for, seat_slug
+
+
+def rows(body, count, **equal):
+    """Assert body is a list of count rows whose fields match equal"""
+    assert isinstance(body, list), body
+    assert len(body) == count, f"expected {count} rows, got {len(body)}"
+    for row in body:
+        assert {key: row[key] for key in equal} == equal, row
+    return True
+
+
+def fields(body, **lengths):
+    """Assert body is an object whose lists have the given lengths"""
+    assert isinstance(body, dict), body
+    for key, length in lengths.items():
+        assert len(body[key]) == length, f"{key}: expected {length} entries, got {len(body[key])}"
+    return True
+
+
+def seat_page(body, size):
+    return rows(body["constituencies"], 100) and body["total"] == size["seats"] and body["next_cursor"]
+
+
+def seat(body, size):
+    return body["ac_number"] == 100 and body["geojson"]["geometry"]
+
+
+def seat_page_bundle(body, size):
+    return (
+        seat(body["constituency"], size)
+        and fields(body, history=size["elections"])
+        and body["prediction"]["constituency_id"] == body["constituency"]["id"]
+    )
+
+
+def district(body, size):
+    return rows(body, len(body), district=district_for(100)) and 100 in {row["ac_number"] for row in body}
+
+
+def result_page(body, size, **equal):
+    return rows(body, min(500, size["seats"] * size["candidates"]), **equal)
+
+
+def ndjson_export(body, size):
+    return rows([json.loads(line) for line in body.splitlines()], size["seats"] * size["candidates"], year=2021)
+
+
+def grouped_history(body, size):
+    return (
+        rows(body, size["elections"], candidate_count=size["candidates"])
+        and all(len(group["results"]) == 5 for group in body)
+    )
+
+
+def seat_distribution(body, size):
+    point_seats = sum(alliance["point_seats"] for alliance in body["alliances"])
+    return body["total_seats"] == point_seats + body["toss_up"] == size["seats"]
+
+
+def simulation(body, size):
+    return (
+        body["simulations"] == 20000
+        and body["total_seats"] == size["seats"]
+        and all(
+            sum(alliance["seat_distribution"].values()) == pytest.approx(1.0, abs=1e-3)
+            for alliance in body["alliances"]
+        )
+    )
+
+
+# (route template, concrete URL, check(body, size)); body is the decoded JSON
+# (NDJSON as text), size the synthetic dataset's seats, elections and
+# candidates per seat. A check returns a truthy value (or fails an assert) when
+# the response has the expected shape, so a broken endpoint cannot pass as a
+# fast 200.
+ENDPOINT_CASES = [
+    ("/api/constituency/", "/api/constituency/?limit=100", seat_page),
+    ("/api/constituency/{constituency_id}", "/api/constituency/100", seat),
+    ("/api/constituency/code/{code}", "/api/constituency/code/TN100", seat),
+    ("/api/constituency/slug/{slug}", f"/api/constituency/slug/{seat_slug(100)}", seat),
+    ("/api/constituency/slug/{slug}/page", f"/api/constituency/slug/{seat_slug(100)}/page", seat_page_bundle),
+    ("/api/constituency/district/{district}", f"/api/constituency/district/{district_for(100)}", district),
+    ("/api/elections/", "/api/elections/", lambda body, size: rows(body, size["elections"])),
+    ("/api/elections/bastion-seats-three-elections", "/api/elections/bastion-seats-three-elections",
+     lambda body, size: fields(body, years=3, bastion_seats=body["total_bastion_seats"])),
+    ("/api/elections/{year}/party-summary", "/api/elections/2021/party-summary?group_by=alliance&scope=district",
+     lambda body, size: (body["year"], body["group_by"], body["scope"]) == (2021, "alliance", "district") and body["results"]),
+    ("/api/elections/{election_id}", "/api/elections/3", lambda body, size: body["id"] == 3),
+    ("/api/elections/{election_id}/results", "/api/elections/3/results?limit=500",
+     lambda body, size: result_page(body, size, election_id=3)),
+    ("/api/elections/constituency/{constituency_id}/history", "/api/elections/constituency/100/history",
+     lambda body, size: rows(body, size["elections"] * size["candidates"], ac_number=100)),
+    ("/api/elections/constituency/{constituency_id}/history/grouped",
+     "/api/elections/constituency/100/history/grouped?top_n=5", grouped_history),
+    ("/api/elections/constituency/{constituency_id}/summary", "/api/elections/constituency/100/summary",
+     lambda body, size: rows(body, size["elections"], ac_number=100)),
+    ("/api/elections/year/{year}/results", "/api/elections/year/2021/results?limit=500",
+     lambda body, size: result_page(body, size, year=2021)),
+    ("/api/elections/year/{year}/export", "/api/elections/year/2021/export?format=ndjson", ndjson_export),
+    ("/api/elections/bastion-seats/{from_year}/{to_year}", "/api/elections/bastion-seats/2016/2021",
+     lambda body, size: body["statistics"]["total_constituencies_analyzed"] == size["seats"]
+     and fields(body, bastion_seats=body["total_bastion_seats"])),
+    ("/api/elections/swing-analysis/{from_year}/{to_year}", "/api/elections/swing-analysis/2016/2021",
+     lambda body, size: body["statistics"]["total_constituencies_compared"] == size["seats"]
+     and fields(body, flips=body["total_flips"])),
+    ("/api/elections/vote-swing/{from_year}/{to_year}", "/api/elections/vote-swing/2016/2021",
+     lambda body, size: body["seats_compared"] == size["seats"] and fields(body, seats=size["seats"])),
+    ("/api/predictions/summary", "/api/predictions/summary",
+     lambda body, size: body["total_seats"] == body["predictions_complete"] == size["seats"]),
+    ("/api/predictions/", "/api/predictions/",
+     lambda body, size: body["total"] == size["seats"] and fields(body, predictions=size["seats"])),
+    ("/api/predictions/constituency/{constituency_id}", "/api/predictions/constituency/100",
+     lambda body, size: body["prediction"]["constituency"]["ac_number"] == 100),
+    ("/api/predictions/regional-summary", "/api/predictions/regional-summary",
+     lambda body, size: set(body["regions"]) == set(REGIONS)
+     and sum(region["total"] for region in body["regions"].values()) == size["seats"]),
+    ("/api/predictions/seat-distribution", "/api/predictions/seat-distribution", seat_distribution),
+    ("/api/predictions/simulation", "/api/predictions/simulation?simulations=20000", simulation),
+    ("/api/predictions/comparison", "/api/predictions/comparison",
+     lambda body, size: (body["from_year"], body["to_year"]) == (2021, 2026) and body["comparison"]),
+    ("/api/predictions/runs", "/api/predictions/runs", lambda body, size: fields(body, runs=2)),
+    ("/api/predictions/runs/{from_run_id}/diff/{to_run_id}", "/api/predictions/runs/1/diff/2",
+     lambda body, size: body["seats_compared"] == size["seats"]),
+]
+
+ROUTER_PREFIXES = ("/api/constituency", "/api/elections", "/api/predictions")
+
+
+def test_every_route_is_benchmarked():
+    routes = {
+        (method, route.path)
+        for route in app.routes
+        if isinstance(route, APIRoute) and route.path.startswith(ROUTER_PREFIXES)
+        for method in route.methods
+    }
+    covered = {("GET", template) for template, *_ in ENDPOINT_CASES}
+    covered.update({
+        ("POST", "/api/constituency/"),
+        ("POST", "/api/predictions/scenario"),
+        ("POST", "/api/elections/{year}/recombination"),
+    })
+
+    assert routes - covered == set(), "Add a benchmark case for the new route(s)"
+
+
+@pytest.fixture(scope="session")
+def size(request, dataset):
+    """Seats, elections and candidates per seat of the synthetic dataset"""
+    return {
+        "seats": dataset["constituencies"],
+        "elections": dataset["elections"],
+        "candidates": request.config.getoption("--bench-candidates"),
+    }
+
+
+@pytest.mark.parametrize("url, check", [case[1:] for case in ENDPOINT_CASES], ids=[case[0] for case in ENDPOINT_CASES])
+def test_get_endpoint(benchmark, client, size, url, check):
+    def request():
+        clear_response_caches()
+        return client.get(url)
+
+    response = benchmark(request)
+    assert response.status_code == 200, response.text
+    ndjson = response.headers["content-type"].startswith("application/x-ndjson")
+    assert check(response.text if ndjson else response.json(), size), response.text[:500]
+
+
+def result_pages(client, url, limit, stop=None):
+    """Follow X-Next-Cursor from url; returns the rows of every page and the page count"""
+    found, pages, cursor = [], 0, None
+    while True:
+        params = {"limit": limit, "cursor": cursor} if cursor else {"limit": limit}
+        response = client.get(url, params=params)
+        assert response.status_code == 200, response.text
+        found.extend(response.json())
+        pages += 1
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor or (stop and stop(found)):
+            return found, pages
+
+
+def test_result_pages_cover_every_row_once(client, size):
+    total = size["seats"] * size["candidates"]
+    # The largest page size dividing the rows evenly makes the last page full
+    full = max(limit for limit in range(1, 501) if total % limit == 0)
+
+    for limit in (500, full):
+        clear_response_caches()
+        found, pages = result_pages(client, "/api/elections/year/2021/results", limit)
+        # The last page carries no continuation token, even when it is full
+        assert pages == -(-total // limit)
+        assert len(found) == len({row["id"] for row in found}) == total
+
+
+@pytest.fixture
+def unranked_seat(dataset):
+    """Seat 1's 2021 candidates below rank 2 stored unranked (NULL), restored afterwards"""
+    db = SessionLocal()
+    query = db.query(ElectionResult).filter(
+        ElectionResult.year == 2021, ElectionResult.ac_number == 1, ElectionResult.rank > 2
+    )
+    saved = [{"id": id_, "rank": rank} for id_, rank in query.with_entities(ElectionResult.id, ElectionResult.rank)]
+    query.update({ElectionResult.rank: None}, synchronize_session=False)
+    db.commit()
+    clear_response_caches()
+    try:
+        yield [row["id"] for row in saved]
+    finally:
+        db.bulk_update_mappings(ElectionResult, saved)
+        db.commit()
+        db.close()
+        clear_response_caches()
+
+
+def test_result_pages_split_unranked_ties(client, unranked_seat):
+    # Pages of 5 put boundaries inside the run of rows sharing COALESCE(rank, UNRANKED)
+    found, _ = result_pages(
+        client, "/api/elections/year/2021/results", 5, stop=lambda found: found[-1]["ac_number"] > 1
+    )
+    seat = [row for row in found if row["ac_number"] == 1]
+
+    assert [row["rank"] for row in seat[:2]] == [1, 2]
+    # Ties are ordered by id, each row exactly once
+    assert [row["id"] for row in seat[2:]] == sorted(unranked_seat)
+    assert all(row["rank"] is None for row in seat[2:])
+
+
+@pytest.mark.parametrize("url, keys", [
+    ("/api/elections/year/2021/results", {"ac_number": 1, "rank": 1, "id": 1}),
+    ("/api/constituency/", {"ac_number": 1}),
+])
+def test_invalid_cursor_is_rejected(client, url, keys):
+    def token(value):
+        return base64.urlsafe_b64encode(json.dumps(value).encode()).decode().rstrip("=")
+
+    cursors = [
+        "not a cursor!",  # not base64
+        token(keys)[:-3] + "~~~",  # corrupted base64
+        base64.urlsafe_b64encode(b"\xff\xfe").decode(),  # not UTF-8 JSON
+        token([1, 2, 3]),  # not an object
+        token({**keys, "extra": 1}),  # keys from another endpoint
+        token({**keys, "ac_number": "1; DROP"}),  # tampered value types
+        token({**keys, "ac_number": True}),
+    ]
+    for cursor in cursors:
+        response = client.get(url, params={"cursor": cursor})
+        assert response.status_code == 400, (cursor, response.text)
+
+
+def test_create_constituency(benchmark, client):
+    ac_numbers = itertools.count(1001)
+
+    def request():
+        ac_number = next(ac_numbers)
+        return client.post(
+            "/api/constituency/",
+            json={"ac_number": ac_number, "name": f"Benchmark {ac_number}", "code": f"BM{ac_number}"},
+            headers={"X-Admin-Key": BENCH_ADMIN_KEY},
+        )
+
+    response = benchmark(request)
+    assert response.status_code == 201, response.text
+
+
+@pytest.mark.parametrize("base", ["results", "predictions"])
+def test_swing_scenario(benchmark, client, base):
+    scenario = {
+        "base": base,
+        "swing": {"DMK+": -3.0, "AIADMK+": 3.0},
+        "regional_swing": {"South": {"AIADMK+": 1.5}},
+    }
+
+    response = benchmark(client.post, "/api/predictions/scenario", json=scenario)
+    assert response.status_code == 200, response.text
+
+
+def test_alliance_recombination(benchmark, client):
+    scenario = {"mapping": {"PMK": "DMK+", "BJP": "NTK"}}
+
+    response = benchmark(client.post, "/api/elections/2021/recombination", json=scenario)
+    assert response.status_code == 200, response.text
@@ -0,0 +1,61 @@
+"""
+Seat projection benchmarks
+
+Times the Monte Carlo engine (app/services/seat_projection.py) on the
+synthetic 2026 predictions at the endpoint's default of 100k simulations,
+and the exact Poisson-binomial distribution.
+"""
+import pytest
+
+from app.api.predictions import reclassify_confidence_level
+from app.database import SessionLocal
+from app.services.seat_projection import (
+    MAJORITY, exact_seat_distribution, load_prediction_matrix, seat_win_probabilities, simulate_seats
+)
+
+
+@pytest.fixture(scope="module")
+def matrix(dataset):
+    db = SessionLocal()
+    try:
+        matrix, _ = load_prediction_matrix(db, 2026)
+    finally:
+        db.close()
+    return matrix
+
+
+def test_simulation_is_consistent(matrix):
+    projection = simulate_seats(matrix, 10_000)
+    total_seats = len(matrix.seats)
+
+    assert sum(entry["mean_seats"] for entry in projection["alliances"]) == pytest.approx(total_seats, abs=0.1)
+    for entry in projection["alliances"]:
+        assert sum(entry["seat_distribution"].values()) == pytest.approx(1.0, abs=1e-3)
+        assert entry["p05_seats"] <= entry["median_seats"] <= entry["p95_seats"]
+    assert projection["majority_mark"] == MAJORITY
+    # Same seed, same answer (responses are cached and compared across workers)
+    assert simulate_seats(matrix, 10_000) == projection
+
+
+def test_simulation_100k(benchmark, matrix):
+    benchmark.group = "seat-projection"
+    benchmark.pedantic(simulate_seats, args=(matrix, 100_000), rounds=5, iterations=1)
+
+
+def test_exact_distribution_is_consistent(matrix):
+    result = exact_seat_distribution(matrix, reclassify_confidence_level)
+    probabilities = seat_win_probabilities(matrix)
+
+    for i, alliance in enumerate(matrix.alliances):
+        entry = next(entry for entry in result["alliances"] if entry["alliance"] == alliance)
+        distribution = entry["seat_distribution"]
+        assert sum(distribution.values()) == pytest.approx(1.0, abs=1e-4)
+        # Mean of the Poisson-binomial is the sum of the seat probabilities
+        mean = sum(int(seats) * probability for seats, probability in distribution.items())
+        assert mean == pytest.approx(probabilities[:, i].sum(), abs=0.01)
+    assert result["toss_up"] + sum(entry["point_seats"] for entry in result["alliances"]) == len(matrix.seats)
+
+
+def test_exact_distribution(benchmark, matrix):
+    benchmark.group = "seat-distribution"
+    benchmark(exact_seat_distribution, matrix, reclassify_confidence_level)
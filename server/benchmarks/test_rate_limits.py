@@ -0,0 +1,115 @@
+"""
+Rate limiting tests
+
+The client fixture turns the limiter off for the rest of the suite; the
+rate_limited fixture turns it back on (over the memory:// storage set in
+conftest) for one test at a time, starting from empty counters.
+"""
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from slowapi import _rate_limit_exceeded_handler
+from slowapi.errors import RateLimitExceeded
+
+from app.config import settings
+from app.rate_limiters import COST_ANALYSIS, COST_LOOKUP, budget, client_address, limiter
+
+EXPORT_LIMIT = int(settings.RATE_LIMIT_EXPORT.split("/")[0])
+
+
+@pytest.fixture
+def rate_limited():
+    """The app-wide limiter, enabled with empty counters for one test"""
+    enabled = limiter.enabled
+    limiter.reset()
+    limiter.enabled = True
+    yield limiter
+    limiter.enabled = enabled
+    limiter.reset()
+
+
+@pytest.fixture(scope="module")
+def limited_client():
+    """Routes on the app-wide limiter, with RATE_LIMIT_BUDGET at 10/minute"""
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(settings, "RATE_LIMIT_BUDGET", "10/minute")
+        app = FastAPI()
+        app.state.limiter = limiter
+        app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+
+        @app.get("/analysis")
+        @budget(COST_ANALYSIS)
+        async def analysis(request: Request):
+            return {}
+
+        @app.get("/lookup")
+        @budget(COST_LOOKUP)
+        async def lookup(request: Request):
+            return {}
+
+        @app.get("/limited")
+        @limiter.limit("2/minute")
+        @budget(COST_LOOKUP)
+        async def limited(request: Request):
+            return {}
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def statuses(client, path: str, count: int, headers=None):
+    return [client.get(path, headers=headers).status_code for _ in range(count)]
+
+
+def test_budget_is_spent_by_route_cost(rate_limited, limited_client):
+    assert statuses(limited_client, "/analysis", 4) == [200, 200, 429, 429]
+    # The budget is shared: cheaper routes are refused too once it is spent
+    assert limited_client.get("/lookup").status_code == 429
+
+
+def test_per_route_limit(rate_limited, limited_client):
+    assert statuses(limited_client, "/limited", 3) == [200, 200, 429]
+    # Only that route is exhausted; the shared budget has room left
+    assert statuses(limited_client, "/lookup", 2) == [200, 200]
+
+
+def test_forged_forwarded_for_does_not_reset_budget(rate_limited, limited_client):
+    # The test client's peer isn't a trusted proxy, so the header is ignored
+    codes = [
+        limited_client.get("/analysis", headers={"X-Forwarded-For": f"203.0.113.{i}"}).status_code
+        for i in range(3)
+    ]
+    assert codes == [200, 200, 429]
+
+
+def test_export_route_limit(rate_limited, client):
+    codes = statuses(client, "/api/elections/year/2021/export", EXPORT_LIMIT + 1)
+    assert codes == [200] * EXPORT_LIMIT + [429]
+
+
+def make_request(peer: str, forwarded=None) -> Request:
+    headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers, "client": (peer, 40000)})
+
+
+@pytest.mark.parametrize(
+    "peer, forwarded, expected",
+    [
+        # Untrusted peers are the client, whatever they send
+        ("198.51.100.7", None, "198.51.100.7"),
+        ("198.51.100.7", "203.0.113.5", "198.51.100.7"),
+        # Behind a trusted proxy, the last hop it didn't append itself
+        ("10.0.0.2", "203.0.113.5", "203.0.113.5"),
+        # Read right to left: a forged leftmost entry is skipped
+        ("10.0.0.2", "1.2.3.4, 203.0.113.5", "203.0.113.5"),
+        # Trusted proxies in the chain are skipped
+        ("10.0.0.2", "1.2.3.4, 203.0.113.5, 10.0.0.9", "203.0.113.5"),
+        # Garbage isn't a trusted address, so it is the client key
+        ("10.0.0.2", "203.0.113.5, not-an-ip", "not-an-ip"),
+        # Only trusted hops: the original client
+        ("10.0.0.2", "10.0.0.8, 10.0.0.9", "10.0.0.8"),
+    ],
+)
+def test_client_address(monkeypatch, peer, forwarded, expected):
+    monkeypatch.setattr(settings, "TRUSTED_PROXIES", "10.0.0.0/8, ::1")
+    assert client_address(make_request(peer, forwarded)) == expected
@@ -0,0 +1,72 @@
+"""
+Serialization benchmarks
+
+Compares FastAPI's response_model path (validate ORM rows with
+from_attributes, dump to JSON-able data, encode) with the trusted fast path
+in app.serialization (map rows by field list, encode with orjson) on the two
+largest payloads: a 500-row result page and all constituencies with polygons.
+
+Compare within each group, e.g.:
+    poetry run pytest benchmarks/test_serialization.py --benchmark-group-by=group
+"""
+import json
+from typing import List
+
+import pytest
+from pydantic import TypeAdapter
+
+from app.database import SessionLocal
+from app.models.constituency import Constituency
+from app.models.election import ElectionResult
+from app.schemas.constituency import ConstituencyResponse
+from app.schemas.election import ElectionResultResponse
+from app.serialization import fast_json
+
+
+def response_model_json(rows, model) -> bytes:
+    """What FastAPI does for response_model + JSONResponse"""
+    adapter = TypeAdapter(model)
+    content = adapter.dump_python(adapter.validate_python(rows, from_attributes=True), mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+@pytest.fixture(scope="module")
+def payloads(dataset):
+    db = SessionLocal()
+    try:
+        results = db.query(ElectionResult).order_by(ElectionResult.id).limit(500).all()
+        constituencies = db.query(Constituency).order_by(Constituency.ac_number).all()
+        # Load every attribute before the session closes
+        for row in results + constituencies:
+            db.refresh(row)
+        db.expunge_all()
+    finally:
+        db.close()
+
+    return {
+        "results-500": (results, List[ElectionResultResponse]),
+        "constituencies-polygons": (constituencies, List[ConstituencyResponse]),
+    }
+
+
+PAYLOADS = ["results-500", "constituencies-polygons"]
+
+
+@pytest.mark.parametrize("payload", PAYLOADS)
+def test_fast_path_matches_response_model(payloads, payload):
+    rows, model = payloads[payload]
+    assert json.loads(fast_json(rows, model)) == json.loads(response_model_json(rows, model))
+
+
+@pytest.mark.parametrize("payload", PAYLOADS)
+def test_response_model(benchmark, payloads, payload):
+    rows, model = payloads[payload]
+    benchmark.group = payload
+    benchmark(response_model_json, rows, model)
+
+
+@pytest.mark.parametrize("payload", PAYLOADS)
+def test_fast_path(benchmark, payloads, payload):
+    rows, model = payloads[payload]
+    benchmark.group = payload
+    benchmark(fast_json, rows, model)
@@ -0,0 +1,35 @@
+"""
+Migration script to add composite indexes used by keyset pagination
+(election results ordered by constituency number and rank within an election,
+results without a rank last)
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import text
+from app.database import engine
+from app.models.election import UNRANKED
+
+
+def add_pagination_indexes():
+    """Create composite indexes for cursor-based pagination"""
+
+    with engine.connect() as conn:
+        print(f"Creating index on election_results (election_id, ac_number, COALESCE(rank, {UNRANKED}), id)...")
+        conn.execute(text(f"""
+            CREATE INDEX IF NOT EXISTS ix_election_results_election_ac_rank_key
+            ON election_results (election_id, ac_number, COALESCE(rank, {UNRANKED}), id);
+        """))
+        # Superseded by the index above (pagination sorts NULL ranks as UNRANKED)
+        conn.execute(text("DROP INDEX IF EXISTS ix_election_results_election_ac_rank;"))
+        conn.commit()
+        print("[OK] Index created")
+
+    print("\n[SUCCESS] Pagination indexes created!")
+
+
+if __name__ == "__main__":
+    add_pagination_indexes()
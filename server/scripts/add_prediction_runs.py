@@ -0,0 +1,119 @@
+"""
+Migration script to version predictions as runs
+
+Creates prediction_runs and current_prediction_runs, adds predictions.run_id
+with a unique (run_id, constituency_id) index, and moves the existing
+predictions of each year into a run that becomes the current one. Should a
+constituency have several predictions for a year, the newest goes into
+that run and older ones into unpublished runs, so nothing is dropped.
+Also adds prediction_runs.extra_data to tables created before it existed.
+Safe to run again.
+"""
+import sys
+from collections import Counter
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import inspect, text
+from app.database import engine, SessionLocal
+from app.models.prediction import CurrentPredictionRun, Prediction, PredictionRun
+from app.services.prediction_runs import create_run, publish_run
+
+
+def add_prediction_runs():
+    """Create the run tables and move unversioned predictions into runs"""
+
+    print("Step 1: Creating prediction_runs and current_prediction_runs...")
+    PredictionRun.metadata.create_all(
+        bind=engine,
+        tables=[PredictionRun.__table__, CurrentPredictionRun.__table__],
+    )
+    print("[OK] Tables ready")
+
+    run_columns = {column["name"] for column in inspect(engine).get_columns("prediction_runs")}
+    if "extra_data" not in run_columns:
+        with engine.connect() as conn:
+            conn.execute(text("ALTER TABLE prediction_runs ADD COLUMN extra_data JSON;"))
+            conn.commit()
+        print("[OK] Added prediction_runs.extra_data")
+    print("\nStep 2: Adding run_id to predictions...")
+    columns = {column["name"] for column in inspect(engine).get_columns("predictions")}
+    with engine.connect() as conn:
+        if "run_id" in columns:
+            print("[OK] Column already exists, skipping...")
+        else:
+            conn.execute(text("""
+                ALTER TABLE predictions
+                ADD COLUMN run_id INTEGER REFERENCES prediction_runs(id);
+            """))
+            conn.commit()
+            print("[OK] Column added")
+
+    print("\nStep 3: Moving existing predictions into runs...")
+    db = SessionLocal()
+    try:
+        years = [
+            year for (year,) in db.query(Prediction.predicted_year)
+            .filter(Prediction.run_id.is_(None))
+            .distinct()
+            .order_by(Prediction.predicted_year)
+        ]
+        if not years:
+            print("[OK] No unversioned predictions")
+
+        for year in years:
+            rows = (
+                db.query(Prediction.id, Prediction.constituency_id, Prediction.prediction_model)
+                .filter(Prediction.predicted_year == year, Prediction.run_id.is_(None))
+                .order_by(Prediction.id.desc())
+                .all()
+            )
+
+            # Newest prediction per constituency first, then older duplicates
+            layers = []
+            seen = Counter()
+            for prediction_id, constituency_id, _ in rows:
+                depth = seen[constituency_id]
+                seen[constituency_id] += 1
+                if depth == len(layers):
+                    layers.append([])
+                layers[depth].append(prediction_id)
+
+            model = Counter(model for *_, model in rows).most_common(1)[0][0]
+            for depth, prediction_ids in reversed(list(enumerate(layers))):
+                description = "Predictions from before runs were versioned"
+                if depth:
+                    description += f" (superseded duplicates, level {depth})"
+                run = create_run(db, year, model, description)
+                db.query(Prediction).filter(Prediction.id.in_(prediction_ids)).update(
+                    {Prediction.run_id: run.id}, synchronize_session=False
+                )
+                db.commit()
+                print(f"[OK] {year}: {len(prediction_ids)} predictions -> run {run.id}")
+
+                if depth == 0 and db.get(CurrentPredictionRun, year) is None:
+                    publish_run(db, run)
+                    print(f"[OK] {year}: run {run.id} published")
+    finally:
+        db.close()
+
+    print("\nStep 4: Creating indexes on predictions.run_id...")
+    with engine.connect() as conn:
+        conn.execute(text("""
+            CREATE INDEX IF NOT EXISTS ix_predictions_run_id
+            ON predictions (run_id);
+        """))
+        conn.execute(text("""
+            CREATE UNIQUE INDEX IF NOT EXISTS uq_prediction_run_constituency
+            ON predictions (run_id, constituency_id);
+        """))
+        conn.commit()
+        print("[OK] Indexes created")
+
+    print("\n[SUCCESS] Predictions are versioned as runs!")
+
+
+if __name__ == "__main__":
+    add_prediction_runs()
@@ -0,0 +1,169 @@
+"""
+Backtest a prediction method against a past election
+Predicts e.g. 2021 from the 2016/2011 results with the same historical data
+and prompt as generate_predictions.py, then scores it against the actual
+winners (accuracy, Brier score, calibration per confidence bucket).
+
+    python scripts/backtest_predictions.py                       # offline stub, seconds
+    python scripts/backtest_predictions.py --method baseline     # offline regression baseline
+    python scripts/backtest_predictions.py --method llm --workers 8 --output backtest_2021.json
+    python scripts/backtest_predictions.py --method ensemble --workers 8   # ChatGPT + baseline
+    python scripts/backtest_predictions.py --replay backtest_2021.json   # re-score saved predictions
+
+Confidence buckets are the ones the site shows (reclassify_confidence_level).
+"""
+import sys
+import json
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import settings
+from app.database import SessionLocal
+from app.api.predictions import reclassify_confidence_level
+from app.services.baseline_predictor import DEFAULT_ENSEMBLE_WEIGHT
+from app.services.prediction_generator import PromptUsage, format_usage, load_trends_summary
+from app.services.backtest import (
+    baseline_method,
+    ensemble_method,
+    llm_method,
+    prepare_cases,
+    run_predictions,
+    score_backtest,
+    stub_prediction,
+    target_alliance_config,
+)
+
+
+def parse_ids(value):
+    return [int(x.strip()) for x in value.split(",") if x.strip()]
+
+
+def print_scores(scores):
+    def fmt(value):
+        return "-" if value is None else f"{value:.3f}"
+
+    print(f"Seats scored:    {scores['seats']} ({len(scores['failed'])} failed)")
+    print(f"Seat accuracy:   {fmt(scores['accuracy'])}")
+    print(f"Brier score:     {fmt(scores['brier_score'])}")
+    print(f"Vote share MAE:  {fmt(scores['vote_share_mae'])} points")
+    print()
+    print(f"{'Confidence':<10} {'Seats':>6} {'Mean p':>8} {'Accuracy':>9} {'Brier':>7}")
+    for bucket in scores["calibration"]:
+        print(f"{bucket['confidence_level']:<10} {bucket['seats']:>6} {fmt(bucket['mean_win_probability']):>8} "
+              f"{fmt(bucket['accuracy']):>9} {fmt(bucket['brier_score']):>7}")
+    print()
+    print(f"{'Alliance':<12} {'Predicted':>9} {'Actual':>7}")
+    for alliance, seats in sorted(scores["seat_totals"].items(), key=lambda item: -item[1]["actual"]):
+        print(f"{alliance:<12} {seats['predicted']:>9} {seats['actual']:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest election predictions against a past election")
+    parser.add_argument("--target-year", type=int, default=2021, help="Election to predict (default: 2021)")
+    parser.add_argument("--history-years", default="2016,2011",
+                        help="Comma-separated elections the prediction may use (default: 2016,2011)")
+    parser.add_argument("--method", choices=["stub", "baseline", "llm", "ensemble"], default="stub",
+                        help="stub: offline, carries the latest result forward; baseline: offline ridge "
+                             "regression; llm: ChatGPT; ensemble: ChatGPT and baseline combined (default: stub)")
+    parser.add_argument("--model", default="gpt-5", help="OpenAI model for --method llm/ensemble (default: gpt-5)")
+    parser.add_argument("--ensemble-weight", type=float, default=DEFAULT_ENSEMBLE_WEIGHT,
+                        help=f"Weight of ChatGPT in --method ensemble (default: {DEFAULT_ENSEMBLE_WEIGHT})")
+    parser.add_argument("--workers", type=int, default=1, help="Parallel prediction calls (default: 1)")
+    parser.add_argument("--trends-file", help="Trends summary for the prompt (default: none, history only)")
+    parser.add_argument("--constituency-ids", type=parse_ids, help="Comma-separated constituency IDs")
+    parser.add_argument("--output", help="Write scores and per-seat predictions to this JSON file")
+    parser.add_argument("--replay", help="Re-score the predictions in a previous --output file")
+    args = parser.parse_args()
+
+    history_years = parse_ids(args.history_years)
+    if args.target_year in history_years or any(year > args.target_year for year in history_years):
+        print("[ERROR] History years must be before the target year")
+        sys.exit(1)
+
+    if args.method in ("llm", "ensemble") and not args.replay and not settings.OPENAI_API_KEY:
+        print("[ERROR] OPENAI_API_KEY not found in environment!")
+        sys.exit(1)
+
+    print("=" * 80)
+    print(f"BACKTEST: {args.target_year} FROM {', '.join(map(str, history_years))}")
+    print("=" * 80)
+
+    db = SessionLocal()
+    try:
+        alliance_config = target_alliance_config(db, args.target_year)
+        if not alliance_config["party_mapping"]:
+            print(f"[ERROR] No {args.target_year} results in the database")
+            sys.exit(1)
+        trends_summary = load_trends_summary(args.trends_file) if args.trends_file else None
+        cases = prepare_cases(
+            db,
+            target_year=args.target_year,
+            history_years=history_years,
+            alliance_config=alliance_config,
+            trends_summary=trends_summary,
+            constituency_ids=args.constituency_ids,
+        )
+    finally:
+        db.close()
+    print(f"[OK] {len(cases)} constituencies, {len(alliance_config['alliances'])} blocs in {args.target_year}")
+
+    if args.replay:
+        with open(args.replay) as f:
+            saved = json.load(f)
+        method = saved.get("method", "replay")
+        by_id = {entry["constituency_id"]: entry["prediction"] for entry in saved["predictions"]}
+        predictions = [by_id.get(case["constituency"]["id"]) for case in cases]
+        print(f"[OK] Replaying {len(by_id)} predictions from {args.replay}")
+    else:
+        method = args.method
+        usage = PromptUsage()
+        start = datetime.now()
+        if method == "stub":
+            predict = stub_prediction
+        elif method == "baseline":
+            predict = baseline_method(cases, args.target_year, alliance_config)
+        elif method == "ensemble":
+            predict = ensemble_method(cases, args.target_year, alliance_config, settings.OPENAI_API_KEY,
+                                      args.model, args.ensemble_weight, usage=usage)
+        else:
+            predict = llm_method(settings.OPENAI_API_KEY, args.model, usage=usage)
+        predictions = run_predictions(cases, predict, workers=args.workers)
+        elapsed = (datetime.now() - start).total_seconds()
+        print(f"[OK] Predicted with {method} in {elapsed:.1f}s ({args.workers} workers)")
+        if usage.calls:
+            print(format_usage(usage.summary()))
+    print()
+
+    scores = score_backtest(cases, predictions, classify=reclassify_confidence_level)
+    print_scores(scores)
+
+    if args.output:
+        report = {
+            "target_year": args.target_year,
+            "history_years": history_years,
+            "method": method,
+            "model": args.model if method in ("llm", "ensemble") else None,
+            "usage": saved.get("usage") if args.replay else (usage.summary() if usage.calls else None),
+            "created_at": datetime.now().isoformat(),
+            "scores": scores,
+            "predictions": [
+                {
+                    "constituency_id": case["constituency"]["id"],
+                    "name": case["constituency"]["name"],
+                    "actual_winner_alliance": case["actual"]["winner_alliance"],
+                    "prediction": prediction,
+                }
+                for case, prediction in zip(cases, predictions)
+            ],
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n[OK] Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
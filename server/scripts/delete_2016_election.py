@@ -5,7 +5,7 @@ import sys
 sys.path.insert(0, '.')
 
 from app.database import SessionLocal
-from app.models.election import Election, ElectionResult
+from app.models.election import Election, ElectionResult, ConstituencyResultSummary, PartyVoteRollup
 
 db = SessionLocal()
 
@@ -28,6 +28,14 @@ try:
             db.query(ElectionResult).filter(ElectionResult.year == 2016).delete()
             print(f"Deleted {result_count} results")
 
+        # Delete precomputed summaries and rollups
+        db.query(ConstituencyResultSummary).filter(
+            ConstituencyResultSummary.election_id == election_2016.id
+        ).delete()
+        db.query(PartyVoteRollup).filter(
+            PartyVoteRollup.election_id == election_2016.id
+        ).delete()
+
         # Delete election
         db.delete(election_2016)
         db.commit()
@@ -3,7 +3,7 @@ import sys
 sys.path.insert(0, '.')
 
 from app.database import SessionLocal
-from app.models.election import Election, ElectionResult
+from app.models.election import Election, ElectionResult, ConstituencyResultSummary, PartyVoteRollup
 
 db = SessionLocal()
 
@@ -16,6 +16,14 @@ try:
             ElectionResult.election_id == election_2016.id
         ).delete()
 
+        # Delete precomputed summaries and rollups
+        db.query(ConstituencyResultSummary).filter(
+            ConstituencyResultSummary.election_id == election_2016.id
+        ).delete()
+        db.query(PartyVoteRollup).filter(
+            PartyVoteRollup.election_id == election_2016.id
+        ).delete()
+
         # Delete election record
         db.delete(election_2016)
         db.commit()
@@ -15,6 +15,10 @@ try:
         result1 = conn.execute(text("DELETE FROM election_results WHERE year = 2016"))
         print(f"Deleted {result1.rowcount} election results")
 
+        # Delete precomputed summaries and rollups
+        conn.execute(text("DELETE FROM constituency_result_summaries WHERE year = 2016"))
+        conn.execute(text("DELETE FROM party_vote_rollups WHERE year = 2016"))
+
         # Delete election
         result2 = conn.execute(text("DELETE FROM elections WHERE year = 2016"))
         print(f"Deleted {result2.rowcount} election records")
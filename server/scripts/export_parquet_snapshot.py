@@ -0,0 +1,107 @@
+"""
+Export a Parquet snapshot of the database for offline analytics
+Writes one directory per table, partitioned by election year where it applies:
+
+    snapshots/latest/
+        constituencies/part-0.parquet
+        elections/part-0.parquet
+        election_results/year=2021/part-0.parquet
+        predictions/predicted_year=2026/part-0.parquet
+        ...
+        manifest.json
+
+Serve the analytic endpoints from it with ANALYTICS_BACKEND=duckdb and
+ANALYTICS_SNAPSHOT_DIR=<output dir>. Requires pyarrow (poetry install -E arrow).
+"""
+import sys
+import json
+import shutil
+import argparse
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import inspect
+
+from app.database import engine
+from app.analytics import SNAPSHOT_TABLES
+
+
+def serialize_json_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Store dict/list columns (extra_data, geojson, ...) as JSON text"""
+    for column in df.columns:
+        if df[column].map(lambda v: isinstance(v, (dict, list))).any():
+            df[column] = df[column].map(lambda v: json.dumps(v) if v is not None else None)
+    return df
+
+
+def export_table(table: str, partition_col, output_dir: Path) -> int:
+    """Export one table to Parquet, returning the number of rows written"""
+    df = pd.read_sql_table(table, engine)
+    df = serialize_json_columns(df)
+
+    table_dir = output_dir / table
+    arrow_table = pa.Table.from_pandas(df, preserve_index=False)
+
+    if partition_col:
+        pq.write_to_dataset(
+            arrow_table,
+            root_path=str(table_dir),
+            partition_cols=[partition_col],
+            basename_template="part-{i}.parquet",
+        )
+    else:
+        table_dir.mkdir(parents=True, exist_ok=True)
+        pq.write_table(arrow_table, str(table_dir / "part-0.parquet"))
+
+    return len(df)
+
+
+def export_snapshot(output_dir: Path):
+    """Export all snapshot tables into output_dir (replacing its contents)"""
+    print("=" * 80)
+    print("EXPORTING PARQUET SNAPSHOT")
+    print("=" * 80)
+    print(f"Output: {output_dir}")
+
+    if output_dir.exists():
+        shutil.rmtree(output_dir)
+    output_dir.mkdir(parents=True)
+
+    existing_tables = set(inspect(engine).get_table_names())
+    manifest = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "tables": {},
+    }
+
+    for table, partition_col in SNAPSHOT_TABLES.items():
+        if table not in existing_tables:
+            print(f"  [SKIP] {table} (table not found)")
+            continue
+
+        rows = export_table(table, partition_col, output_dir)
+        manifest["tables"][table] = {"rows": rows, "partitioned_by": partition_col}
+        print(f"  [OK] {table}: {rows:,} rows")
+
+    with open(output_dir / "manifest.json", "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    print("\n[SUCCESS] Snapshot exported")
+    print(f"Serve it with: ANALYTICS_BACKEND=duckdb ANALYTICS_SNAPSHOT_DIR={output_dir}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export a Parquet snapshot for offline analytics")
+    parser.add_argument(
+        "--output",
+        default="snapshots/latest",
+        help="Output directory (default: snapshots/latest)"
+    )
+    args = parser.parse_args()
+
+    export_snapshot(Path(args.output))
@@ -17,6 +17,12 @@ def force_drop_tables():
         print("\nDropping predictions table...")
         conn.execute(text('DROP TABLE IF EXISTS predictions CASCADE;'))
 
+        print("Dropping party_vote_rollups table...")
+        conn.execute(text('DROP TABLE IF EXISTS party_vote_rollups CASCADE;'))
+
+        print("Dropping constituency_result_summaries table...")
+        conn.execute(text('DROP TABLE IF EXISTS constituency_result_summaries CASCADE;'))
+
         print("Dropping election_results table...")
         conn.execute(text('DROP TABLE IF EXISTS election_results CASCADE;'))
 
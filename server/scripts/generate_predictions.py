@@ -1,6 +1,8 @@
 """
 Script to generate 2026 election predictions for all Tamil Nadu constituencies
-Uses ChatGPT to analyze historical data and current trends
+Uses ChatGPT to analyze historical data and current trends, or the local
+regression baseline (--method baseline, seconds for the whole state, no API key),
+or both combined per seat (--method ensemble)
 """
 import sys
 import os
@@ -17,30 +19,44 @@ from app.database import SessionLocal
 from app.models.constituency import Constituency
 from app.models.prediction import Prediction
 from app.config import settings
+from app.cache import invalidate, TAG_PREDICTIONS
 from app.services.prediction_generator import (
+    PromptUsage,
+    build_prompt_prefix,
+    format_usage,
     load_alliance_config,
     load_trends_summary,
-    generate_prediction_for_constituency
+    generate_prediction_for_constituency,
+    prompt_cache_key
+)
+from app.services.baseline_predictor import (
+    DEFAULT_ENSEMBLE_WEIGHT,
+    ENSEMBLE_MODEL,
+    ensemble_prediction,
+    generate_baseline_predictions
+)
+from app.services.prediction_runs import (
+    copy_predictions,
+    create_run,
+    current_run_id,
+    publish_run,
+    served_predictions
 )
 
 
 def get_constituencies_needing_predictions(db: Session, year: int, constituency_ids=None):
-    """Get constituencies that need predictions"""
+    """Get constituencies (all, or the given ones) without a prediction in the current run"""
+    existing_predictions = db.query(Prediction.constituency_id).filter(
+        served_predictions(db, year)
+    ).all()
+    existing_ids = [p[0] for p in existing_predictions]
+
+    query = db.query(Constituency).filter(
+        ~Constituency.id.in_(existing_ids) if existing_ids else True
+    )
     if constituency_ids:
-        # Specific constituencies
-        return db.query(Constituency).filter(
-            Constituency.id.in_(constituency_ids)
-        ).order_by(Constituency.ac_number).all()
-    else:
-        # All constituencies without predictions for this year
-        existing_predictions = db.query(Prediction.constituency_id).filter(
-            Prediction.predicted_year == year
-        ).all()
-        existing_ids = [p[0] for p in existing_predictions]
-
-        return db.query(Constituency).filter(
-            ~Constituency.id.in_(existing_ids) if existing_ids else True
-        ).order_by(Constituency.ac_number).all()
+        query = query.filter(Constituency.id.in_(constituency_ids))
+    return query.order_by(Constituency.ac_number).all()
 
 
 def save_prediction(db: Session, prediction_data: dict) -> bool:
@@ -55,6 +71,7 @@ def save_prediction(db: Session, prediction_data: dict) -> bool:
             })
 
         prediction = Prediction(
+            run_id=prediction_data.get('run_id'),
             constituency_id=prediction_data['constituency_id'],
             predicted_year=prediction_data['predicted_year'],
             predicted_winner_party=prediction_data['predicted_winner_party'],
@@ -76,6 +93,9 @@ def save_prediction(db: Session, prediction_data: dict) -> bool:
 
         db.add(prediction)
         db.commit()
+
+        # Drop cached prediction responses (shared with the API when CACHE_BACKEND=redis)
+        invalidate(TAG_PREDICTIONS)
         return True
 
     except Exception as e:
@@ -88,6 +108,23 @@ def main():
     parser = argparse.ArgumentParser(
         description="Generate 2026 election predictions using ChatGPT"
     )
+    parser.add_argument(
+        "--method",
+        choices=["chatgpt", "baseline", "ensemble"],
+        default="chatgpt",
+        help="chatgpt, the local regression baseline, or both combined per seat (default: chatgpt)"
+    )
+    parser.add_argument(
+        "--ensemble-weight",
+        type=float,
+        default=DEFAULT_ENSEMBLE_WEIGHT,
+        help=f"Weight of ChatGPT in --method ensemble, the baseline gets the rest (default: {DEFAULT_ENSEMBLE_WEIGHT})"
+    )
+    parser.add_argument(
+        "--baseline-fallback",
+        action="store_true",
+        help="Save the baseline prediction where ChatGPT fails"
+    )
     parser.add_argument(
         "--model",
         default="gpt-5",
@@ -129,13 +166,26 @@ def main():
     parser.add_argument(
         "--overwrite",
         action="store_true",
-        help="Overwrite existing predictions"
+        help="Regenerate the given constituencies even if the current run has them (earlier runs are kept)"
+    )
+    parser.add_argument(
+        "--description",
+        help="Description of this prediction run"
+    )
+    parser.add_argument(
+        "--no-publish",
+        action="store_true",
+        help="Leave the new run unpublished (compare it with /api/predictions/runs/{id}/diff/{id} first)"
     )
 
     args = parser.parse_args()
 
+    use_chatgpt = args.method in ("chatgpt", "ensemble")
+    use_baseline = args.method in ("baseline", "ensemble") or args.baseline_fallback
+    run_model = {"chatgpt": "ChatGPT", "baseline": "Baseline", "ensemble": ENSEMBLE_MODEL}[args.method]
+
     # Validate API key
-    if not settings.OPENAI_API_KEY:
+    if use_chatgpt and not settings.OPENAI_API_KEY:
         print("ERROR: OPENAI_API_KEY not found in environment!")
         sys.exit(1)
 
@@ -143,9 +193,10 @@ def main():
     print("Loading configuration files...")
     try:
         alliance_config = load_alliance_config(args.alliance_config)
-        trends_summary = load_trends_summary(args.trends_file)
         print(f"Loaded alliance config: {len(alliance_config['alliances'])} alliances")
-        print(f"Loaded trends summary: {len(trends_summary)} characters")
+        if use_chatgpt:
+            trends_summary = load_trends_summary(args.trends_file)
+            print(f"Loaded trends summary: {len(trends_summary)} characters")
     except Exception as e:
         print(f"ERROR loading config files: {e}")
         sys.exit(1)
@@ -154,7 +205,11 @@ def main():
     print("=" * 80)
     print("ELECTION PREDICTION GENERATION SCRIPT")
     print("=" * 80)
-    print(f"Model: {args.model}")
+    print(f"Model: {args.model if use_chatgpt else 'Baseline'}")
+    if args.method == "ensemble":
+        print(f"Ensemble: ChatGPT {args.ensemble_weight:.0%} + Baseline {1 - args.ensemble_weight:.0%}")
+    if use_chatgpt and args.baseline_fallback:
+        print("Fallback: Baseline")
     print(f"Predicted Year: {args.year}")
     print(f"Delay: {args.delay}s between calls")
     print(f"Batch size: {args.batch_size}")
@@ -177,21 +232,11 @@ def main():
         # Get constituencies to process
         print("Checking database...")
         if args.overwrite and constituency_ids:
-            # Delete existing predictions
-            db.query(Prediction).filter(
-                Prediction.constituency_id.in_(constituency_ids),
-                Prediction.predicted_year == args.year
-            ).delete()
-            db.commit()
-            constituencies = db.query(Constituency).filter(
-                Constituency.id.in_(constituency_ids)
-            ).order_by(Constituency.ac_number).all()
-        elif constituency_ids:
             constituencies = db.query(Constituency).filter(
                 Constituency.id.in_(constituency_ids)
             ).order_by(Constituency.ac_number).all()
         else:
-            constituencies = get_constituencies_needing_predictions(db, args.year)
+            constituencies = get_constituencies_needing_predictions(db, args.year, constituency_ids)
 
         total_count = len(constituencies)
         print(f"Found {total_count} constituencies to process")
@@ -207,12 +252,36 @@ def main():
             print("Aborted.")
             return
 
+        # The baseline is fitted on the whole state at once
+        baseline_predictions = {}
+        if use_baseline:
+            print("\nFitting baseline...", end=" ", flush=True)
+            fit_start = datetime.now()
+            baseline_predictions = generate_baseline_predictions(db, alliance_config, target_year=args.year)
+            print(f"{len(baseline_predictions)} constituencies in {(datetime.now() - fit_start).total_seconds():.1f}s")
+
+        # New run: seats not regenerated are copied from the current run
+        base_run_id = current_run_id(db, args.year)
+        run = create_run(
+            db,
+            args.year,
+            prediction_model=run_model,
+            description=args.description or (args.model if use_chatgpt else None),
+            base_run_id=base_run_id
+        )
+        print(f"\nPrediction run {run.id}", end="")
+        if base_run_id:
+            copied = copy_predictions(db, base_run_id, run.id, [c.id for c in constituencies])
+            print(f" (copied {copied} predictions from run {base_run_id})", end="")
+        print()
+
         print("\nStarting prediction generation...\n")
 
         # Track stats
         successful = 0
         failed = 0
         failed_list = []
+        usage = PromptUsage()
         start_time = datetime.now()
 
         # Process each constituency
@@ -222,16 +291,28 @@ def main():
             print(f"    Generating prediction...", end=" ", flush=True)
 
             # Generate prediction
-            prediction_data = generate_prediction_for_constituency(
-                constituency_id=constituency.id,
-                db=db,
-                alliance_config=alliance_config,
-                trends_summary=trends_summary,
-                api_key=settings.OPENAI_API_KEY,
-                model=args.model
-            )
+            if use_chatgpt:
+                prediction_data = generate_prediction_for_constituency(
+                    constituency_id=constituency.id,
+                    db=db,
+                    alliance_config=alliance_config,
+                    trends_summary=trends_summary,
+                    api_key=settings.OPENAI_API_KEY,
+                    model=args.model,
+                    usage=usage
+                )
+                baseline_prediction = baseline_predictions.get(constituency.id)
+                if prediction_data and baseline_prediction and args.method == "ensemble":
+                    prediction_data = ensemble_prediction(prediction_data, baseline_prediction, args.ensemble_weight)
+                elif not prediction_data and args.baseline_fallback:
+                    prediction_data = baseline_predictions.get(constituency.id)
+                    if prediction_data:
+                        print("ChatGPT failed, using baseline...", end=" ")
+            else:
+                prediction_data = baseline_predictions.get(constituency.id)
 
             if prediction_data:
+                prediction_data['run_id'] = run.id
                 print("✓")
                 print(f"    Winner: {prediction_data['predicted_winner_alliance']} ({prediction_data['predicted_winner_party']})")
                 print(f"    Confidence: {prediction_data['confidence_level']} ({prediction_data['win_probability']:.0%})")
@@ -261,11 +342,11 @@ def main():
             print()
 
             # Delay
-            if idx < total_count:
+            if use_chatgpt and idx < total_count:
                 time.sleep(args.delay)
 
             # Batch pause
-            if idx % args.batch_size == 0 and idx < total_count:
+            if use_chatgpt and idx % args.batch_size == 0 and idx < total_count:
                 print(f"--- Batch complete ({idx}/{total_count}). Pausing 2s ---")
                 print()
                 time.sleep(2)
@@ -283,6 +364,28 @@ def main():
         print(f"Time taken: {duration}")
         print()
 
+        # Token and latency accounting, kept on the run
+        if usage.calls:
+            print(format_usage(usage.summary()))
+            print()
+            run.extra_data = {
+                "model": args.model,
+                "prompt_cache_key": prompt_cache_key(build_prompt_prefix(alliance_config, trends_summary)),
+                "usage": usage.summary()
+            }
+            db.commit()
+
+        if args.no_publish:
+            print(f"Run {run.id} not published")
+        elif successful:
+            publish_run(db, run)
+            print(f"Run {run.id} published as the current {args.year} run")
+        else:
+            print(f"Run {run.id} not published (no new predictions)")
+        if base_run_id:
+            print(f"Compare: /api/predictions/runs/{base_run_id}/diff/{run.id}")
+        print()
+
         if failed_list:
             print("Failed constituencies:")
             for item in failed_list:
@@ -6,7 +6,15 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from app.database import engine, Base
-from app.models import Constituency, Election, ElectionResult, Candidate, Prediction
+from app.models import (
+    Constituency,
+    Election,
+    ElectionResult,
+    ConstituencyResultSummary,
+    PartyVoteRollup,
+    Candidate,
+    Prediction,
+)
 
 
 def init_database():
@@ -22,6 +30,8 @@ def init_database():
         print("  - constituencies")
         print("  - elections")
         print("  - election_results")
+        print("  - constituency_result_summaries")
+        print("  - party_vote_rollups")
         print("  - candidates")
         print("  - predictions")
 
@@ -11,6 +11,7 @@ from sqlalchemy import func
 from app.database import SessionLocal
 from app.models.constituency import Constituency
 from app.models.election import Election, ElectionResult
+from app.services.election_summaries import refresh_election_aggregates
 
 
 def clean_candidate_name(name):
@@ -169,6 +170,9 @@ def load_2011_data():
 
         print(f"  [SUCCESS] All election results inserted")
 
+        summary_count, rollup_count = refresh_election_aggregates(db, election.id, election.year)
+        print(f"  [SUCCESS] Refreshed {summary_count} constituency summaries and {rollup_count} party rollups")
+
         # Step 4: Verify data
         print("\n" + "=" * 80)
         print("VERIFYING DATA")
@@ -11,6 +11,7 @@ import pandas as pd
 from app.database import SessionLocal
 from app.models.constituency import Constituency
 from app.models.election import Election, ElectionResult
+from app.services.election_summaries import refresh_election_aggregates
 
 
 def clean_candidate_name(name):
@@ -167,6 +168,9 @@ def load_2016_data():
 
         print(f"  [OK] Inserted {len(results_to_insert)} election results")
 
+        summary_count, rollup_count = refresh_election_aggregates(db, election.id, election.year)
+        print(f"  [OK] Refreshed {summary_count} constituency summaries and {rollup_count} party rollups")
+
         # Step 4: Verify data
         print("\n[5/5] Verifying data...")
         election_count = db.query(Election).count()
@@ -1,6 +1,14 @@
 """
 Script to populate constituency demographics using LLM
 Fetches population, urban %, and literacy rate for all 234 Tamil Nadu constituencies
+
+    poetry run python scripts/populate_demographics.py                   # one request per constituency
+    poetry run python scripts/populate_demographics.py --group-size 20   # 20 constituencies per request
+
+With --group-size, constituencies missing from (or invalid in) a batched
+response are fetched again one by one. Each group's results are written
+in one bulk UPDATE as soon as the group is done, so an interrupted run keeps
+the responses it has already paid for.
 """
 import sys
 import os
@@ -12,11 +20,12 @@ from datetime import datetime
 # Add parent directory to path to import app modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from sqlalchemy import Float, Integer, column, update, values
 from sqlalchemy.orm import Session
 from app.database import SessionLocal
 from app.models.constituency import Constituency
 from app.config import settings
-from app.services.demographics_fetcher import fetch_demographics_from_llm
+from app.services.demographics_fetcher import fetch_demographics_batch_from_llm, fetch_demographics_from_llm
 
 
 def get_constituencies_needing_demographics(db: Session, constituency_ids=None):
@@ -37,22 +46,49 @@ def get_constituencies_needing_demographics(db: Session, constituency_ids=None):
     return query.order_by(Constituency.ac_number).all()
 
 
-def update_constituency_demographics(
-    db: Session,
-    constituency_id: int,
-    population: int,
-    urban_pct: float,
-    literacy_rate: float
-):
-    """Update constituency with demographics data"""
-    constituency = db.query(Constituency).filter(Constituency.id == constituency_id).first()
-    if constituency:
-        constituency.population = population
-        constituency.urban_population_pct = urban_pct
-        constituency.literacy_rate = literacy_rate
-        db.commit()
-        return True
-    return False
+def update_constituency_demographics(db: Session, demographics: dict) -> int:
+    """
+    Update constituencies with demographics data in one statement and commit
+    demographics: constituency id -> population, urban_pct, literacy_rate
+    Returns the number of rows updated
+    """
+    rows = [
+        (constituency_id, data['population'], data['urban_pct'], data['literacy_rate'])
+        for constituency_id, data in demographics.items()
+    ]
+    if not rows:
+        return 0
+
+    if db.bind.dialect.name == "postgresql":
+        # UPDATE constituencies ... FROM (VALUES (...), ...) AS v (id, population, urban_pct, literacy_rate)
+        new = values(
+            column("id", Integer),
+            column("population", Integer),
+            column("urban_pct", Float),
+            column("literacy_rate", Float),
+            name="v"
+        ).data(rows)
+        result = db.execute(
+            update(Constituency)
+            .where(Constituency.id == new.c.id)
+            .values(
+                population=new.c.population,
+                urban_population_pct=new.c.urban_pct,
+                literacy_rate=new.c.literacy_rate
+            ),
+            execution_options={"synchronize_session": False}
+        )
+        updated = result.rowcount
+    else:
+        # No UPDATE ... FROM VALUES (e.g. SQLite): one executemany by primary key
+        db.execute(update(Constituency), [
+            {"id": row[0], "population": row[1], "urban_population_pct": row[2], "literacy_rate": row[3]}
+            for row in rows
+        ])
+        updated = len(rows)
+
+    db.commit()
+    return updated
 
 
 def main():
@@ -92,6 +128,12 @@ def main():
         default=10,
         help="Number of calls before pause (default: 10)"
     )
+    parser.add_argument(
+        "--group-size",
+        type=int,
+        default=1,
+        help="Constituencies per API call; failed ones are retried individually (default: 1, e.g. 20)"
+    )
 
     args = parser.parse_args()
 
@@ -118,6 +160,7 @@ def main():
     print(f"Skip existing: {args.skip_existing}")
     print(f"Delay between calls: {args.delay}s")
     print(f"Batch size: {args.batch_size}")
+    print(f"Group size: {args.group_size}")
     print()
 
     # Get database session
@@ -159,80 +202,114 @@ def main():
         failed = 0
         skipped = 0
         failed_list = []
+        calls = 0
         start_time = datetime.now()
 
-        # Process each constituency
-        for idx, constituency in enumerate(constituencies, 1):
-            print(f"[{idx}/{total_count}] {constituency.name} (AC #{constituency.ac_number})")
-            print(f"    District: {constituency.district} | Region: {constituency.region}")
+        def pause():
+            """Delay between calls, plus a pause every batch_size calls"""
+            time.sleep(args.delay)
+            if calls % args.batch_size == 0:
+                print(f"--- Batch complete ({calls} calls). Pausing 2s for API cooldown ---")
+                print()
+                time.sleep(2)
+
+        def save(fetched):
+            """Write one group's results in one statement (unless dry run)"""
+            if not fetched or args.dry_run:
+                return len(fetched)
+            print(f"Saving {len(fetched)} constituencies...", end=" ", flush=True)
+            updated = update_constituency_demographics(db, fetched)
+            print(f"✓ {updated} updated")
+            print()
+            return updated
+
+        def show(demographics):
+            print(f"    Pop: {demographics['population']:,} | Urban: {demographics['urban_pct']:.1f}% | Literacy: {demographics['literacy_rate']:.1f}%")
 
+        pending = []
+        for constituency in constituencies:
             # Check if already has data
             if args.skip_existing and constituency.population and constituency.urban_population_pct and constituency.literacy_rate:
-                print(f"    ⊘ Skipped (already has data)")
+                print(f"{constituency.name} (AC #{constituency.ac_number}) ⊘ Skipped (already has data)")
                 skipped += 1
-                print()
                 continue
-
-            # Fetch demographics
-            print(f"    → Fetching demographics...", end=" ", flush=True)
-
-            demographics = fetch_demographics_from_llm(
-                constituency_name=constituency.name,
-                district=constituency.district,
-                region=constituency.region or "Unknown",
-                ac_number=constituency.ac_number,
-                api_key=settings.OPENAI_API_KEY,
-                model=args.model
-            )
-
-            if demographics:
-                print("✓")
-                print(f"    Pop: {demographics['population']:,} | Urban: {demographics['urban_pct']:.1f}% | Literacy: {demographics['literacy_rate']:.1f}%")
-
-                # Save to database (unless dry run)
-                if not args.dry_run:
-                    success = update_constituency_demographics(
-                        db=db,
-                        constituency_id=constituency.id,
-                        population=demographics['population'],
-                        urban_pct=demographics['urban_pct'],
-                        literacy_rate=demographics['literacy_rate']
+            pending.append(constituency)
+
+        group_size = max(1, args.group_size)
+        groups = [pending[i:i + group_size] for i in range(0, len(pending), group_size)]
+
+        for group_idx, group in enumerate(groups, 1):
+            fetched = {}
+            try:
+                # Several constituencies in one request
+                singles = group
+                if group_size > 1:
+                    first, last = group[0].ac_number, group[-1].ac_number
+                    print(f"[Group {group_idx}/{len(groups)}] AC #{first}-{last} ({len(group)} constituencies)")
+                    print(f"    → Fetching demographics...", end=" ", flush=True)
+
+                    results = fetch_demographics_batch_from_llm(
+                        constituencies=[
+                            {
+                                "ac_number": c.ac_number,
+                                "name": c.name,
+                                "district": c.district,
+                                "region": c.region or "Unknown"
+                            }
+                            for c in group
+                        ],
+                        api_key=settings.OPENAI_API_KEY,
+                        model=args.model
+                    )
+                    calls += 1
+                    print(f"✓ {len(results)}/{len(group)}")
+
+                    for constituency in group:
+                        if constituency.ac_number in results:
+                            print(f"  {constituency.name} (AC #{constituency.ac_number})")
+                            show(results[constituency.ac_number])
+                            fetched[constituency.id] = results[constituency.ac_number]
+                    singles = [c for c in group if c.ac_number not in results]
+                    print()
+
+                    if singles or group_idx < len(groups):
+                        pause()
+
+                # One request per constituency (or per constituency the group missed)
+                for idx, constituency in enumerate(singles, 1):
+                    print(f"{constituency.name} (AC #{constituency.ac_number})")
+                    print(f"    District: {constituency.district} | Region: {constituency.region}")
+                    print(f"    → Fetching demographics...", end=" ", flush=True)
+
+                    demographics = fetch_demographics_from_llm(
+                        constituency_name=constituency.name,
+                        district=constituency.district,
+                        region=constituency.region or "Unknown",
+                        ac_number=constituency.ac_number,
+                        api_key=settings.OPENAI_API_KEY,
+                        model=args.model
                     )
-                    if success:
-                        print(f"    ✓ Saved to database")
-                        successful += 1
+                    calls += 1
+
+                    if demographics:
+                        print("✓")
+                        show(demographics)
+                        fetched[constituency.id] = demographics
                     else:
-                        print(f"    ✗ Failed to save to database")
+                        print("✗ Failed")
                         failed += 1
                         failed_list.append({
                             "id": constituency.id,
                             "name": constituency.name,
-                            "reason": "Database update failed"
+                            "reason": "LLM fetch failed"
                         })
-                else:
-                    print(f"    ⊘ Dry run - not saved")
-                    successful += 1
-
-            else:
-                print("✗ Failed")
-                failed += 1
-                failed_list.append({
-                    "id": constituency.id,
-                    "name": constituency.name,
-                    "reason": "LLM fetch failed"
-                })
+                    print()
 
-            print()
-
-            # Delay between calls
-            if idx < total_count:
-                time.sleep(args.delay)
-
-            # Pause every batch_size calls
-            if idx % args.batch_size == 0 and idx < total_count:
-                print(f"--- Batch complete ({idx}/{total_count}). Pausing 2s for API cooldown ---")
-                print()
-                time.sleep(2)
+                    if idx < len(singles) or group_idx < len(groups):
+                        pause()
+            finally:
+                # Also when interrupted (e.g. Ctrl-C), so fetched results are kept
+                successful += save(fetched)
 
         # Final summary
         end_time = datetime.now()
@@ -242,6 +319,7 @@ def main():
         print("SUMMARY")
         print("=" * 80)
         print(f"Total processed: {total_count}")
+        print(f"API calls: {calls}")
         print(f"Successfully updated: {successful}")
         print(f"Failed: {failed}")
         print(f"Skipped: {skipped}")
@@ -0,0 +1,56 @@
+"""
+Rebuild the precomputed constituency result summaries and party rollups from election_results
+Run after creating the tables (init_db.py) or after manual corrections to results
+"""
+import sys
+import argparse
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import SessionLocal, engine, Base
+from app.models.election import Election, ConstituencyResultSummary, PartyVoteRollup
+from app.services.election_summaries import refresh_election_aggregates
+
+
+def refresh_summaries(year=None):
+    """Rebuild aggregates for one election year, or all elections"""
+    # Create the aggregate tables if they don't exist yet
+    Base.metadata.create_all(
+        bind=engine,
+        tables=[ConstituencyResultSummary.__table__, PartyVoteRollup.__table__],
+    )
+
+    db = SessionLocal()
+
+    try:
+        query = db.query(Election)
+        if year:
+            query = query.filter(Election.year == year)
+        elections = query.order_by(Election.year).all()
+
+        if not elections:
+            print("[ERROR] No elections found")
+            return
+
+        for election in elections:
+            summary_count, rollup_count = refresh_election_aggregates(db, election.id, election.year)
+            print(f"[OK] {election.year}: {summary_count} constituency summaries, {rollup_count} party rollups")
+
+        print("\n[SUCCESS] Election aggregates refreshed")
+
+    except Exception as e:
+        print(f"\n[ERROR] Failed to refresh summaries: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild constituency summaries and party rollups")
+    parser.add_argument("--year", type=int, help="Only refresh this election year")
+    args = parser.parse_args()
+
+    refresh_summaries(args.year)
@@ -2,10 +2,12 @@
 Standardize party names across all elections for consistency
 """
 import sys
+from contextlib import ExitStack
 sys.path.insert(0, '.')
 
 from app.database import SessionLocal
-from app.models.election import ElectionResult
+from app.models.election import Election, ElectionResult
+from app.services.election_summaries import track_result_changes
 
 
 # Define party name standardization mapping
@@ -38,29 +40,34 @@ def standardize_party_names():
 
         total_updated = 0
 
-        for old_name, new_name in PARTY_NAME_MAPPING.items():
-            # Count records to be updated
-            count = db.query(ElectionResult).filter(
-                ElectionResult.party == old_name
-            ).count()
-
-            if count > 0:
-                print(f"\nStandardizing '{old_name}' -> '{new_name}'")
-                print(f"  Found {count} records to update")
+        # Keep summaries and party rollups in sync with the renamed results
+        with ExitStack() as stack:
+            for election in db.query(Election).all():
+                stack.enter_context(track_result_changes(db, election.id, election.year))
 
-                # Update the records
-                db.query(ElectionResult).filter(
+            for old_name, new_name in PARTY_NAME_MAPPING.items():
+                # Count records to be updated
+                count = db.query(ElectionResult).filter(
                     ElectionResult.party == old_name
-                ).update(
-                    {ElectionResult.party: new_name},
-                    synchronize_session=False
-                )
+                ).count()
+
+                if count > 0:
+                    print(f"\nStandardizing '{old_name}' -> '{new_name}'")
+                    print(f"  Found {count} records to update")
+
+                    # Update the records
+                    db.query(ElectionResult).filter(
+                        ElectionResult.party == old_name
+                    ).update(
+                        {ElectionResult.party: new_name},
+                        synchronize_session=False
+                    )
 
-                total_updated += count
-                print(f"  Updated {count} records")
+                    total_updated += count
+                    print(f"  Updated {count} records")
 
-        # Commit all changes
-        db.commit()
+            # Commit all changes
+            db.commit()
 
         print(f"\n{'=' * 80}")
         print(f"STANDARDIZATION COMPLETE")
@@ -4,9 +4,8 @@ Verify all elections in database
 import sys
 sys.path.insert(0, '.')
 
-from sqlalchemy import func
 from app.database import SessionLocal
-from app.models.election import Election, ElectionResult
+from app.models.election import Election, ElectionResult, PartyVoteRollup
 
 
 def verify_elections():
@@ -36,20 +35,23 @@ def verify_elections():
             print(f"  Total Candidates: {result_count}")
             print(f"  Winners: {winner_count}")
 
-            # Party breakdown
+            # Party breakdown (precomputed statewide rollups)
             party_results = db.query(
-                ElectionResult.party,
-                func.count(ElectionResult.id).label('seats')
+                PartyVoteRollup.group_name,
+                PartyVoteRollup.seats_won,
+                PartyVoteRollup.vote_share_pct
             ).filter(
-                ElectionResult.election_id == e.id,
-                ElectionResult.is_winner == 1
-            ).group_by(ElectionResult.party).order_by(
-                func.count(ElectionResult.id).desc()
+                PartyVoteRollup.election_id == e.id,
+                PartyVoteRollup.scope == 'state',
+                PartyVoteRollup.group_type == 'party'
+            ).order_by(
+                PartyVoteRollup.seats_won.desc(),
+                PartyVoteRollup.total_votes.desc()
             ).limit(5).all()
 
             print("  Top 5 parties:")
-            for party, seats in party_results:
-                print(f"    {party}: {seats} seats")
+            for party, seats, vote_share in party_results:
+                print(f"    {party}: {seats} seats ({vote_share or 0:.1f}% votes)")
 
         print("\n" + "=" * 80)
         print("SUMMARY")